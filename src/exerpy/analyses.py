@@ -6,11 +6,14 @@ import numpy as np
 import pandas as pd
 from tabulate import tabulate
 
-from .components.component import component_registry
+from .components.component import KERNEL_PROPERTIES, component_registry
 from .components.helpers.cycle_closer import CycleCloser
 from .components.helpers.power_bus import PowerBus
 from .components.nodes.splitter import Splitter
+from .connections import ConnectionTable, _is_number
+from .cost_matrix import CostMatrix, SingularBlockError, SingularStackError, StackedCostSystem, __scipy_available__
 from .functions import add_chemical_exergy, add_total_exergy_flow
+from .topology import ConnectionTopology
 
 
 class ExergyAnalysis:
@@ -29,7 +32,9 @@ class ExergyAnalysis:
     _component_data : dict
         Raw component data from the input model.
     _connection_data : dict
-        Raw connection data from the input model.
+        Connection data as plain dictionaries, including all calculated values.
+        The copy is cached until the connection data changes and must not be
+        modified.
     chemExLib : object, optional
         Chemical exergy library for chemical exergy calculations.
     chemical_exergy_enabled : bool
@@ -38,8 +43,11 @@ class ExergyAnalysis:
         Flag indicating if physical exergy is split into thermal and mechanical components.
     components : dict
         Dictionary of component objects constructed from input data.
-    connections : dict
-        Dictionary of connection data with exergy values.
+    connections : ConnectionTable
+        Columnar store of the connection data with exergy values. Each connection
+        is accessible as a dictionary-like view by its name.
+    topology : ConnectionTopology
+        Index of the inlets, outlets and kinds of all connections.
     E_F : float
         Total fuel exergy for the overall system in W.
     E_P : float
@@ -84,7 +92,7 @@ class ExergyAnalysis:
         ----------
         component_data : dict
             Data of the components.
-        connection_data : dict
+        connection_data : dict or ConnectionTable
             Data of the connections.
         Tamb : float
             Ambient temperature (K).
@@ -98,14 +106,27 @@ class ExergyAnalysis:
         self.Tamb = Tamb
         self.pamb = pamb
         self._component_data = component_data
-        self._connection_data = connection_data
         self.chemExLib = chemExLib
         self.chemical_exergy_enabled = self.chemExLib is not None
         self.split_physical_exergy = split_physical_exergy
 
-        # Convert the parsed data into components
-        self.components = _construct_components(component_data, connection_data, Tamb)
-        self.connections = connection_data
+        # Store the connections in columns, index the topology once and convert the parsed data into components
+        self.connections = ConnectionTable.from_data(connection_data)
+        self.topology = ConnectionTopology(self.connections)
+        self.components = _construct_components(component_data, self.connections, Tamb, self.topology)
+        # Incremented whenever the exergy state changes, dependent analyses use it to detect outdated results
+        self._revision = 0
+        self._connection_dict = None
+        self._connection_dict_key = None
+
+    @property
+    def _connection_data(self):
+        # The plain dictionaries are only built again after the connection data has changed
+        key = (self._revision, self.connections.modifications)
+        if self._connection_dict_key != key:
+            self._connection_dict = self.connections.to_dict()
+            self._connection_dict_key = key
+        return self._connection_dict
 
     def analyse(self, E_F, E_P, E_L=None) -> None:
         """
@@ -120,15 +141,377 @@ class ExergyAnalysis:
         E_L : dict, optional
             Dictionary containing input and output connections for loss exergy (default is {}).
         """
-        # Initialize class attributes for the exergy value of the total system
         if E_L is None:
             E_L = {}
-        self.E_F = 0.0
-        self.E_P = 0.0
-        self.E_L = 0.0
+        self._set_system_flows(E_F, E_P, E_L)
+        self._calc_system_exergy()
+
+        # Check for unaccounted connections in the system
+        self._check_unaccounted_system_conns()
+
+        eff_str = f"{self.epsilon:.2%}" if self.epsilon is not None else "N/A"
+        logging.info(
+            f"Overall exergy analysis completed: E_F = {self.E_F:.2f} kW, "
+            f"E_P = {self.E_P:.2f} kW, E_L = {self.E_L:.2f} kW, "
+            f"Efficiency = {eff_str}"
+        )
+
+        self._calc_component_exergy()
+
+    def analyse_batch(self, E_F, E_P, E_L, states):
+        """
+        Run the exergy analysis for several operating points of the same plant.
+
+        The topology, the validation of the system boundaries and the component
+        objects are set up only once. For every operating point the given stream
+        states are applied on top of the connection data of this analysis, the
+        total exergy flows of the changed connections are recalculated and the
+        system exergy balance is evaluated. Components providing a vectorized
+        kernel (see
+        :meth:`exerpy.components.component.Component.has_vectorized_kernel`)
+        are evaluated for all operating points at once, all others point by
+        point.
+
+        Parameters
+        ----------
+        E_F : dict
+            Dictionary containing input and output connections for fuel exergy.
+        E_P : dict
+            Dictionary containing input and output connections for product exergy.
+        E_L : dict or None
+            Dictionary containing input and output connections for loss exergy.
+        states : sequence of dict
+            One entry per operating point, mapping connection names to the
+            properties that differ from the connection data, e.g.
+            ``{"1": {"m": 10.5, "e_PH": 512e3}}``. Connections not listed keep
+            their values. An exergy flow ``E`` given for a connection is used as
+            it is, otherwise it is recalculated from the stream state.
+
+        Returns
+        -------
+        dict
+            Results of all operating points with the keys
+
+            - ``"components"``: names of the evaluated components,
+            - ``"E_F"``, ``"E_P"``, ``"E_D"``, ``"epsilon"``, ``"y"``,
+              ``"y_star"``: arrays of shape (points, components),
+            - ``"system"``: dictionary of arrays of shape (points,) with the
+              system values ``"E_F"``, ``"E_P"``, ``"E_D"``, ``"E_L"`` and
+              ``"epsilon"``.
+
+            Missing values are NaN.
+
+        Raises
+        ------
+        ValueError
+            If a connection is not part of the plant's connections or a
+            component lacks the inlets or outlets its exergy balance requires.
+
+        Notes
+        -----
+        After the batch the connection data and the components hold the values
+        of the last operating point.
+        """
+        if E_L is None:
+            E_L = {}
+        self._set_system_flows(E_F, E_P, E_L)
+
+        states = list(states)
+        for state in states:
+            for conn_name in state:
+                if conn_name not in self.connections:
+                    msg = f"The connection {conn_name} is not part of the plant's connections."
+                    raise ValueError(msg)
+
+        component_names = [
+            name for name, component in self.components.items() if component.__class__.__name__ != "CycleCloser"
+        ]
+        # Components with a vectorized kernel are evaluated for all points at once, the others point by point
+        kernel_groups = {}
+        scalar_names = []
+        for name in component_names:
+            component_class = type(self.components[name])
+            if component_class.has_vectorized_kernel():
+                # The kernels index the connectors directly, validate them once as the scalar balance does
+                self.components[name].check_connectors()
+                kernel_groups.setdefault(component_class, []).append(name)
+            else:
+                scalar_names.append(name)
+
+        base = self.connections.snapshot()
+
+        n_points = len(states)
+        shape = (n_points, len(component_names))
+        column = {name: col for col, name in enumerate(component_names)}
+        results = {key: np.full(shape, np.nan) for key in ["E_F", "E_P", "E_D", "epsilon"]}
+        system = {key: np.full(n_points, np.nan) for key in ["E_F", "E_P", "E_D", "E_L", "epsilon"]}
+        stream_values = np.full((n_points, len(KERNEL_PROPERTIES), len(self.connections) + 1), np.nan)
+
+        for point, state in enumerate(states):
+            self.connections.restore(base)
+            self.apply_connection_states(state)
+
+            self._calc_system_exergy()
+            if point == 0:
+                self._check_unaccounted_system_conns()
+            for key in system:
+                system[key][point] = _to_float(getattr(self, key))
+
+            # The last column stays NaN and is used for missing connectors
+            stream_values[point, :, :-1] = self.connections.get_columns(KERNEL_PROPERTIES)
+            for name in scalar_names:
+                component = self.components[name]
+                component.calc_exergy_balance(self.Tamb, self.pamb, self.split_physical_exergy)
+                for key in results:
+                    results[key][point, column[name]] = _to_float(getattr(component, key, None))
+
+        position = {conn_name: row for row, conn_name in enumerate(self.connections)}
+        for component_class, names in kernel_groups.items():
+            inl = self._kernel_streams(names, self.topology.inlet_connectors, stream_values, position)
+            outl = self._kernel_streams(names, self.topology.outlet_connectors, stream_values, position)
+            dissipative = np.array([bool(getattr(self.components[name], "dissipative", False)) for name in names])
+            kernel_results = component_class.calc_exergy_balance_vectorized(
+                inl, outl, self.Tamb, self.pamb, self.split_physical_exergy, dissipative
+            )
+            cols = [column[name] for name in names]
+            for key in results:
+                results[key][:, cols] = kernel_results[key]
+            if n_points:
+                # Keep the components consistent with the connection data of the last operating point
+                for i, name in enumerate(names):
+                    for key, values in kernel_results.items():
+                        setattr(self.components[name], key, float(values[-1, i]))
+
+        # Exergy destruction ratios with respect to the system values of each point
+        E_F_sys = system["E_F"][:, None]
+        E_D_sys = system["E_D"][:, None]
+        with np.errstate(divide="ignore", invalid="ignore"):
+            results["y"] = np.where(E_F_sys != 0, results["E_D"] / E_F_sys, np.nan)
+            results["y_star"] = np.where(E_F_sys != 0, results["E_D"] / E_D_sys, np.nan)
+        if n_points:
+            for name in component_names:
+                self.components[name].y = float(results["y"][-1, column[name]])
+                self.components[name].y_star = float(results["y_star"][-1, column[name]])
+
+        mismatch = ~np.isclose(np.nansum(results["E_D"], axis=1), system["E_D"], rtol=1e-5)
+        if mismatch.any():
+            logging.warning(
+                f"Sum of component exergy destructions does not match the overall system exergy destruction "
+                f"for {int(mismatch.sum())} of {n_points} operating points."
+            )
+
+        logging.info(f"Batch exergy analysis completed for {n_points} operating points.")
+        return {"components": component_names, **results, "system": system}
+
+    def update_connections(self, updates):
+        """
+        Update the state of some connections and re-evaluate only the affected parts of the analysis.
+
+        The exergy flows of the updated connections (and of the heat flows of
+        heat exchangers and steam generators attached to them) are
+        recalculated, the exergy balance is run again only for the components
+        adjacent to these connections and the system exergy values are
+        adjusted by the change of the updated exergy flows. The exergy
+        destruction ratios y and y* are updated for all components if the
+        system values change, otherwise only for the re-evaluated components.
+
+        Parameters
+        ----------
+        updates : dict
+            Connection names mapped to the changed properties, e.g.
+            ``{"12": {"T": 420.0, "e_PH": 3.1e5}}``. An exergy flow ``E``
+            given for a connection is used as it is, otherwise it is
+            recalculated from the stream state.
+
+        Returns
+        -------
+        list
+            Names of the re-evaluated components.
+
+        Raises
+        ------
+        RuntimeError
+            If :meth:`analyse` has not been run before.
+        ValueError
+            If a connection is not part of the plant's connections.
+        """
+        if getattr(self, "E_F_dict", None) is None:
+            msg = "The exergy analysis must be run with analyse() before connections can be updated."
+            raise RuntimeError(msg)
+        for conn_name in updates:
+            if conn_name not in self.connections:
+                msg = f"The connection {conn_name} is not part of the plant's connections."
+                raise ValueError(msg)
+
+        if getattr(self, "_system_flow_signs", None) is None:
+            self._system_flow_signs = self._collect_system_flow_signs()
+
+        heat_connections = self._heat_exchanger_heat_connections()
+        dependent = self._dependent_heat_connections(updates, heat_connections)
+        dirty = list(updates) + sorted(dependent - set(updates))
+        E_old = {conn_name: self.connections[conn_name].get("E") for conn_name in dirty}
+        self.apply_connection_states(updates)
+
+        # Adjust the system exergy values by the change of the updated exergy flows
+        system_changed = False
+        for conn_name in dirty:
+            delta = (self.connections[conn_name].get("E") or 0.0) - (E_old[conn_name] or 0.0)
+            for attribute, sign in self._system_flow_signs.get(conn_name, []):
+                setattr(self, attribute, getattr(self, attribute) + sign * delta)
+                system_changed = system_changed or delta != 0
+        self.epsilon = self.E_P / self.E_F if self.E_F != 0 else None
+        self.E_D = self.E_F - self.E_P - self.E_L
+
+        # Re-evaluate the components attached to the updated connections
+        updated = []
+        for conn_name in dirty:
+            for comp_name in (self.topology.source(conn_name), self.topology.target(conn_name)):
+                component = self.components.get(comp_name)
+                if component is None or comp_name in updated or component.__class__.__name__ == "CycleCloser":
+                    continue
+                component.calc_exergy_balance(self.Tamb, self.pamb, self.split_physical_exergy)
+                updated.append(comp_name)
+
+        ratio_components = self.components if system_changed else {name: self.components[name] for name in updated}
+        for component in ratio_components.values():
+            if component.__class__.__name__ == "CycleCloser":
+                continue
+            if self.E_F != 0:
+                component.y = component.E_D / self.E_F
+                component.y_star = component.E_D / self.E_D if component.E_D is not None else np.nan
+            else:
+                component.y = np.nan
+                component.y_star = np.nan
+
+        logging.info(
+            f"Updated {len(updates)} connection(s) and re-evaluated {len(updated)} component(s): "
+            f"E_F = {self.E_F:.2f} W, E_P = {self.E_P:.2f} W, E_D = {self.E_D:.2f} W."
+        )
+        return updated
+
+    def _collect_system_flow_signs(self):
+        """
+        Map the connections of the system boundaries to the system exergy values they contribute to.
+
+        Returns
+        -------
+        dict
+            Connection names mapped to a list of (attribute, sign) pairs, e.g.
+            ``[("E_F", 1)]`` for a fuel input.
+        """
+        signs = {}
+        for attribute, flows in (("E_F", self.E_F_dict), ("E_P", self.E_P_dict), ("E_L", self.E_L_dict)):
+            for conn_name in flows.get("inputs", []):
+                signs.setdefault(conn_name, []).append((attribute, 1))
+            for conn_name in flows.get("outputs", []):
+                signs.setdefault(conn_name, []).append((attribute, -1))
+        return signs
+
+    def _dependent_heat_connections(self, state, heat_connections):
+        """
+        Get the heat connections whose exergy flow has to be recalculated after a change of the given connections.
+
+        Parameters
+        ----------
+        state : dict
+            Connection names mapped to the changed properties.
+        heat_connections : dict
+            Heat exchangers and steam generators mapped to their heat connections.
+
+        Returns
+        -------
+        set
+            Names of the dependent heat connections without a given exergy flow.
+        """
+        dependent = set()
+        for conn_name, values in state.items():
+            if "E" in values:
+                continue
+            for comp_name in (self.topology.source(conn_name), self.topology.target(conn_name)):
+                dependent.update(name for name in heat_connections.get(comp_name, []) if "E" not in state.get(name, {}))
+        return dependent
+
+    def apply_connection_states(self, state):
+        """
+        Write changed stream states to the connections and recalculate the affected exergy flows.
+
+        Unlike :meth:`update_connections`, the exergy balances of the
+        components and the system are not re-evaluated, run :meth:`analyse`
+        afterwards to get the results of the new state.
+
+        Parameters
+        ----------
+        state : dict
+            Connection names mapped to the changed properties, e.g.
+            ``{"12": {"T": 420.0, "e_PH": 3.1e5}}``. An exergy flow ``E``
+            given for a connection is used as it is, otherwise it is
+            recalculated from the stream state.
+        """
+        # Exergy flows of changed streams and of the heat flows depending on them are recalculated
+        changed = {conn_name for conn_name, values in state.items() if "E" not in values}
+        changed |= self._dependent_heat_connections(state, self._heat_exchanger_heat_connections())
+        for conn_name in changed:
+            self.connections[conn_name]["E"] = None
+        for conn_name, values in state.items():
+            conn = self.connections[conn_name]
+            for key, value in values.items():
+                conn[key] = value
+        exergy_json = {"components": self._component_data, "connections": self.connections}
+        add_total_exergy_flow(exergy_json, self.split_physical_exergy, self.topology, changed)
+        self._revision += 1
+
+    def _kernel_streams(self, component_names, connectors_of, stream_values, position):
+        """
+        Collect the stream properties of several components for a vectorized exergy balance kernel.
+
+        Parameters
+        ----------
+        component_names : list of str
+            Names of the components.
+        connectors_of : callable
+            Topology lookup returning the connector to connection name mapping of a component.
+        stream_values : numpy.ndarray
+            Stream properties of shape (points, properties, connections + 1) with NaN in the last column.
+        position : dict
+            Connection names mapped to their column in ``stream_values``.
+
+        Returns
+        -------
+        dict
+            Connector index mapped to the property arrays of shape (points, components).
+        """
+        missing = stream_values.shape[2] - 1
+        connectors = [connectors_of(name) for name in component_names]
+        streams = {}
+        for idx in sorted({idx for conns in connectors for idx in conns}, key=str):
+            conn_names = [conns.get(idx) for conns in connectors]
+            rows = np.array([missing if name is None else position[name] for name in conn_names], dtype=int)
+            arrays = {key: stream_values[:, k, rows] for k, key in enumerate(KERNEL_PROPERTIES)}
+            arrays["exists"] = np.array([name is not None for name in conn_names], dtype=bool)
+            arrays["power"] = np.array(
+                [name is not None and self.topology.kind(name) == "power" for name in conn_names], dtype=bool
+            )
+            streams[idx] = arrays
+        return streams
+
+    def _set_system_flows(self, E_F, E_P, E_L):
+        """
+        Store and validate the connections defining fuel, product and loss exergy of the system.
+
+        Parameters
+        ----------
+        E_F : dict
+            Dictionary containing input and output connections for fuel exergy.
+        E_P : dict
+            Dictionary containing input and output connections for product exergy.
+        E_L : dict
+            Dictionary containing input and output connections for loss exergy.
+        """
         self.E_F_dict = E_F
         self.E_P_dict = E_P
         self.E_L_dict = E_L
+        self._system_flow_signs = None
+        self._revision += 1
 
         for ex_flow in [E_F, E_P, E_L]:
             for connections in ex_flow.values():
@@ -137,36 +520,18 @@ class ExergyAnalysis:
                         msg = f"The connection {connection} is not part of the " "plant's connections."
                         raise ValueError(msg)
 
-        # Calculate total fuel exergy (E_F) by summing up all specified input connections
-        if "inputs" in E_F:
-            self.E_F += sum(
-                self.connections[conn]["E"] for conn in E_F["inputs"] if self.connections[conn]["E"] is not None
-            )
+    def _calc_system_exergy(self):
+        """Calculate fuel, product, loss and destruction exergy and the exergy efficiency of the system."""
+        E_F, E_P, E_L = self.E_F_dict, self.E_P_dict, self.E_L_dict
 
-        if "outputs" in E_F:
-            self.E_F -= sum(
-                self.connections[conn]["E"] for conn in E_F["outputs"] if self.connections[conn]["E"] is not None
-            )
+        # Calculate total fuel exergy (E_F) by summing up all specified input connections
+        self.E_F = self._sum_exergy(E_F.get("inputs", [])) - self._sum_exergy(E_F.get("outputs", []))
 
         # Calculate total product exergy (E_P) by summing up all specified input and output connections
-        if "inputs" in E_P:
-            self.E_P += sum(
-                self.connections[conn]["E"] for conn in E_P["inputs"] if self.connections[conn]["E"] is not None
-            )
-        if "outputs" in E_P:
-            self.E_P -= sum(
-                self.connections[conn]["E"] for conn in E_P["outputs"] if self.connections[conn]["E"] is not None
-            )
+        self.E_P = self._sum_exergy(E_P.get("inputs", [])) - self._sum_exergy(E_P.get("outputs", []))
 
         # Calculate total loss exergy (E_L) by summing up all specified input and output connections
-        if "inputs" in E_L:
-            self.E_L += sum(
-                self.connections[conn]["E"] for conn in E_L["inputs"] if self.connections[conn]["E"] is not None
-            )
-        if "outputs" in E_L:
-            self.E_L -= sum(
-                self.connections[conn]["E"] for conn in E_L["outputs"] if self.connections[conn]["E"] is not None
-            )
+        self.E_L = self._sum_exergy(E_L.get("inputs", [])) - self._sum_exergy(E_L.get("outputs", []))
 
         # Calculate overall exergy efficiency epsilon = E_P / E_F
         # E_F == 0 should throw an error because it does not make sense
@@ -175,17 +540,8 @@ class ExergyAnalysis:
         # The rest is counted as total exergy destruction with all components of the system
         self.E_D = self.E_F - self.E_P - self.E_L
 
-        # Check for unaccounted connections in the system
-        self._check_unaccounted_system_conns()
-
-        eff_str = f"{self.epsilon:.2%}" if self.epsilon is not None else "N/A"
-        logging.info(
-            f"Overall exergy analysis completed: E_F = {self.E_F:.2f} kW, "
-            f"E_P = {self.E_P:.2f} kW, E_L = {self.E_L:.2f} kW, "
-            f"Efficiency = {eff_str}"
-        )
-
-        # Perform exergy balance for each individual component in the system
+    def _calc_component_exergy(self):
+        """Perform the exergy balance of every component and check it against the system exergy destruction."""
         total_component_E_D = 0.0
         for _component_name, component in self.components.items():
             if component.__class__.__name__ == "CycleCloser":
@@ -213,8 +569,29 @@ class ExergyAnalysis:
         else:
             logging.info("Exergy destruction check passed: Sum of component E_D matches overall E_D.")
 
+    def _heat_exchanger_heat_connections(self):
+        """
+        Get the heat connections whose exergy flow follows from the material streams of their component.
+
+        Returns
+        -------
+        dict
+            Names of heat exchangers and steam generators mapped to the names of
+            their heat connections.
+        """
+        if getattr(self, "_heat_connections", None) is None:
+            heat_components = set(self._component_data.get("SimpleHeatExchanger", {})) | set(
+                self._component_data.get("SteamGenerator", {})
+            )
+            self._heat_connections = {}
+            for conn_name in self.topology.of_kind("heat"):
+                comp_name = self.topology.source(conn_name) or self.topology.target(conn_name)
+                if comp_name in heat_components:
+                    self._heat_connections.setdefault(comp_name, []).append(conn_name)
+        return self._heat_connections
+
     @classmethod
-    def from_tespy(cls, model: str, Tamb=None, pamb=None, chemExLib=None, split_physical_exergy=True):
+    def from_tespy(cls, model: str, Tamb=None, pamb=None, chemExLib=None, split_physical_exergy=True, bulk=False):
         """
         Create an instance of the ExergyAnalysis class from a tespy network or
         a tespy network export structure.
@@ -229,6 +606,11 @@ class ExergyAnalysis:
             Ambient pressure for analysis, default is None.
         chemExLib : str, optional
             Name of the library for chemical exergy tables.
+        bulk : bool, optional
+            Export the connections of the network column by column with the
+            cached physical exergy calculation of exerpy, see
+            :func:`exerpy.parser.from_tespy.tespy_parser.to_exerpy`, by default
+            False.
 
         Returns
         -------
@@ -247,7 +629,7 @@ class ExergyAnalysis:
             msg = "Model parameter must be a path to a valid tespy network " "export or a tespy network"
             raise TypeError(msg)
 
-        data = to_exerpy(model, Tamb, pamb)
+        data = to_exerpy(model, Tamb, pamb, bulk)
         data, Tamb, pamb = _process_json(data, Tamb, pamb, chemExLib, split_physical_exergy)
         return cls(data["components"], data["connections"], Tamb, pamb, chemExLib, split_physical_exergy)
 
@@ -383,6 +765,25 @@ class ExergyAnalysis:
         )
         return cls(data["components"], data["connections"], Tamb, pamb, chemExLib, split_physical_exergy)
 
+    def _sum_exergy(self, names):
+        """
+        Sum the exergy flows of the given connections from the exergy column.
+
+        Parameters
+        ----------
+        names : list of str
+            Connection names.
+
+        Returns
+        -------
+        float
+            Sum of the exergy flows E in W. Connections without a value for E are skipped.
+        """
+        if not names:
+            return 0.0
+        values = self.connections.get_column("E", names)
+        return float(values[self.connections.present("E", names)].sum())
+
     def exergy_results(self, print_results=True):
         """
         Displays a table of exergy analysis results with columns for E_F, E_P, E_D, and epsilon for each component,
@@ -460,69 +861,49 @@ class ExergyAnalysis:
         df_component_results.loc["TOT", "y [%]"] = df_component_results["y [%]"].sum()
         df_component_results.loc["TOT", "y* [%]"] = df_component_results["y* [%]"].sum()
 
-        # MATERIAL CONNECTIONS
-        material_connection_results = {
-            "Connection": [],
-            "m [kg/s]": [],
-            "T [°C]": [],
-            "p [bar]": [],
-            "h [kJ/kg]": [],
-            "s [J/kgK]": [],
-            "E [kW]": [],
-            "e^PH [kJ/kg]": [],
-            "e^T [kJ/kg]": [],
-            "e^M [kJ/kg]": [],
-            "e^CH [kJ/kg]": [],
-        }
-
-        # NON-MATERIAL CONNECTIONS
-        non_material_connection_results = {"Connection": [], "Kind": [], "Energy Flow [kW]": [], "Exergy Flow [kW]": []}
-
         # Create set of valid component names
         valid_components = {comp.name for comp in self.components.values()}
 
-        # Populate the dictionaries with exergy analysis data for each connection
-        for conn_name, conn_data in self.connections.items():
-
-            # Filter: only include connections that have source OR target in self.components
+        # Filter: only include connections that have source OR target in self.components
+        material_names = []
+        non_material_names = []
+        for conn_name in self.topology.names:
             is_part_of_the_system = (
-                conn_data.get("source_component") in valid_components
-                or conn_data.get("target_component") in valid_components
+                self.topology.source(conn_name) in valid_components
+                or self.topology.target(conn_name) in valid_components
             )
             if not is_part_of_the_system:
                 continue
-
             # Separate material and non-material connections based on fluid type
-            kind = conn_data.get("kind", None)
-
-            # Check if the connection is a non-material energy flow type
+            kind = self.topology.kind(conn_name)
             if kind in {"power", "heat"}:
-                # Non-material connections: only record energy flow, converted to kW using lambda
-                non_material_connection_results["Connection"].append(conn_name)
-                non_material_connection_results["Kind"].append(kind)
-                non_material_connection_results["Energy Flow [kW]"].append(convert(conn_data.get("energy_flow"), 1e-3))
-                non_material_connection_results["Exergy Flow [kW]"].append(convert(conn_data.get("E"), 1e-3))
+                non_material_names.append(conn_name)
             elif kind == "material":
-                # Material connections: record full data with conversions using lambda
-                material_connection_results["Connection"].append(conn_name)
-                material_connection_results["m [kg/s]"].append(conn_data.get("m", None))
-                material_connection_results["T [°C]"].append(conn_data.get("T") - 273.15)  # Convert to °C
-                material_connection_results["p [bar]"].append(convert(conn_data.get("p"), 1e-5))  # Convert Pa to bar
-                material_connection_results["h [kJ/kg]"].append(convert(conn_data.get("h"), 1e-3))  # Convert to kJ/kg
-                material_connection_results["s [J/kgK]"].append(conn_data.get("s", None))
-                material_connection_results["e^PH [kJ/kg]"].append(
-                    convert(conn_data.get("e_PH"), 1e-3)
-                )  # Convert to kJ/kg
-                material_connection_results["e^T [kJ/kg]"].append(
-                    convert(conn_data.get("e_T"), 1e-3)
-                )  # Convert to kJ/kg
-                material_connection_results["e^M [kJ/kg]"].append(
-                    convert(conn_data.get("e_M"), 1e-3)
-                )  # Convert to kJ/kg
-                material_connection_results["e^CH [kJ/kg]"].append(
-                    convert(conn_data.get("e_CH"), 1e-3)
-                )  # Convert to kJ/kg
-                material_connection_results["E [kW]"].append(convert(conn_data.get("E"), 1e-3))  # Convert to kW
+                material_names.append(conn_name)
+
+        # MATERIAL CONNECTIONS
+        table = self.connections
+        material_connection_results = {
+            "Connection": material_names,
+            "m [kg/s]": _result_column(table, "m", material_names),
+            "T [°C]": _result_column(table, "T", material_names, offset=-273.15),  # Convert to °C
+            "p [bar]": _result_column(table, "p", material_names, 1e-5),  # Convert Pa to bar
+            "h [kJ/kg]": _result_column(table, "h", material_names, 1e-3),  # Convert to kJ/kg
+            "s [J/kgK]": _result_column(table, "s", material_names),
+            "E [kW]": _result_column(table, "E", material_names, 1e-3),  # Convert to kW
+            "e^PH [kJ/kg]": _result_column(table, "e_PH", material_names, 1e-3),  # Convert to kJ/kg
+            "e^T [kJ/kg]": _result_column(table, "e_T", material_names, 1e-3),  # Convert to kJ/kg
+            "e^M [kJ/kg]": _result_column(table, "e_M", material_names, 1e-3),  # Convert to kJ/kg
+            "e^CH [kJ/kg]": _result_column(table, "e_CH", material_names, 1e-3),  # Convert to kJ/kg
+        }
+
+        # NON-MATERIAL CONNECTIONS: only record energy and exergy flow, converted to kW
+        non_material_connection_results = {
+            "Connection": non_material_names,
+            "Kind": [self.topology.kind(conn_name) for conn_name in non_material_names],
+            "Energy Flow [kW]": _result_column(table, "energy_flow", non_material_names, 1e-3),
+            "Exergy Flow [kW]": _result_column(table, "E", non_material_names, 1e-3),
+        }
 
         # Convert the material and non-material connection dictionaries into DataFrames
         df_material_connection_results = pd.DataFrame(material_connection_results)
@@ -670,7 +1051,60 @@ class ExergyAnalysis:
             )
 
 
-def _construct_components(component_data, connection_data, Tamb):
+def _result_column(table, key, names, factor=1.0, offset=0.0):
+    """
+    Read a numeric connection property for a results table and convert its unit.
+
+    Parameters
+    ----------
+    table : ConnectionTable
+        Connection data.
+    key : str
+        Name of the numeric property.
+    names : list of str
+        Connection names.
+    factor : float, optional
+        Unit conversion factor applied after the offset.
+    offset : float, optional
+        Offset added before the conversion, e.g. for temperatures.
+
+    Returns
+    -------
+    numpy.ndarray or list
+        Converted values, NaN for connections without a value. If no connection
+        provides the property, a list of None is returned.
+    """
+    if not table.present(key, names).any():
+        return [None] * len(names)
+    return (table.get_column(key, names) + offset) * factor
+
+
+def _to_float(value):
+    """Convert a result value to float, using NaN for missing values."""
+    return np.nan if value is None else float(value)
+
+
+def _safe_divide(numerator, denominator):
+    """
+    Divide two arrays elementwise, returning NaN where the denominator is zero.
+
+    Parameters
+    ----------
+    numerator : numpy.ndarray
+        Numerator values.
+    denominator : numpy.ndarray
+        Denominator values.
+
+    Returns
+    -------
+    numpy.ndarray
+        Quotient, NaN where the denominator is zero.
+    """
+    nonzero = denominator != 0
+    return np.divide(numerator, denominator, out=np.full(np.shape(numerator), np.nan), where=nonzero)
+
+
+def _construct_components(component_data, connection_data, Tamb, topology=None):
     """
     Constructs component instances from component and connection data.
     Parameters
@@ -683,6 +1117,9 @@ def _construct_components(component_data, connection_data, Tamb):
         Each connection contains source and target component information.
     Tamb : float
         Ambient temperature, used for determining if a valve is dissipative.
+    topology : ConnectionTopology, optional
+        Topology index of the connection data. It is built from
+        connection_data if not provided.
     Returns
     -------
     dict
@@ -693,6 +1130,8 @@ def _construct_components(component_data, connection_data, Tamb):
     are dissipative by comparing inlet and outlet temperatures to ambient temperature.
     """
     components = {}  # Initialize a dictionary to store created components
+    if topology is None:
+        topology = ConnectionTopology(connection_data)
 
     # Loop over component types (e.g., 'Combustion Chamber', 'Compressor')
     for component_type, component_instances in component_data.items():
@@ -716,17 +1155,11 @@ def _construct_components(component_data, connection_data, Tamb):
             component.inl = {}
             component.outl = {}
 
-            # Assign streams to the components based on connection data
-            for _conn_id, conn_info in connection_data.items():
-                # Assign inlet streams
-                if conn_info["target_component"] == component_name:
-                    target_connector_idx = conn_info["target_connector"]  # Use 0-based indexing
-                    component.inl[target_connector_idx] = conn_info  # Assign inlet stream
-
-                # Assign outlet streams
-                if conn_info["source_component"] == component_name:
-                    source_connector_idx = conn_info["source_connector"]  # Use 0-based indexing
-                    component.outl[source_connector_idx] = conn_info  # Assign outlet stream
+            # Assign streams to the components based on the topology index
+            for connector_idx, conn_id in topology.inlet_connectors(component_name).items():
+                component.inl[connector_idx] = connection_data[conn_id]  # Assign inlet stream
+            for connector_idx, conn_id in topology.outlet_connectors(component_name).items():
+                component.outl[connector_idx] = connection_data[conn_id]  # Assign outlet stream
 
             # --- NEW: Automatically mark Valve components as dissipative ---
             # Here we assume that if a Valve's first inlet and first outlet have temperatures (key "T")
@@ -854,6 +1287,9 @@ def _process_json(
         if missing_fields:
             raise ValueError(f"Connection '{conn_name}' missing required fields: {missing_fields}")
 
+    # Store the connections in columns for the whole-model exergy calculations
+    data["connections"] = ConnectionTable.from_data(data["connections"])
+
     # Add chemical exergy if library provided
     if chemExLib:
         data = add_chemical_exergy(data, Tamb, pamb, chemExLib)
@@ -868,6 +1304,10 @@ def _process_json(
     return data, Tamb, pamb
 
 
+#: Cost properties of the connections, set by the exergoeconomic analysis.
+_COST_PROPERTIES = ("C_T", "C_M", "C_CH", "C_PH", "C_TOT", "c_T", "c_M", "c_CH", "c_PH", "c_TOT")
+
+
 class ExergoeconomicAnalysis:
     """ "
     This class performs exergoeconomic analysis on a previously completed exergy analysis.
@@ -885,6 +1325,8 @@ class ExergoeconomicAnalysis:
         Dictionary of all energy/material connections in the system.
     components : dict
         Dictionary of all components in the system.
+    topology : ConnectionTopology
+        Topology index shared with the exergy analysis instance.
     chemical_exergy_enabled : bool
         Flag indicating if chemical exergy is considered in calculations.
     E_F_dict : dict
@@ -901,6 +1343,10 @@ class ExergoeconomicAnalysis:
         Dictionary mapping equation indices to equation types.
     currency : str
         Currency symbol used in cost reporting.
+    sparse : bool
+        Flag indicating if the cost equations are solved with the sparse solver.
+    block_triangular : bool
+        Flag indicating if the cost equations are solved block by block in block-triangular order.
     system_costs : dict
         Dictionary of system-level costs after analysis.
 
@@ -916,11 +1362,21 @@ class ExergoeconomicAnalysis:
         Solves the cost equations and assigns results to connections and components.
     run(Exe_Eco_Costs, Tamb)
         Executes the complete exergoeconomic analysis workflow.
+    run_scenarios(scenarios, Tamb)
+        Executes the exergoeconomic analysis for several sets of costs with one factorization.
+    run_time_series(states, Exe_Eco_Costs, Tamb, chunk_size=256)
+        Executes the exergoeconomic analysis for the time steps of a time series in batched solves.
+    cost_sensitivities(outputs, specific=False)
+        Calculates the derivatives of costs with respect to all cost inputs from the adjoint equations.
+    invalidate_factorization()
+        Discards the stored factorization of the cost matrix.
+    cost_blocks()
+        Lists the equations and variables of the blocks of the block-triangular cost matrix.
     exergoeconomic_results(print_results=True)
         Displays and returns tables of exergoeconomic analysis results.
     """
 
-    def __init__(self, exergy_analysis_instance, currency="EUR"):
+    def __init__(self, exergy_analysis_instance, currency="EUR", sparse=None, block_triangular=False):
         """
         Initialize an economic analysis for an exergy analysis.
 
@@ -930,6 +1386,13 @@ class ExergoeconomicAnalysis:
             Instance of ExergyAnalysis that has already performed exergy calculations.
         currency : str, optional
             Currency symbol for cost calculations, by default "EUR".
+        sparse : bool, optional
+            Solve the cost equations with the sparse direct solver of SciPy,
+            by default if SciPy is installed. Otherwise NumPy's dense solver is used.
+        block_triangular : bool, optional
+            Permute the cost equations to block-triangular form and solve the
+            blocks one after another, by default False. A singular system is then
+            reported with the equations and variables of the singular block.
 
         Notes
         -----
@@ -939,14 +1402,24 @@ class ExergoeconomicAnalysis:
         self.exergy_analysis = exergy_analysis_instance
         self.connections = exergy_analysis_instance.connections
         self.components = exergy_analysis_instance.components
+        self.topology = exergy_analysis_instance.topology
         self.chemical_exergy_enabled = exergy_analysis_instance.chemical_exergy_enabled
         self.E_F_dict = exergy_analysis_instance.E_F_dict
         self.E_P_dict = exergy_analysis_instance.E_P_dict
         self.E_L_dict = exergy_analysis_instance.E_L_dict
+        # Signed component-connection incidence matrix, one row per component
+        self._incidence = self.topology.incidence_matrix(list(self.components))
         self.num_variables = 0  # Track number of equations (or cost variables) for the matrix
         self.variables = {}  # New dictionary to map variable indices to names
         self.equations = {}  # New dictionary to map equation indices to kind of equation
         self.currency = currency  # EUR is default currency for cost calculations
+        if sparse and not __scipy_available__:
+            raise ValueError("The sparse solver requires SciPy, please install exerpy[sparse] or set sparse=False.")
+        self.sparse = __scipy_available__ if sparse is None else sparse
+        self.block_triangular = block_triangular
+        self._factorization = None  # LU factorization of the cost matrix
+        self._C_solution = None  # Solution of the cost equations of the last run
+        self._factorization_key = None  # Exergy state and equation structure the factorization belongs to
 
     def initialize_cost_variables(self):
         """
@@ -967,6 +1440,8 @@ class ExergoeconomicAnalysis:
         """
         col_number = 0
         valid_components = {comp.name for comp in self.components.values()}
+        self._cost_var_names = {"material": [], "non_material": []}
+        cost_var_index = {"T": [], "M": [], "CH": [], "exergy": []}
 
         # Process each connection (stream) which is part of the system (has a valid source or target)
         for name, conn in self.connections.items():
@@ -985,12 +1460,16 @@ class ExergoeconomicAnalysis:
                         self.variables[str(col_number)] = f"C_{name}_T"
                         self.variables[str(col_number + 1)] = f"C_{name}_M"
                         self.variables[str(col_number + 2)] = f"C_{name}_CH"
+                        cost_var_index["CH"].append(col_number + 2)
                         col_number += 3
                     else:
                         conn["CostVar_index"] = {"T": col_number, "M": col_number + 1}
                         self.variables[str(col_number)] = f"C_{name}_T"
                         self.variables[str(col_number + 1)] = f"C_{name}_M"
                         col_number += 2
+                    self._cost_var_names["material"].append(name)
+                    cost_var_index["T"].append(conn["CostVar_index"]["T"])
+                    cost_var_index["M"].append(conn["CostVar_index"]["M"])
                     # Check if this connection's target is a dissipative component.
                     target = conn.get("target_component")
                     if target in valid_components:
@@ -1004,10 +1483,13 @@ class ExergoeconomicAnalysis:
                 elif kind in ("heat", "power"):
                     conn["CostVar_index"] = {"exergy": col_number}
                     self.variables[str(col_number)] = f"C_{name}_TOT"
+                    self._cost_var_names["non_material"].append(name)
+                    cost_var_index["exergy"].append(col_number)
                     col_number += 1
 
-        # Store the total number of cost variables for later use.
+        # Store the total number of cost variables and the column indices of the streams for later use.
         self.num_variables = col_number
+        self._cost_var_index = {key: np.array(cols, dtype=int) for key, cols in cost_var_index.items()}
 
     def assign_user_costs(self, Exe_Eco_Costs):
         """
@@ -1105,7 +1587,7 @@ class ExergoeconomicAnalysis:
         -------
         tuple
             A tuple containing:
-            - A: numpy.ndarray - The coefficient matrix for the linear equation system
+            - A: CostMatrix - The sparse coefficient matrix for the linear equation system
             - b: numpy.ndarray - The right-hand side vector for the linear equation system
 
         Notes
@@ -1117,8 +1599,9 @@ class ExergoeconomicAnalysis:
         4. Custom auxiliary equations from each component
         5. Special equations for dissipative components
         """
-        self._A = np.zeros((self.num_variables, self.num_variables))
+        self._A = CostMatrix(self.num_variables)
         self._b = np.zeros(self.num_variables)
+        self.equations = {}
         counter = 0
 
         # Filter out CycleCloser instances, keeping the component objects.
@@ -1126,7 +1609,8 @@ class ExergoeconomicAnalysis:
         # Create a set of valid component names for cost balance comparisons.
         valid_component_names = {comp.name for comp in valid_components}
 
-        # 1. Cost balance equations for productive components.
+        # 1. Cost balance equations for productive components, from the rows of the incidence matrix.
+        component_rows = {name: row for row, name in enumerate(self.components)}
         for comp in valid_components:
             if (
                 not getattr(comp, "is_dissipative", False)
@@ -1135,24 +1619,18 @@ class ExergoeconomicAnalysis:
             ):
                 # Assign the row index for the cost balance equation to this component.
                 comp.exergy_cost_line = counter
-                for conn in self.connections.values():
-                    # Check if the connection is linked to a valid component.
-                    # If the connection's target is the component, it is an inlet (add +1).
-                    if conn.get("target_component") == comp.name:
-                        for _key, col in conn["CostVar_index"].items():
-                            self._A[counter, col] = 1  # Incoming costs
-                    # If the connection's source is the component, it is an outlet (subtract -1).
-                    elif conn.get("source_component") == comp.name:
-                        for _key, col in conn["CostVar_index"].items():
-                            self._A[counter, col] = -1  # Outgoing costs
-                    self.equations[counter] = {"kind": "cost_balance", "object": [comp.name], "property": "Z_costs"}
+                # Outlets come first so that a connection which is both inlet and outlet counts as inlet.
+                for conn_index, sign in zip(*self._incidence.row(component_rows[comp.name]), strict=True):
+                    for _key, col in self.connections[self.topology.names[conn_index]]["CostVar_index"].items():
+                        self._A[counter, col] = sign  # Incoming costs positive, outgoing costs negative
+                self.equations[counter] = {"kind": "cost_balance", "object": [comp.name], "property": "Z_costs"}
 
                 self._b[counter] = -getattr(comp, "Z_costs", 1)
                 counter += 1
 
         # 2. Inlet stream equations.
         # Gather all power connections.
-        power_conns = [conn for conn in self.connections.values() if conn.get("kind") == "power"]
+        power_conns = [self.connections[name] for name in self.topology.of_kind("power")]
         # Set the flag: if any power connection has NO target component, then there is an outlet.
         has_power_outlet = any(conn.get("target_component") is None for conn in power_conns)
 
@@ -1194,9 +1672,8 @@ class ExergoeconomicAnalysis:
         # of all power flows at the input or output of the system.
         power_conns = [
             conn
-            for conn in self.connections.values()
-            if conn.get("kind") == "power"
-            and (
+            for conn in power_conns
+            if (
                 conn.get("source_component") not in valid_component_names
                 or conn.get("target_component") not in valid_component_names
             )
@@ -1223,6 +1700,26 @@ class ExergoeconomicAnalysis:
                 }
                 counter += 1
 
+        # The equations of the components follow the equations of the system
+        self._num_system_equations = counter
+        self._component_auxiliary_equations(counter, Tamb)
+
+    def _component_auxiliary_equations(self, counter, Tamb):
+        """
+        Add the auxiliary equations of the components to the cost matrix.
+
+        Parameters
+        ----------
+        counter : int
+            Row of the first equation.
+        Tamb : float
+            Ambient temperature in Kelvin.
+
+        Returns
+        -------
+        int
+            Row following the last equation.
+        """
         # 4. Auxiliary equations.
         # These equations are needed because we have more variables than components.
         # For each productive component call its auxiliary equation routine, if available.
@@ -1256,6 +1753,7 @@ class ExergoeconomicAnalysis:
                     self.chemical_exergy_enabled,
                     list(self.components.values()),
                 )
+        return counter
 
     def solve_exergoeconomic_analysis(self, Tamb):
         """
@@ -1280,73 +1778,50 @@ class ExergoeconomicAnalysis:
         Notes
         -----
         This method performs the following steps:
-        1. Constructs the exergoeconomic cost matrix
+        1. Constructs and factorizes the exergoeconomic cost matrix, or reuses the
+           factorization of the previous solution if the exergy state is unchanged
         2. Solves the system of linear equations
         3. Assigns cost solutions to connections
         4. Calculates component exergoeconomic indicators
         5. Distributes loss stream costs to product streams
         6. Computes system-level cost variables
         """
-        # Step 1: Construct the cost matrix
-        self.construct_matrix(Tamb)
-
-        # Step 2: Solve the system of equations
+        # Step 1: Construct and factorize the cost matrix, unless the matrix of the previous solution still applies
         try:
-            C_solution = np.linalg.solve(self._A, self._b)
+            self._prepare_factorization(Tamb)
+
+            # Step 2: Solve the system of equations
+            C_solution = self._factorization.solve(self._b)
             if np.isnan(C_solution).any():
                 raise ValueError(
                     "The solution of the cost matrix contains NaN values, indicating an issue with the cost balance equations or specifications."
                 )
-        except np.linalg.LinAlgError:
-            raise ValueError(
-                f"Exergoeconomic system is singular and cannot be solved. "
-                f"Provided equations: {len(self.equations)}, variables in system: {len(self.variables)}"
-            )
+        except np.linalg.LinAlgError as error:
+            raise self._singular_system_error(error) from error
 
-        # Step 3: Distribute the cost differences of dissipative components to the serving components
-        self.distribute_all_Z_diff(C_solution)
+        self._apply_cost_solution(C_solution)
 
-        # Step 4: Assign solutions to connections
-        for conn_name, conn in self.connections.items():
-            is_part_of_the_system = (
-                conn.get("source_component") in self.components or conn.get("target_component") in self.components
-            )
-            if not is_part_of_the_system:
-                continue
-            else:
-                kind = conn.get("kind")
-                if kind == "material":
-                    # Retrieve mass flow and specific exergy values
-                    m_val = conn.get("m", 1)  # mass flow [kg/s]
-                    e_T = conn.get("e_T", 0)  # thermal specific exergy [kJ/kg]
-                    e_M = conn.get("e_M", 0)  # mechanical specific exergy [kJ/kg]
-                    E_T = m_val * e_T  # thermal exergy flow [kW]
-                    E_M = m_val * e_M  # mechanical exergy flow [kW]
+    def _apply_cost_solution(self, C_solution):
+        """
+        Assign a solution of the cost equations to connections and components.
 
-                    conn["C_T"] = C_solution[conn["CostVar_index"]["T"]]
-                    conn["c_T"] = conn["C_T"] / E_T if E_T != 0 else np.nan
+        Parameters
+        ----------
+        C_solution : numpy.ndarray
+            Solution vector of cost variables from the solved linear system.
 
-                    conn["C_M"] = C_solution[conn["CostVar_index"]["M"]]
-                    conn["c_M"] = conn["C_M"] / E_M if E_M != 0 else np.nan
+        Raises
+        ------
+        ValueError
+            If the cost balance of the entire system is not satisfied.
+        """
+        self._C_solution = C_solution
 
-                    conn["C_PH"] = conn["C_T"] + conn["C_M"]
-                    conn["c_PH"] = conn["C_PH"] / (E_T + E_M) if (E_T + E_M) != 0 else np.nan
+        # Step 3: Distribute the cost differences of dissipative components to the serving components
+        self.distribute_all_Z_diff(C_solution)
 
-                    if self.chemical_exergy_enabled:
-                        e_CH = conn.get("e_CH", 0)  # chemical specific exergy [kJ/kg]
-                        E_CH = m_val * e_CH  # chemical exergy flow [kW]
-                        conn["C_CH"] = C_solution[conn["CostVar_index"]["CH"]]
-                        conn["c_CH"] = conn["C_CH"] / E_CH if E_CH != 0 else np.nan
-                        conn["C_TOT"] = conn["C_T"] + conn["C_M"] + conn["C_CH"]
-                        total_E = E_T + E_M + E_CH
-                        conn["c_TOT"] = conn["C_TOT"] / total_E if total_E != 0 else np.nan
-                    else:
-                        conn["C_TOT"] = conn["C_T"] + conn["C_M"]
-                        total_E = E_T + E_M
-                        conn["c_TOT"] = conn["C_TOT"] / total_E if total_E != 0 else np.nan
-                elif kind in {"heat", "power"}:
-                    conn["C_TOT"] = C_solution[conn["CostVar_index"]["exergy"]]
-                    conn["c_TOT"] = conn["C_TOT"] / conn.get("E", 1)
+        # Step 4: Assign solutions to connections, column by column for all material and non-material streams
+        self._assign_connection_costs(C_solution)
 
         # Step 5: Assign C_P, C_F, C_D, and f values to components
         for comp in self.exergy_analysis.components.values():
@@ -1433,6 +1908,210 @@ class ExergoeconomicAnalysis:
                 f"The problem may be caused by incorrect specifications of E_F, E_P, and E_L."
             )
 
+    def _assign_connection_costs(self, C_solution, names=None):
+        """
+        Assign a solution of the cost equations to the connections.
+
+        Parameters
+        ----------
+        C_solution : numpy.ndarray
+            Solution vector of cost variables from the solved linear system.
+        names : collection of str, optional
+            Connections to assign the costs to, by default all connections with cost variables.
+        """
+        table = self.connections
+        material = [i for i, name in enumerate(self._cost_var_names["material"]) if names is None or name in names]
+        material_names = [self._cost_var_names["material"][i] for i in material]
+        if material_names:
+            m_val = np.where(table.present("m", material_names), table.get_column("m", material_names), 1)
+            E_T = m_val * self._column_or_zero("e_T", material_names)  # thermal exergy flow
+            E_M = m_val * self._column_or_zero("e_M", material_names)  # mechanical exergy flow
+            C_T = C_solution[self._cost_var_index["T"][material]]
+            C_M = C_solution[self._cost_var_index["M"][material]]
+            C_PH = C_T + C_M
+            table.set_column("C_T", C_T, material_names)
+            table.set_column("c_T", _safe_divide(C_T, E_T), material_names)
+            table.set_column("C_M", C_M, material_names)
+            table.set_column("c_M", _safe_divide(C_M, E_M), material_names)
+            table.set_column("C_PH", C_PH, material_names)
+            table.set_column("c_PH", _safe_divide(C_PH, E_T + E_M), material_names)
+
+            if self.chemical_exergy_enabled:
+                E_CH = m_val * self._column_or_zero("e_CH", material_names)  # chemical exergy flow
+                C_CH = C_solution[self._cost_var_index["CH"][material]]
+                table.set_column("C_CH", C_CH, material_names)
+                table.set_column("c_CH", _safe_divide(C_CH, E_CH), material_names)
+                C_TOT = C_PH + C_CH
+                total_E = E_T + E_M + E_CH
+            else:
+                C_TOT = C_PH
+                total_E = E_T + E_M
+            table.set_column("C_TOT", C_TOT, material_names)
+            table.set_column("c_TOT", _safe_divide(C_TOT, total_E), material_names)
+
+        non_material = [
+            i for i, name in enumerate(self._cost_var_names["non_material"]) if names is None or name in names
+        ]
+        non_material_names = [self._cost_var_names["non_material"][i] for i in non_material]
+        if non_material_names:
+            E = np.where(table.present("E", non_material_names), table.get_column("E", non_material_names), 1)
+            C_TOT = C_solution[self._cost_var_index["exergy"][non_material]]
+            table.set_column("C_TOT", C_TOT, non_material_names)
+            table.set_column("c_TOT", C_TOT / E, non_material_names)
+
+    def _prepare_factorization(self, Tamb):
+        """
+        Provide the factorized cost matrix and the cost vector for the current costs.
+
+        The matrix is constructed and factorized only if the exergy state or the
+        equation structure changed since the stored factorization was computed.
+        Otherwise only the cost vector is rebuilt.
+
+        Parameters
+        ----------
+        Tamb : float
+            Ambient temperature in Kelvin.
+
+        Raises
+        ------
+        numpy.linalg.LinAlgError
+            If the cost matrix is singular.
+        """
+        key = self._matrix_key(Tamb)
+        if self._factorization is not None and key == self._factorization_key:
+            logging.info("Reusing the factorization of the cost matrix, only the cost vector is updated.")
+            self._b = self._assemble_cost_vector()
+        else:
+            self._factorization = None
+            self.construct_matrix(Tamb)
+            self._factorization = self._A.factorize(self.sparse, self.block_triangular)
+            self._factorization_key = key
+
+    def _singular_system_error(self, error):
+        """
+        Create the error of a cost system that cannot be solved.
+
+        Parameters
+        ----------
+        error : numpy.linalg.LinAlgError
+            Error raised by the factorization. A :class:`SingularBlockError`
+            adds the equations and variables of the singular part to the message.
+
+        Returns
+        -------
+        ValueError
+            Error describing the singular system.
+        """
+        message = (
+            f"Exergoeconomic system is singular and cannot be solved. "
+            f"Provided equations: {len(self.equations)}, variables in system: {len(self.variables)}"
+        )
+        if isinstance(error, SingularBlockError):
+            equations = [f"Eq[{row}] {self.equations.get(row)}" for row in error.equations]
+            variables = [self.variables.get(str(col), str(col)) for col in error.variables]
+            message += (
+                f". {error} Equations of the singular part: {', '.join(equations)}. "
+                f"Variables of the singular part: {', '.join(variables)}."
+            )
+        return ValueError(message)
+
+    def _matrix_key(self, Tamb):
+        """
+        Get the key of the exergy state and the equation structure the cost matrix depends on.
+
+        Besides the exergy state, the matrix only depends on which power inputs of the
+        system have a cost assigned, as these receive a boundary equation.
+
+        Parameters
+        ----------
+        Tamb : float
+            Ambient temperature in Kelvin.
+
+        Returns
+        -------
+        tuple
+            Key of the cost matrix.
+        """
+        power_costs = tuple(
+            name
+            for name in self.topology.of_kind("power")
+            if self.topology.source(name) not in self.components and self.connections[name].get("C_TOT")
+        )
+        return self.exergy_analysis._revision, self.num_variables, Tamb, self.chemical_exergy_enabled, power_costs
+
+    def _assemble_cost_vector(self):
+        """
+        Assemble the right-hand side of the cost equations for the current costs.
+
+        Only cost balances and boundary equations depend on the costs, all
+        other equations have a zero right-hand side.
+
+        Returns
+        -------
+        numpy.ndarray
+            Right-hand side vector.
+        """
+        b = np.zeros(self.num_variables)
+        for row, equation in self.equations.items():
+            if equation["kind"] == "cost_balance":
+                b[row] = -getattr(self.components[equation["object"][0]], "Z_costs", 1)
+            elif equation["kind"] == "dis_balance":
+                b[row] = -self.components[equation["objects"][0]].Z_costs
+            elif equation["kind"] == "boundary":
+                conn = self.connections[equation["object"][0]]
+                label = equation["property"].removeprefix("c_")
+                b[row] = conn.get(f"C_{label}", conn.get("C_TOT", 0))
+        return b
+
+    def invalidate_factorization(self):
+        """
+        Discard the stored factorization of the cost matrix.
+
+        The factorization is invalidated automatically when the exergy
+        analysis is run again or its connections are updated. Call this
+        method after changing connection or component data directly.
+        """
+        self._factorization = None
+        self._factorization_key = None
+
+    def cost_blocks(self):
+        """
+        List the blocks of the cost matrix in block-triangular form.
+
+        The cost equations are permuted such that every block only depends on
+        the variables of the blocks before it. Blocks of a single equation are
+        solved directly from the previous blocks, larger blocks are coupled
+        sub-networks, e.g. recirculation loops.
+
+        Returns
+        -------
+        list of dict
+            Blocks in the order they are solved in, each with the indices of its
+            "equations" and the names of its "variables".
+
+        Raises
+        ------
+        ValueError
+            If the cost matrix has not been constructed yet.
+        numpy.linalg.LinAlgError
+            If the cost matrix is structurally singular.
+        """
+        if not hasattr(self, "_A"):
+            raise ValueError("Run the exergoeconomic analysis before listing the blocks of the cost matrix.")
+        return [
+            {"equations": rows, "variables": [self.variables[str(col)] for col in cols]}
+            for rows, cols in self._A.block_triangular_decomposition()
+        ]
+
+    def _clear_costs(self):
+        """Remove the costs of a previous run from the connections."""
+        for key in _COST_PROPERTIES:
+            self.connections.clear_column(key)
+
+    def _column_or_zero(self, key, names):
+        """Read a numeric connection property for several connections, using zero where it is missing."""
+        return np.where(self.connections.present(key, names), self.connections.get_column(key, names), 0)
+
     def distribute_all_Z_diff(self, C_solution):
         """
         Distribute every dissipative cost-difference (the C_diff variables) among
@@ -1473,22 +2152,19 @@ class ExergoeconomicAnalysis:
         """
         from .components.helpers.cycle_closer import CycleCloser
 
+        # Inlet and outlet cost sums of all components from the incidence matrix
+        C_TOT = self._column_or_zero("C_TOT", self.topology.names)
+        inlet_sums = self._incidence.inlets() @ C_TOT
+        outlet_sums = -(self._incidence.outlets() @ C_TOT)
         balances = {}
-        for name, comp in self.exergy_analysis.components.items():
+        for row, (name, comp) in enumerate(self.exergy_analysis.components.items()):
             if isinstance(comp, CycleCloser):
                 continue
-            inlet_sum = 0.0
-            outlet_sum = 0.0
-            for conn in self.connections.values():
-                if conn.get("target_component") == name:
-                    inlet_sum += conn.get("C_TOT", 0) or 0
-                if conn.get("source_component") == name:
-                    outlet_sum += conn.get("C_TOT", 0) or 0
-            comp.C_in = inlet_sum
-            comp.C_out = outlet_sum
+            comp.C_in = float(inlet_sums[row])
+            comp.C_out = float(outlet_sums[row])
             z_cost = getattr(comp, "Z_costs", 0)
             z_diss = getattr(comp, "Z_diss", 0)
-            balance = inlet_sum - outlet_sum + z_cost + z_diss
+            balance = comp.C_in - comp.C_out + z_cost + z_diss
             balances[name] = (balance, abs(balance) <= tol)
 
         all_ok = all(flag for _, flag in balances.values())
@@ -1520,7 +2196,12 @@ class ExergoeconomicAnalysis:
         1. Initializing cost variables for all components and streams
         2. Assigning user-defined costs to components and boundary streams
         3. Solving the system of exergoeconomic equations
+
+        The costs of a previous run are removed first. If the exergy analysis has
+        not changed since the previous run, the factorized cost matrix is reused
+        and only the right-hand side is rebuilt for the new costs.
         """
+        self._clear_costs()
         self.initialize_cost_variables()
         self.assign_user_costs(Exe_Eco_Costs)
         self.solve_exergoeconomic_analysis(Tamb)
@@ -1528,6 +2209,597 @@ class ExergoeconomicAnalysis:
         self.check_cost_balance()
         print("stop")
 
+    def run_scenarios(self, scenarios, Tamb):
+        """
+        Execute the exergoeconomic analysis for several sets of costs at once.
+
+        All scenarios share the exergy state of the analysis, so the cost matrix
+        is constructed and factorized once. The cost vector is linear in the
+        costs (see :meth:`_cost_vector_derivative`), so the cost vectors of all
+        scenarios are obtained as one matrix product, stacked into one
+        right-hand side matrix and solved in a single call. The cost rates of
+        the components are linear in the solution as well: they are computed
+        for all scenarios at once from the solution matrix with the linear maps
+        of :meth:`_component_cost_map`, and so are the specific costs the
+        relative cost difference r is calculated from (see
+        :attr:`exerpy.components.component.Component.r_basis`). Only the last
+        scenario is assigned to the connections and components.
+
+        Parameters
+        ----------
+        scenarios : list of dict
+            Cost assignments of the scenarios, each in the format of the
+            ``Exe_Eco_Costs`` argument of :meth:`run`.
+        Tamb : float
+            Ambient temperature in Kelvin.
+
+        Returns
+        -------
+        pandas.DataFrame
+            Component results in long format with one row per scenario and
+            component. The scenario is the position in ``scenarios``.
+
+        Raises
+        ------
+        ValueError
+            If no scenario is given, if a mandatory cost is missing, if the
+            scenarios assign costs to different power inputs, if the system is
+            singular or if the cost balance of the last scenario is not
+            satisfied.
+
+        Notes
+        -----
+        After the call, the connections and components hold the results of the
+        last scenario.
+        """
+        scenarios = list(scenarios)
+        if not scenarios:
+            raise ValueError("At least one cost scenario is required.")
+
+        # The equations are set up for the last scenario, the other scenarios must share them
+        self._clear_costs()
+        self.initialize_cost_variables()
+        self.assign_user_costs(scenarios[-1])
+        power_costs = self._matrix_key(Tamb)[-1]
+        for i, costs in enumerate(scenarios):
+            if self._power_costs(costs) != power_costs:
+                raise ValueError(
+                    f"Cost scenario {i} assigns costs to other power inputs than the other scenarios. "
+                    "All scenarios must share the same cost equations."
+                )
+        try:
+            self._prepare_factorization(Tamb)
+            z_inputs, c_inputs, db = self._cost_vector_derivative()
+            inputs = np.column_stack([self._cost_inputs(costs, z_inputs, c_inputs) for costs in scenarios])
+            C_solutions = self._factorization.solve(db @ inputs)
+            if np.isnan(C_solutions).any():
+                raise ValueError(
+                    "The solution of the cost matrix contains NaN values, indicating an issue with the cost balance equations or specifications."
+                )
+        except np.linalg.LinAlgError as error:
+            raise self._singular_system_error(error) from error
+        self._apply_cost_solution(C_solutions[:, -1])
+
+        # Cost rates of all scenarios from the linear maps of the components
+        snapshot = self.connections.snapshot()
+        Z = dict(zip(z_inputs, inputs[: len(z_inputs)], strict=True))
+        nan = np.full(len(scenarios), np.nan)
+        tables = {}
+        for name, comp in self.components.items():
+            if isinstance(comp, CycleCloser | PowerBus):
+                continue
+            if not hasattr(comp, "exergoeconomic_balance"):
+                tables[name] = {"C_F": nan, "C_P": nan, "C_D": nan, "Z": Z[name], "r": nan, "f": nan}
+                continue
+            weights, z_weights = self._component_cost_map(comp, ("C_F", "C_P", "C_D", "c_F", "c_P"))
+            C_F, C_P, C_D, c_F, c_P = weights @ C_solutions + z_weights[:, None] * Z[name]
+            # The relative cost difference uses the costs the component defines it on
+            cost_F, cost_P = (C_F, C_P) if comp.r_basis == "rates" else (c_F, c_P)
+            with np.errstate(divide="ignore", invalid="ignore"):
+                r = np.where(cost_F != 0, (cost_P - cost_F) / cost_F, np.nan)
+                f = np.where(Z[name] + C_D != 0, Z[name] / (Z[name] + C_D), np.nan)
+            tables[name] = {"C_F": C_F, "C_P": C_P, "C_D": C_D, "Z": Z[name], "r": r, "f": f}
+        self.connections.restore(snapshot)
+
+        rows = [
+            {
+                "Scenario": i,
+                "Component": name,
+                f"C_F [{self.currency}/h]": table["C_F"][i] * 3600,
+                f"C_P [{self.currency}/h]": table["C_P"][i] * 3600,
+                f"C_D [{self.currency}/h]": table["C_D"][i] * 3600,
+                f"Z [{self.currency}/h]": table["Z"][i] * 3600,
+                "r [%]": table["r"][i] * 100,
+                "f [%]": table["f"][i] * 100,
+            }
+            for i in range(len(scenarios))
+            for name, table in tables.items()
+        ]
+        logging.info(f"Exergoeconomic analysis of {len(scenarios)} cost scenarios completed successfully.")
+        return pd.DataFrame(rows)
+
+    def _power_costs(self, Exe_Eco_Costs):
+        """Get the power inputs a cost assignment gives a cost to, in the order of :meth:`_matrix_key`."""
+        return tuple(
+            name
+            for name in self.topology.of_kind("power")
+            if self.topology.source(name) not in self.components
+            and Exe_Eco_Costs.get(f"{name}_c", 0) * self.connections[name].get("E", 0)
+        )
+
+    def _cost_inputs(self, Exe_Eco_Costs, z_inputs, c_inputs):
+        """
+        Get the cost inputs of :meth:`_cost_vector_derivative` from a cost assignment.
+
+        Parameters
+        ----------
+        Exe_Eco_Costs : dict
+            Cost assignments in the format of :meth:`run`.
+        z_inputs : list of str
+            Names of the components with investment costs.
+        c_inputs : list of str
+            Names of the connections with boundary equations.
+
+        Returns
+        -------
+        numpy.ndarray
+            Investment cost rates in currency/s and specific costs in currency/J.
+
+        Raises
+        ------
+        ValueError
+            If the cost of a component or of a material or heat input is missing.
+        """
+        for name in z_inputs:
+            if f"{name}_Z" not in Exe_Eco_Costs:
+                raise ValueError(f"Cost for component '{name}' is mandatory but not provided in Exe_Eco_Costs.")
+        for name in c_inputs:
+            conn = self.connections[name]
+            is_input = not conn.get("source_component")
+            if is_input and conn.get("kind", "material") != "power" and f"{name}_c" not in Exe_Eco_Costs:
+                raise ValueError(f"Cost for input connection '{name}' is mandatory but not provided in Exe_Eco_Costs.")
+        Z = [Exe_Eco_Costs[f"{name}_Z"] / 3600 for name in z_inputs]
+        c = [Exe_Eco_Costs.get(f"{name}_c", 0) * 1e-9 for name in c_inputs]
+        return np.array(Z + c, dtype=float)
+
+    def run_time_series(self, states, Exe_Eco_Costs, Tamb, chunk_size=256):
+        """
+        Execute the exergoeconomic analysis for the time steps of a time series.
+
+        The coefficients of the auxiliary cost equations depend on the exergy
+        flows, so every time step has its own cost matrix and a factorization
+        cannot be reused. The cost variables and the cost matrix are set up once
+        for the first time step, and the sparsity pattern of the matrix is
+        taken from it. The cost balances and the boundary equations do not
+        depend on the exergy flows. For every further time step only the values
+        of the auxiliary equations are updated in their precomputed positions
+        of the pattern: the coefficients of the power equations directly from
+        the exergy flow column, the auxiliary equations of the components by
+        re-evaluating only these. The cost vectors follow from the linear
+        dependency on the costs (see :meth:`_cost_vector_derivative`). The
+        systems of ``chunk_size`` time steps are solved at once with
+        :class:`exerpy.cost_matrix.StackedCostSystem`.
+
+        Parameters
+        ----------
+        states : sequence of dict
+            One entry per time step, mapping connection names to the properties
+            that differ from the connection data of the exergy analysis, in the
+            format of :meth:`ExergyAnalysis.analyse_batch`.
+        Exe_Eco_Costs : dict
+            Costs of all time steps in the format of :meth:`run`.
+        Tamb : float
+            Ambient temperature in Kelvin.
+        chunk_size : int, optional
+            Number of time steps solved at once, by default 256.
+
+        Returns
+        -------
+        pandas.DataFrame
+            Component results in long format with one row per time step and
+            component. The time step is the position in ``states``.
+
+        Raises
+        ------
+        ValueError
+            If no time step is given, if a connection is unknown, if the cost
+            matrix of a time step does not have the sparsity pattern of the first
+            time step, if a system is singular or if the cost balance of a time
+            step is not satisfied.
+
+        Notes
+        -----
+        The exergy analysis is updated once per time step with
+        :meth:`ExergyAnalysis.update_connections`. The exergy flows and the
+        component states of the time steps are kept until their cost solution
+        is assigned. After the call, the connections and components hold the
+        results of the last time step.
+        """
+        states = list(states)
+        if not states:
+            raise ValueError("At least one time step is required.")
+        ean = self.exergy_analysis
+        for state in states:
+            for conn_name in state:
+                if conn_name not in self.connections:
+                    raise ValueError(f"The connection {conn_name} is not part of the plant's connections.")
+
+        self._clear_costs()
+        self.initialize_cost_variables()
+        self.assign_user_costs(Exe_Eco_Costs)
+        # Values of the connection data, to reset the properties changed by a time step
+        base = {}
+        for state in states:
+            for conn_name, values in state.items():
+                for key in values:
+                    base.setdefault(conn_name, {}).setdefault(key, self.connections[conn_name].get(key))
+        numeric_only = all(
+            _is_number(value) for state in states for values in state.values() for value in values.values()
+        )
+        current = {}
+
+        def step_update(state):
+            """Get the update from the current time step to the given one."""
+            update = {name: {key: base[name][key] for key in values} for name, values in current.items()}
+            for conn_name, values in state.items():
+                update.setdefault(conn_name, {}).update(values)
+            return update
+
+        stack = None
+        rows = []
+        for start in range(0, len(states), chunk_size):
+            chunk = states[start : start + chunk_size]
+            values, cost_vectors, step_data = [], [], []
+            for step, state in enumerate(chunk, start):
+                ean.update_connections(step_update(state))
+                current = state
+                if stack is None:
+                    self.construct_matrix(Tamb)
+                    stack = StackedCostSystem(self._A)
+                    pattern = stack.values(self._A)
+                    system_equations, power_slots, power_names, power_signs, aux_slots = self._time_series_pattern(
+                        stack, Tamb
+                    )
+                    cost_inputs = self._cost_inputs(Exe_Eco_Costs, *self._cost_vector_derivative()[:2])
+                else:
+                    # Only the auxiliary equations of the components are evaluated for the time step
+                    self._A = CostMatrix(self.num_variables)
+                    self._b = np.zeros(self.num_variables)
+                    self.equations = dict(system_equations)
+                    self._component_auxiliary_equations(self._num_system_equations, Tamb)
+                try:
+                    step_values = pattern.copy()
+                    step_values[aux_slots] = 0.0
+                    step_values[stack.slots(self._A._entries)] = list(self._A._entries.values())
+                except ValueError as error:
+                    raise ValueError(f"Time step {step}: {error}") from error
+                # Coefficients 1/E of the power equations of the system from the exergy flows of the time step
+                E = self._column_or_zero("E", power_names)
+                step_values[power_slots] = power_signs / np.where(E != 0, E, 1)
+                values.append(step_values)
+                cost_vectors.append(self._cost_vector_derivative()[2] @ cost_inputs)
+                # Exergy flows and components, including the weights of dissipative costs, of the time step
+                step_data.append(
+                    (
+                        self.connections.snapshot(numeric_only),
+                        {name: vars(comp).copy() for name, comp in self.components.items()},
+                    )
+                )
+
+            try:
+                C_solutions = stack.solve(values, cost_vectors, self.sparse)
+            except SingularStackError as error:
+                steps = [start + k for k in error.systems]
+                raise ValueError(
+                    f"Exergoeconomic system is singular and cannot be solved for the time steps {steps}."
+                ) from error
+            if np.isnan(C_solutions).any():
+                raise ValueError(
+                    "The solution of the cost matrix contains NaN values, indicating an issue with the cost balance equations or specifications."
+                )
+
+            for step, ((snapshot, components), b, C_solution) in enumerate(
+                zip(step_data, cost_vectors, C_solutions, strict=True), start
+            ):
+                self.connections.restore(snapshot)
+                for name, attributes in components.items():
+                    vars(self.components[name]).update(attributes)
+                self._b = b
+                self._apply_cost_solution(C_solution)
+                rows.extend(self.component_cost_rows("Time step", step))
+
+        # The stored factorization belongs to the exergy state before the time series
+        self.invalidate_factorization()
+        logging.info(f"Exergoeconomic analysis of {len(states)} time steps completed successfully.")
+        return pd.DataFrame(rows)
+
+    def _time_series_pattern(self, stack, Tamb):
+        """
+        Find the entries of the cost matrix that depend on the exergy flows.
+
+        Parameters
+        ----------
+        stack : StackedCostSystem
+            Stack with the pattern of the current cost matrix.
+        Tamb : float
+            Ambient temperature in Kelvin.
+
+        Returns
+        -------
+        tuple
+            Equations of the system, pattern positions of the coefficients of
+            the power equations of the system, names of their connections and
+            signs, and pattern positions of the auxiliary equations of the
+            components.
+        """
+        system_equations = {row: eq for row, eq in self.equations.items() if row < self._num_system_equations}
+        power_entries, power_names, power_signs = [], [], []
+        for row, equation in system_equations.items():
+            if equation["kind"] == "aux_power_eq":
+                for name, sign in zip(equation["objects"], (1, -1), strict=True):
+                    power_entries.append((row, self.connections[name]["CostVar_index"]["exergy"]))
+                    power_names.append(name)
+                    power_signs.append(sign)
+
+        A, b, equations = self._A, self._b, self.equations
+        self._A = CostMatrix(self.num_variables)
+        self._b = np.zeros(self.num_variables)
+        self.equations = dict(system_equations)
+        self._component_auxiliary_equations(self._num_system_equations, Tamb)
+        aux_slots = stack.slots(self._A._entries)
+        self._A, self._b, self.equations = A, b, equations
+        return system_equations, stack.slots(power_entries), power_names, np.array(power_signs, dtype=float), aux_slots
+
+    def component_cost_rows(self, label, value):
+        """
+        Get the cost results of the current solution of the components as table rows.
+
+        The rows hold C_F, C_P, C_D and Z in currency per hour and r and f in
+        percent, named as in :meth:`exergoeconomic_results`, so that the
+        results of several solutions can be collected in one DataFrame as in
+        :meth:`run_time_series`.
+
+        Parameters
+        ----------
+        label : str
+            Name of the column identifying the solution, e.g. "Scenario".
+        value : object
+            Value of this column, e.g. the index of the solution.
+
+        Returns
+        -------
+        list of dict
+            One row per component, without cycle closers and power buses.
+        """
+        rows = []
+        for name, comp in self.components.items():
+            if isinstance(comp, CycleCloser | PowerBus):
+                continue
+            rows.append(
+                {
+                    label: value,
+                    "Component": name,
+                    f"C_F [{self.currency}/h]": getattr(comp, "C_F", np.nan) * 3600,
+                    f"C_P [{self.currency}/h]": getattr(comp, "C_P", np.nan) * 3600,
+                    f"C_D [{self.currency}/h]": getattr(comp, "C_D", np.nan) * 3600,
+                    f"Z [{self.currency}/h]": getattr(comp, "Z_costs", 0) * 3600,
+                    "r [%]": getattr(comp, "r", np.nan) * 100,
+                    "f [%]": getattr(comp, "f", np.nan) * 100,
+                }
+            )
+        return rows
+
+    def cost_sensitivities(self, outputs, specific=False):
+        r"""
+        Calculate the sensitivities of costs with respect to all cost inputs.
+
+        The derivatives of the selected outputs with respect to the investment
+        cost rate of every component and the specific cost of every system input
+        follow from the adjoint cost equations :math:`A^T \lambda = w`, which
+        are solved with the stored factorization of the cost matrix. This takes
+        one solution per output, independent of the number of inputs.
+
+        Parameters
+        ----------
+        outputs : list of str
+            Names of components and connections. For a component the cost rate
+            of its product C_P is differentiated, for a connection its total
+            cost rate C_TOT.
+        specific : bool, optional
+            Differentiate the specific costs c_P and c_TOT instead of the cost
+            rates, by default False.
+
+        Returns
+        -------
+        pandas.DataFrame
+            Sensitivities with one row per output and one column per input. The
+            columns are named like the keys of ``Exe_Eco_Costs``,
+            "<component_name>_Z" and "<connection_name>_c". Cost rates are in
+            currency/h and specific costs in currency/GJ.
+
+        Raises
+        ------
+        ValueError
+            If the analysis has not been run for the current exergy state or if
+            an output is neither a component nor a connection with costs.
+
+        Notes
+        -----
+        All costs are linear in the inputs, so the sensitivities do not depend on
+        the costs of the previous run. Power inputs without an assigned cost have
+        no boundary equation and are not among the inputs. Outputs a component
+        does not define, e.g. the product cost of a dissipative valve, are NaN.
+        """
+        if self._factorization is None or self._factorization_key[0] != self.exergy_analysis._revision:
+            raise ValueError(
+                "The cost matrix is not available for the current exergy state. "
+                "Run the exergoeconomic analysis before computing cost sensitivities."
+            )
+
+        z_inputs, c_inputs, db = self._cost_vector_derivative()
+        z_column = {name: i for i, name in enumerate(z_inputs)}
+
+        # Outputs as linear functions of the cost variables and the investment costs
+        weights = np.zeros((len(outputs), self.num_variables))
+        direct = np.zeros((len(outputs), db.shape[1]))
+        exergy = np.zeros(len(outputs))
+        snapshot = None
+        for i, name in enumerate(outputs):
+            comp = self.components.get(name)
+            if name in z_column and hasattr(comp, "exergoeconomic_balance"):
+                if snapshot is None:
+                    snapshot = self.connections.snapshot()
+                component_weights, z_weights = self._component_cost_map(comp)
+                weights[i], direct[i, z_column[name]] = component_weights[0], z_weights[0]
+                exergy[i] = getattr(comp, "E_P", np.nan)
+            elif name in self.connections and "CostVar_index" in self.connections[name]:
+                weights[i] = self._connection_cost_map(name)
+                exergy[i] = self.connections[name].get("E", np.nan)
+            else:
+                raise ValueError(f"Output '{name}' is neither a component nor a connection with cost variables.")
+        if snapshot is not None:
+            self.connections.restore(snapshot)
+
+        # One adjoint solution per output gives the gradient with respect to all inputs
+        adjoint = self._factorization.solve(weights.T, transpose=True)
+        gradient = adjoint.T @ db + direct
+        gradient[:, len(z_inputs) :] *= 3600 * 1e-9  # currency/h per currency/GJ
+        if specific:
+            gradient *= (1e9 / 3600 / exergy)[:, None]  # currency/GJ of the output
+        columns = [f"{name}_Z" for name in z_inputs] + [f"{name}_c" for name in c_inputs]
+        return pd.DataFrame(gradient, index=list(outputs), columns=columns)
+
+    def _cost_vector_derivative(self):
+        """
+        Get the derivative of the cost vector with respect to the cost inputs.
+
+        The cost vector is linear in the investment cost rates of the components
+        and the specific costs of the system inputs, so the derivative maps the
+        inputs to the cost vector, :math:`b = D p`.
+
+        Returns
+        -------
+        tuple
+            Names of the components with investment costs, names of the
+            connections with boundary equations and the derivative with one
+            column per input, in currency/s per currency/s and currency/s per
+            currency/J.
+        """
+        z_inputs = [name for name, comp in self.components.items() if not isinstance(comp, CycleCloser | PowerBus)]
+        c_inputs = list(dict.fromkeys(eq["object"][0] for eq in self.equations.values() if eq["kind"] == "boundary"))
+        z_column = {name: i for i, name in enumerate(z_inputs)}
+        c_column = {name: len(z_inputs) + i for i, name in enumerate(c_inputs)}
+        db = np.zeros((self.num_variables, len(z_inputs) + len(c_inputs)))
+        for row, equation in self.equations.items():
+            if equation["kind"] == "cost_balance":
+                db[row, z_column[equation["object"][0]]] = -1
+            elif equation["kind"] == "dis_balance":
+                db[row, z_column[equation["objects"][0]]] = -1
+            elif equation["kind"] == "boundary":
+                conn = self.connections[equation["object"][0]]
+                label = equation["property"].removeprefix("c_")
+                if conn.get("kind", "material") == "material":
+                    db[row, c_column[conn["name"]]] = conn.get(f"e_{label}", 0) * conn.get("m", 0)
+                else:
+                    db[row, c_column[conn["name"]]] = conn["E"]
+        return z_inputs, c_inputs, db
+
+    def _connection_cost_map(self, name):
+        """
+        Get the weights of the cost variables in the total cost rate of a connection.
+
+        The costs of loss streams distributed to the product streams are included.
+
+        Parameters
+        ----------
+        name : str
+            Name of the connection.
+
+        Returns
+        -------
+        numpy.ndarray
+            Weight of every cost variable.
+        """
+
+        def stream_weights(conn_name):
+            w = np.zeros(self.num_variables)
+            for label, col in self.connections[conn_name]["CostVar_index"].items():
+                if label != "dissipative":
+                    w[col] = 1
+            return w
+
+        weights = stream_weights(name)
+        product_streams = [
+            prod_name for prod_name in self.E_P_dict.get("inputs", []) if self.connections.get(prod_name) is not None
+        ]
+        if name in product_streams:
+            total_E = sum(self.connections[prod_name].get("E", 0) for prod_name in product_streams)
+            share = self.connections[name].get("E", 0) / total_E if total_E else 0
+            for loss_name in self.E_L_dict.get("inputs", []):
+                if share and "CostVar_index" in self.connections.get(loss_name, {}):
+                    weights += share * stream_weights(loss_name)
+        return weights
+
+    def _component_cost_map(self, comp, properties=("C_P",)):
+        """
+        Get the weights of the cost variables and the investment cost in cost rates of a component.
+
+        The cost rates are linear in the costs of the connected streams, the
+        weights are obtained by evaluating the exergoeconomic balance of the
+        component with the cost of each stream increased by one unit. The costs
+        of the connected streams are overwritten and the attributes of the
+        component restored.
+
+        Parameters
+        ----------
+        comp : Component
+            Component to get the weights of.
+        properties : tuple of str, optional
+            Cost rates or specific costs of the component, by default the cost
+            of the product C_P. Properties the component does not set are NaN.
+
+        Returns
+        -------
+        tuple
+            Weights of every cost variable with one row per property and weights
+            of the investment cost rate.
+        """
+        attributes = dict(vars(comp))
+        names = [
+            conn_name
+            for conn_name in (*self.topology.inlets(comp.name), *self.topology.outlets(comp.name))
+            if "CostVar_index" in self.connections[conn_name]
+        ]
+        columns = sorted(
+            {
+                col
+                for conn_name in names
+                for label, col in self.connections[conn_name]["CostVar_index"].items()
+                if label != "dissipative"
+            }
+        )
+
+        def cost_rates(C_solution, Z_costs):
+            self._assign_connection_costs(C_solution, names)
+            comp.Z_costs = Z_costs
+            comp.exergoeconomic_balance(self.exergy_analysis.Tamb, self.chemical_exergy_enabled)
+            return np.array([getattr(comp, prop, np.nan) for prop in properties], dtype=float)
+
+        # Start from the solution of the last run, which has no zero costs in the ratios of the balance
+        C_solution = np.array(self._C_solution, dtype=float)
+        Z_costs = attributes.get("Z_costs", 0)
+        base = cost_rates(C_solution, Z_costs)
+        weights = np.zeros((len(properties), self.num_variables))
+        for col in columns:
+            C_solution[col] += 1
+            weights[:, col] = cost_rates(C_solution, Z_costs) - base
+            C_solution[col] -= 1
+        z_weights = cost_rates(C_solution, Z_costs + 1) - base
+
+        vars(comp).clear()
+        vars(comp).update(attributes)
+        return weights, z_weights
+
     def print_equations(self):
         """
         Get mapping of equation indices to equation descriptions.
@@ -1550,50 +2822,55 @@ class ExergoeconomicAnalysis:
         """
         return {int(k): v for k, v in self.variables.items()}
 
-    def detect_linear_dependencies(self, tol_strict: float = 1e-12, tol_near: float = 1e-8):
+    def detect_linear_dependencies(self, tol_strict: float = 1e-12, tol_near: float = 1e-8, tol_rank=None):
         """
         Scan A for zero-rows, zero-cols, exactly colinear equation pairs
-        (error ≤ tol_strict), and near-colinear pairs (≤ tol_near but > tol_strict).
-        """
-        A = self._A
-
-        # 1) empty rows/cols
-        zero_rows = np.where((np.abs(A) < tol_strict).all(axis=1))[0].tolist()
-        zero_cols = np.where((np.abs(A) < tol_strict).all(axis=0))[0].tolist()
-
-        # 2) norms once
-        norms = np.linalg.norm(A, axis=1)
-
-        strict = []
-        near = []
-        n = A.shape[0]
-        for i in range(n):
-            for j in range(i + 1, n):
-                ni, nj = norms[i], norms[j]
-                if ni > tol_strict and nj > tol_strict:
-                    dot = float(np.dot(A[i], A[j]))
-                    diff = abs(dot - ni * nj)
-                    if diff <= tol_strict:
-                        strict.append((i, j))
-                    elif diff <= tol_near:
-                        near.append((i, j))
-
-        # drop any strict pairs from the near list
-        near_only = [pair for pair in near if pair not in strict]
+        (error ≤ tol_strict), near-colinear pairs (≤ tol_near but > tol_strict),
+        the numerical rank and the structurally over- and under-determined parts.
+
+        Parameters
+        ----------
+        tol_strict : float, optional
+            Magnitude of zero entries and maximum colinearity error 1 - cos θ of
+            exactly colinear equations, by default 1e-12.
+        tol_near : float, optional
+            Maximum colinearity error of nearly colinear equations, by default 1e-8.
+        tol_rank : float, optional
+            Singular values up to this value count as zero, by default relative
+            to the largest singular value and the machine precision.
+
+        Returns
+        -------
+        dict
+            Zero rows and columns, colinear equation pairs, the numerical rank with
+            the null space (variable directions) and left null space (equation
+            combinations), and the structural rank with the over-determined
+            equations and under-determined variables.
+        """
+        zero_rows, zero_cols = self._A.zero_rows_and_columns(tol_strict)
+        strict, near = self._A.colinear_rows(tol_strict, tol_near)
+        rank, null_space, left_null_space = self._A.rank_analysis(tol_rank)
+        structural_rank, over, under = self._A.structural_analysis()
 
         return {
             "zero_rows": zero_rows,
             "zero_columns": zero_cols,
             "colinear_equations_strict": strict,
-            "colinear_equations_near_only": near_only,
+            "colinear_equations_near_only": near,
+            "rank": rank,
+            "null_space": null_space,
+            "left_null_space": left_null_space,
+            "structural_rank": structural_rank,
+            "overdetermined_equations": over,
+            "underdetermined_variables": under,
         }
 
-    def print_dependency_report(self, tol_strict: float = 1e-12, tol_near: float = 1e-8):
+    def print_dependency_report(self, tol_strict: float = 1e-12, tol_near: float = 1e-8, tol_rank=None):
         """
         Nicely print which equations or variables are under- or over-determined,
         distinguishing exact vs. near colinearities.
         """
-        deps = self.detect_linear_dependencies(tol_strict, tol_near)
+        deps = self.detect_linear_dependencies(tol_strict, tol_near, tol_rank)
 
         # empty equations
         if deps["zero_rows"]:
@@ -1628,6 +2905,29 @@ class ExergoeconomicAnalysis:
         else:
             print("✓ No near-colinear equation pairs detected.")
 
+        # structurally over- and under-determined parts
+        if deps["overdetermined_equations"]:
+            print("\n⚠ Structurally over-determined equations:")
+            for eq in deps["overdetermined_equations"]:
+                print(f"  • Eq[{eq}]: {self.equations.get(eq)}")
+        if deps["underdetermined_variables"]:
+            print("\n⚠ Structurally under-determined variables:")
+            for var in deps["underdetermined_variables"]:
+                print(f"  • Var[{var}]: {self.variables.get(str(var))}")
+        if not deps["overdetermined_equations"] and not deps["underdetermined_variables"]:
+            print("✓ Every equation can be assigned to its own variable.")
+
+        # numerical rank, with the equations of every linear dependency
+        left_null_space = deps["left_null_space"]
+        if left_null_space.shape[1]:
+            print(f"\n⚠ Numerical rank {deps['rank']} of {self._A.shape[0]} equations, linearly dependent equations:")
+            for k in range(left_null_space.shape[1]):
+                weights = np.abs(left_null_space[:, k])
+                equations = np.flatnonzero(weights > tol_near * weights.max()).tolist()
+                print(f"  • Dependency {k + 1}: " + ", ".join(f"Eq[{eq}]" for eq in equations))
+        else:
+            print("✓ The cost matrix has full numerical rank.")
+
     def exergoeconomic_results(self, print_results=True):
         """
         Displays tables of exergoeconomic analysis results with columns for costs and economic parameters for each component,
@@ -1723,99 +3023,26 @@ class ExergoeconomicAnalysis:
         # -------------------------
         # Add cost columns to material connections.
         # -------------------------
+        # All rows of the material table are material connections which are part of the system.
+        mat_names = df_mat["Connection"].tolist()
+        table = self.connections
         # Uppercase cost columns (in currency/h)
-        C_T_list = []
-        C_M_list = []
-        C_CH_list = []
-        C_TOT_list = []
+        df_mat[f"C^T [{self.currency}/h]"] = _result_column(table, "C_T", mat_names, 3600)
+        df_mat[f"C^M [{self.currency}/h]"] = _result_column(table, "C_M", mat_names, 3600)
+        df_mat[f"C^CH [{self.currency}/h]"] = _result_column(table, "C_CH", mat_names, 3600)
+        df_mat[f"C^TOT [{self.currency}/h]"] = _result_column(table, "C_TOT", mat_names, 3600)
         # Lowercase cost columns (in {currency}/GJ_ex)
-        c_T_list = []
-        c_M_list = []
-        c_CH_list = []
-        c_TOT_list = []
-
-        # Create set of valid component names
-        valid_components = {comp.name for comp in self.components.values()}
-
-        for _idx, row in df_mat.iterrows():
-            conn_name = row["Connection"]
-            conn_data = self.connections.get(conn_name, {})
-
-            # Verify connection is part of the system
-            is_part_of_the_system = (
-                conn_data.get("source_component") in valid_components
-                or conn_data.get("target_component") in valid_components
-            )
-            if not is_part_of_the_system:
-                # Skip this connection
-                C_T_list.append(np.nan)
-                C_M_list.append(np.nan)
-                # ... append nan for all other lists
-                continue
-
-            kind = conn_data.get("kind", None)
-            if kind == "material":
-                C_T = conn_data.get("C_T", None)
-                C_M = conn_data.get("C_M", None)
-                C_CH = conn_data.get("C_CH", None)
-                C_TOT = conn_data.get("C_TOT", None)
-                c_T = conn_data.get("c_T", None)
-                c_M = conn_data.get("c_M", None)
-                c_CH = conn_data.get("c_CH", None)
-                c_TOT = conn_data.get("c_TOT", None)
-                C_T_list.append(C_T * 3600 if C_T is not None else None)
-                C_M_list.append(C_M * 3600 if C_M is not None else None)
-                C_CH_list.append(C_CH * 3600 if C_CH is not None else None)
-                C_TOT_list.append(C_TOT * 3600 if C_TOT is not None else None)
-                c_T_list.append(c_T * 1e9 if c_T is not None else None)
-                c_M_list.append(c_M * 1e9 if c_M is not None else None)
-                c_CH_list.append(c_CH * 1e9 if c_CH is not None else None)
-                c_TOT_list.append(c_TOT * 1e9 if c_TOT is not None else None)
-            elif kind in {"heat", "power"}:
-                # For non-material streams in the material table, only C^TOT is defined.
-                C_T_list.append(np.nan)
-                C_M_list.append(np.nan)
-                C_CH_list.append(np.nan)
-                c_T_list.append(np.nan)
-                c_M_list.append(np.nan)
-                c_CH_list.append(np.nan)
-                C_TOT = conn_data.get("C_TOT", None)
-                C_TOT_list.append(C_TOT * 3600 if C_TOT is not None else None)
-                c_TOT = conn_data.get("C_TOT", None)
-                c_TOT_list.append(c_TOT * 1e9 if c_TOT is not None else None)
-            else:
-                C_T_list.append(np.nan)
-                C_M_list.append(np.nan)
-                C_CH_list.append(np.nan)
-                C_TOT_list.append(np.nan)
-                c_T_list.append(np.nan)
-                c_M_list.append(np.nan)
-                c_CH_list.append(np.nan)
-                c_TOT_list.append(np.nan)
-
-        df_mat[f"C^T [{self.currency}/h]"] = C_T_list
-        df_mat[f"C^M [{self.currency}/h]"] = C_M_list
-        df_mat[f"C^CH [{self.currency}/h]"] = C_CH_list
-        df_mat[f"C^TOT [{self.currency}/h]"] = C_TOT_list
-        df_mat[f"c^T [{self.currency}/GJ_ex]"] = c_T_list
-        df_mat[f"c^M [{self.currency}/GJ_ex]"] = c_M_list
-        df_mat[f"c^CH [{self.currency}/GJ_ex]"] = c_CH_list
-        df_mat[f"c^TOT [{self.currency}/GJ_ex]"] = c_TOT_list
+        df_mat[f"c^T [{self.currency}/GJ_ex]"] = _result_column(table, "c_T", mat_names, 1e9)
+        df_mat[f"c^M [{self.currency}/GJ_ex]"] = _result_column(table, "c_M", mat_names, 1e9)
+        df_mat[f"c^CH [{self.currency}/GJ_ex]"] = _result_column(table, "c_CH", mat_names, 1e9)
+        df_mat[f"c^TOT [{self.currency}/GJ_ex]"] = _result_column(table, "c_TOT", mat_names, 1e9)
 
         # -------------------------
         # Add cost columns to non-material connections.
         # -------------------------
-        C_TOT_non_mat = []
-        c_TOT_non_mat = []
-        for _idx, row in df_non_mat.iterrows():
-            conn_name = row["Connection"]
-            conn_data = self.connections.get(conn_name, {})
-            C_TOT = conn_data.get("C_TOT", None)
-            C_TOT_non_mat.append(C_TOT * 3600 if C_TOT is not None else None)
-            c_TOT = conn_data.get("c_TOT", None)
-            c_TOT_non_mat.append(c_TOT * 1e9 if c_TOT is not None else None)
-        df_non_mat[f"C^TOT [{self.currency}/h]"] = C_TOT_non_mat
-        df_non_mat[f"c^TOT [{self.currency}/GJ_ex]"] = c_TOT_non_mat
+        non_mat_names = df_non_mat["Connection"].tolist()
+        df_non_mat[f"C^TOT [{self.currency}/h]"] = _result_column(table, "C_TOT", non_mat_names, 3600)
+        df_non_mat[f"c^TOT [{self.currency}/GJ_ex]"] = _result_column(table, "c_TOT", non_mat_names, 1e9)
 
         # -------------------------
         # Split the material connections into two tables according to your specifications.
@@ -1882,6 +3109,10 @@ class EconomicAnalysis:
     """
     Perform economic analysis of a power plant using the total revenue requirement method.
 
+    The parameters may be scalars or NumPy arrays of broadcastable shapes, e.g.
+    from :meth:`grid`. With arrays, every element is a scenario of the
+    economic parameters and all results are computed for all scenarios at once.
+
     Parameters
     ----------
     pars : dict
@@ -1893,13 +3124,13 @@ class EconomicAnalysis:
 
     Attributes
     ----------
-    tau : float
+    tau : float or numpy.ndarray
         Full load hours of the plant (hours/year).
-    i_eff : float
+    i_eff : float or numpy.ndarray
         Effective rate of return (yearly based).
-    n : int
+    n : int or numpy.ndarray
         Lifetime of the plant (years).
-    r_n : float
+    r_n : float or numpy.ndarray
         Nominal escalation rate (yearly based).
     """
 
@@ -1916,10 +3147,37 @@ class EconomicAnalysis:
             - n: Lifetime of the plant (years)
             - r_n: Nominal escalation rate (yearly based)
         """
-        self.tau = pars["tau"]
-        self.i_eff = pars["i_eff"]
-        self.n = pars["n"]
-        self.r_n = pars["r_n"]
+        self.tau = _economic_parameter(pars["tau"])
+        self.i_eff = _economic_parameter(pars["i_eff"])
+        self.n = _economic_parameter(pars["n"])
+        self.r_n = _economic_parameter(pars["r_n"])
+
+    @classmethod
+    def grid(cls, tau, i_eff, n, r_n):
+        """
+        Create an economic analysis for all combinations of the given parameter values.
+
+        Parameters
+        ----------
+        tau, i_eff, n, r_n : float or sequence
+            Values of the full load hours, the effective rate of return, the
+            lifetime and the nominal escalation rate.
+
+        Returns
+        -------
+        EconomicAnalysis
+            Analysis with one scenario per combination. The parameters are
+            one-dimensional arrays, the last parameter varies fastest.
+
+        Examples
+        --------
+        >>> from exerpy import EconomicAnalysis
+        >>> econ = EconomicAnalysis.grid(tau=[5000, 8000], i_eff=[0.05, 0.08, 0.1], n=20, r_n=0.02)
+        >>> econ.tau.shape
+        (6,)
+        """
+        values = np.meshgrid(*(np.atleast_1d(value) for value in (tau, i_eff, n, r_n)), indexing="ij")
+        return cls(dict(zip(("tau", "i_eff", "n", "r_n"), (value.ravel() for value in values), strict=True)))
 
     def compute_crf(self):
         """
@@ -1927,7 +3185,7 @@ class EconomicAnalysis:
 
         Returns
         -------
-        float
+        float or numpy.ndarray
             The capital recovery factor.
 
         Notes
@@ -1942,7 +3200,7 @@ class EconomicAnalysis:
 
         Returns
         -------
-        float
+        float or numpy.ndarray
             The cost escalation levelization factor.
 
         Notes
@@ -1959,12 +3217,12 @@ class EconomicAnalysis:
 
         Parameters
         ----------
-        total_PEC : float
+        total_PEC : float or numpy.ndarray
             Total purchasing equipment cost (PEC) across all components.
 
         Returns
         -------
-        float
+        float or numpy.ndarray
             Levelized investment cost (currency/year).
         """
         return total_PEC * self.compute_crf()
@@ -1975,9 +3233,11 @@ class EconomicAnalysis:
 
         Parameters
         ----------
-        PEC_list : list of float
+        PEC_list : list of float or numpy.ndarray
             The purchasing equipment cost (PEC) of each component (in currency).
-        OMC_relative : list of float
+            An array with the components along the last axis may hold
+            different equipment costs per scenario.
+        OMC_relative : list of float or numpy.ndarray
             For each component, the first-year OM cost as a fraction of its PEC.
 
         Returns
@@ -1987,29 +3247,65 @@ class EconomicAnalysis:
             - Z_CC: List of investment cost rates per component (currency/hour)
             - Z_OM: List of operating and maintenance cost rates per component (currency/hour)
             - Z_total: List of total cost rates per component (currency/hour)
+
+            If the economic parameters or the equipment costs are arrays, the
+            cost rates are arrays of shape (scenarios, components) instead.
         """
-        total_PEC = sum(PEC_list)
+        PEC = np.asarray(PEC_list, dtype=float)
+        OMC = np.asarray(OMC_relative, dtype=float)[: PEC.shape[-1]]
+        PEC_OMC = PEC[..., : OMC.shape[-1]]
+        scalar = PEC.ndim == 1 and all(np.ndim(value) == 0 for value in (self.tau, self.i_eff, self.n, self.r_n))
+
+        # Scenario values get a trailing axis to broadcast over the components.
+        tau = np.asarray(self.tau, dtype=float)[..., None]
+        total_PEC = PEC.sum(axis=-1, keepdims=True)
         # Levelize total investment cost and allocate proportionally.
-        levelized_investment_cost = self.compute_levelized_investment_cost(total_PEC)
-        if total_PEC == 0:
-            Z_CC = [0 for _ in PEC_list]
-        else:
-            Z_CC = [(levelized_investment_cost * pec / total_PEC) / self.tau for pec in PEC_list]
-
-        # Compute first-year OMC for each component as a fraction of PEC.
-        first_year_OMC = [frac * pec for frac, pec in zip(OMC_relative, PEC_list, strict=False)]
-        total_first_year_OMC = sum(first_year_OMC)
+        levelized_investment_cost = total_PEC * np.asarray(self.compute_crf(), dtype=float)[..., None]
+        # Levelize the total first-year operating and maintenance cost.
+        total_first_year_OMC = (OMC * PEC_OMC).sum(axis=-1, keepdims=True)
+        levelized_om_cost = total_first_year_OMC * np.asarray(self.compute_celf(), dtype=float)[..., None]
 
-        # Levelize the total operating and maintenance cost.
-        celf_value = self.compute_celf()
-        levelized_om_cost = total_first_year_OMC * celf_value
-
-        # Allocate the levelized OM cost to each component in proportion to its PEC.
-        if total_PEC == 0:
-            Z_OM = [0 for _ in PEC_list]
-        else:
-            Z_OM = [(levelized_om_cost * pec / total_PEC) / self.tau for pec in PEC_list]
+        # Allocate the levelized costs to each component in proportion to its PEC.
+        with np.errstate(divide="ignore", invalid="ignore"):
+            Z_CC = np.where(total_PEC == 0, 0.0, (levelized_investment_cost * PEC / total_PEC) / tau)
+            Z_OM = np.where(total_PEC == 0, 0.0, (levelized_om_cost * PEC / total_PEC) / tau)
 
         # Total cost rate per component.
-        Z_total = [zcc + zom for zcc, zom in zip(Z_CC, Z_OM, strict=False)]
+        Z_total = Z_CC + Z_OM
+        if scalar:
+            return Z_CC.tolist(), Z_OM.tolist(), Z_total.tolist()
         return Z_CC, Z_OM, Z_total
+
+    @staticmethod
+    def cost_inputs(component_names, Z):
+        """
+        Convert cost rates of the components to investment cost inputs of the exergoeconomic analysis.
+
+        Parameters
+        ----------
+        component_names : list of str
+            Names of the components in the order of the cost rates.
+        Z : array-like
+            Cost rates in currency/h, with the components along the last axis.
+
+        Returns
+        -------
+        dict or list of dict
+            Investment costs "<component_name>_Z" in the format of the
+            ``Exe_Eco_Costs`` argument of :meth:`ExergoeconomicAnalysis.run`, one
+            dictionary per scenario if ``Z`` has several scenarios. The
+            dictionaries can be completed with the costs of the system inputs
+            and passed to :meth:`ExergoeconomicAnalysis.run_scenarios`.
+        """
+        Z = np.asarray(Z, dtype=float)
+        if Z.shape[-1] != len(component_names):
+            raise ValueError(f"Got {Z.shape[-1]} cost rates for {len(component_names)} components.")
+        keys = [f"{name}_Z" for name in component_names]
+        if Z.ndim == 1:
+            return dict(zip(keys, Z.tolist(), strict=True))
+        return [dict(zip(keys, row, strict=True)) for row in Z.reshape(-1, Z.shape[-1]).tolist()]
+
+
+def _economic_parameter(value):
+    """Keep scalar parameters as they are and convert sequences to arrays."""
+    return value if np.ndim(value) == 0 else np.asarray(value)
@@ -0,0 +1,283 @@
+import json
+import logging
+import math
+import os
+
+import CoolProp.CoolProp as CP
+
+from exerpy import __datapath__
+from exerpy.properties import CompositionCache, molar_mass
+
+#: Number of decimals the fractions are rounded to in the cache keys.
+COMPOSITION_DIGITS = 10
+
+
+def _parse_value(value):
+    if isinstance(value, str):
+        try:
+            return float(value)
+        except ValueError:
+            return value
+    return value
+
+
+class ChemicalExergyLibrary:
+    r"""
+    Standard chemical exergy data of a library in the data folder.
+
+    The library file is read once, the ``"NaN"`` strings are parsed to floats
+    and the CoolProp aliases of all fluids are resolved to their library entry
+    when the library is created. Use :meth:`load` to get the library shared
+    by all chemical exergy calculations of the process.
+
+    Parameters
+    ----------
+    name : str
+        Name of the library, e.g. ``"Ahrendts"``, the data is read from
+        ``data/<name>.json``.
+
+    Attributes
+    ----------
+    name : str
+        Name of the library.
+    data : dict
+        Library entries with the parsed values, the standard chemical exergy
+        in J/mol is at index 3, the one of liquid water at index 2.
+    water_aliases : list
+        CoolProp aliases of water.
+
+    Examples
+    --------
+    >>> from exerpy.chemical_exergy import ChemicalExergyLibrary
+    >>> library = ChemicalExergyLibrary.load("Ahrendts")
+    >>> library is ChemicalExergyLibrary.load("Ahrendts")
+    True
+    >>> library.entry("CO2")
+    'CARBONDIOXIDE'
+    >>> library.exergy("N2")
+    639
+    """
+
+    _libraries = {}
+
+    def __init__(self, name):
+        self.name = name
+        try:
+            chem_ex_file = os.path.join(__datapath__, f"{name}.json")
+            with open(chem_ex_file) as file:
+                raw_data = json.load(file)  # data in J/mol
+        except FileNotFoundError:
+            error_msg = (
+                f"Chemical exergy data file '{name}.json' not found. "
+                "Please ensure the file exists or set chemExLib to 'Ahrendts'."
+            )
+            logging.error(error_msg)
+            raise FileNotFoundError(error_msg)
+
+        self.data = {key: [_parse_value(value) for value in values] for key, values in raw_data.items()}
+        self.water_aliases = CP.get_aliases("H2O")
+        self._water_names = set(self.water_aliases)
+        self._aliases = {}
+        self._entries = {}
+        for fluid in CP.FluidsList():
+            aliases = CP.get_aliases(fluid)
+            entry = self._first_entry(aliases)
+            for alias in aliases:
+                self._aliases[alias] = aliases
+                self._entries[alias] = entry
+
+    @classmethod
+    def load(cls, name):
+        """
+        Get the shared instance of a library.
+
+        Parameters
+        ----------
+        name : str or ChemicalExergyLibrary
+            Name of the library. A library instance is returned as it is.
+
+        Returns
+        -------
+        ChemicalExergyLibrary
+            The library, read from file on first use only.
+        """
+        if isinstance(name, cls):
+            return name
+        library = cls._libraries.get(name)
+        if library is None:
+            library = cls(name)
+            cls._libraries[name] = library
+        return library
+
+    @classmethod
+    def clear(cls):
+        """Remove all shared library instances and the cached chemical exergy values."""
+        cls._libraries.clear()
+        clear_caches()
+
+    def _first_entry(self, aliases):
+        for alias in aliases:
+            if alias.upper() in self.data:
+                return alias.upper()
+        return None
+
+    def _resolve(self, substance):
+        if substance not in self._aliases:
+            aliases = CP.get_aliases(substance)
+            self._aliases[substance] = aliases
+            self._entries[substance] = self._first_entry(aliases)
+        return self._entries[substance]
+
+    def aliases(self, substance):
+        """
+        Get the CoolProp aliases of a substance.
+
+        Parameters
+        ----------
+        substance : str
+            Name of the substance.
+
+        Returns
+        -------
+        list
+            CoolProp aliases of the substance.
+        """
+        self._resolve(substance)
+        return self._aliases[substance]
+
+    def is_water(self, substance):
+        """Check whether a substance is water."""
+        return substance in self._water_names or not self._water_names.isdisjoint(self.aliases(substance))
+
+    def entry(self, substance):
+        """
+        Get the library entry of a substance.
+
+        Parameters
+        ----------
+        substance : str
+            Name of the substance.
+
+        Returns
+        -------
+        str
+            Key of the first CoolProp alias of the substance in the library.
+
+        Raises
+        ------
+        KeyError
+            If none of the aliases is in the library.
+        """
+        entry = self._resolve(substance)
+        if entry is None:
+            logging.error(f"No matching alias found for {substance}")
+            raise KeyError(f"No matching alias found for {substance}")
+        return entry
+
+    def exergy(self, substance, column=3):
+        """
+        Get the standard chemical exergy of a substance.
+
+        Parameters
+        ----------
+        substance : str
+            Name of the substance.
+        column : int, optional
+            Column of the library entry, 3 for the standard chemical exergy
+            and 2 for the one of the liquid phase.
+
+        Returns
+        -------
+        float
+            Standard chemical exergy in J/mol.
+
+        Raises
+        ------
+        KeyError
+            If the substance is not in the library.
+        ValueError
+            If the library has no value for the substance.
+        """
+        value = self.data[self.entry(substance)][column]
+        if not isinstance(value, float | int) or math.isnan(value):
+            raise ValueError(f"No chemical exergy data for {substance} in library {self.name}.")
+        return value
+
+    def molar_mass(self, substance):
+        """
+        Get the molar mass of a substance.
+
+        Parameters
+        ----------
+        substance : str
+            Name of the substance.
+
+        Returns
+        -------
+        float
+            Molar mass in kg/mol.
+        """
+        return molar_mass(substance)
+
+
+def composition_key(composition, digits=COMPOSITION_DIGITS):
+    """
+    Get a hashable key of a composition.
+
+    The fractions are normalized to a sum of one, rounded and sorted by the
+    name of the substance, so that the same mixture gives the same key.
+    Results cached under the key are calculated from the composition of the
+    key, so they do not depend on which of the matching compositions was seen
+    first.
+
+    Parameters
+    ----------
+    composition : dict
+        Substance names mapped to their mass or molar fractions.
+    digits : int, optional
+        Number of decimals the fractions are rounded to.
+
+    Returns
+    -------
+    tuple
+        Pairs of substance name and rounded fraction.
+
+    Examples
+    --------
+    >>> from exerpy.chemical_exergy import composition_key
+    >>> composition_key({"O2": 0.42, "N2": 1.58})
+    (('N2', 0.79), ('O2', 0.21))
+    """
+    total = sum(composition.values())
+    if total > 0:
+        return tuple(sorted((name, round(fraction / total, digits)) for name, fraction in composition.items()))
+    return tuple(sorted((name, round(fraction, digits)) for name, fraction in composition.items()))
+
+
+#: Molar fractions of mass compositions.
+molar_fraction_cache = CompositionCache()
+
+#: Specific chemical exergy of compositions at a reference environment.
+chemical_exergy_cache = CompositionCache()
+
+
+def cache_info():
+    """
+    Get the statistics of the chemical exergy caches.
+
+    Returns
+    -------
+    dict
+        Cache statistics of the molar fractions and the chemical exergy.
+    """
+    return {"molar_fractions": molar_fraction_cache.info(), "chemical_exergy": chemical_exergy_cache.info()}
+
+
+def clear_caches():
+    """
+    Clear the chemical exergy caches.
+
+    Call this when the reference environment or the library data changes.
+    """
+    molar_fraction_cache.clear()
+    chemical_exergy_cache.clear()
@@ -1,5 +1,10 @@
+import logging
+
 import numpy as np
 
+#: Stream properties passed to the vectorized exergy balance kernels.
+KERNEL_PROPERTIES = ("m", "T", "p", "h", "e_PH", "e_T", "e_M", "energy_flow")
+
 
 def component_registry(cls):
     """
@@ -38,6 +43,12 @@ class Component:
         Exergy destruction of the component :math:`\dot{E}_\mathrm{D}` in :math:`\mathrm{W}`.
     epsilon : float
         Exergetic efficiency of the component :math:`\varepsilon` in :math:`-`.
+    r_basis : str
+        Costs the relative cost difference :math:`r` of the exergoeconomic
+        balance is defined on: ``"specific"`` for
+        :math:`r = (c_\mathrm{P} - c_\mathrm{F}) / c_\mathrm{F}` or
+        ``"rates"`` for
+        :math:`r = (\dot{C}_\mathrm{P} - \dot{C}_\mathrm{F}) / \dot{C}_\mathrm{F}`.
 
     Notes
     -----
@@ -60,6 +71,8 @@ class Component:
     exerpy.components : Module containing all available components for exergy analysis
     """
 
+    r_basis = "specific"
+
     def __init__(self, **kwargs):
         r"""Initialize the component with given parameters."""
         self.__dict__.update(kwargs)
@@ -80,6 +93,93 @@ class Component:
         """
         pass
 
+    def check_connectors(self):
+        r"""
+        Check that the component has the inlets and outlets its exergy balance requires.
+
+        The check is run by :meth:`calc_exergy_balance` and, for the vectorized
+        kernels, once per instance before the kernel is called. Child classes
+        override it; the base class does not require any connections.
+
+        Raises
+        ------
+        ValueError
+            If required inlets or outlets are missing.
+        """
+        pass
+
+    @classmethod
+    def has_vectorized_kernel(cls):
+        r"""
+        Check if the component class defines a vectorized exergy balance kernel.
+
+        A kernel is a class method
+        ``calc_exergy_balance_vectorized(inl, outl, T0, p0, split_physical_exergy, dissipative=False)``
+        that calculates the exergy balance for many instances or operating
+        points at once. It evaluates the same case logic as
+        :meth:`calc_exergy_balance` with NumPy masks instead of branching on
+        scalars. All arrays share one shape, e.g. (instances,) or
+        (operating points, instances).
+
+        The kernel takes the inlet and outlet connector index mapped to a
+        dictionary of stream property arrays (see :func:`stream_arrays`), the
+        ambient temperature in :math:`\mathrm{K}` and pressure in
+        :math:`\mathrm{Pa}`, the flag to split the physical exergy and the
+        dissipative flag of the instances. It returns a dictionary with the
+        arrays of ``E_F``, ``E_P``, ``E_D`` and ``epsilon`` and any further
+        attribute set by :meth:`calc_exergy_balance` (e.g. ``P``).
+
+        Only kernels defined by the class itself count: a child class of a
+        component with a kernel, which may change the exergy balance, is
+        evaluated instance by instance until it defines its own kernel.
+
+        Returns
+        -------
+        bool
+            True if the class defines ``calc_exergy_balance_vectorized``.
+        """
+        return "calc_exergy_balance_vectorized" in cls.__dict__
+
+    @classmethod
+    def calc_exergy_balances(cls, components, T0, p0, split_physical_exergy):
+        r"""
+        Calculate the exergy balance of several instances of this class with the vectorized kernel.
+
+        The results are assigned to the instances in the same way as
+        :meth:`calc_exergy_balance` does.
+
+        Parameters
+        ----------
+        components : list
+            Instances of this class.
+        T0 : float
+            Ambient temperature in :math:`\mathrm{K}`.
+        p0 : float
+            Ambient pressure in :math:`\mathrm{Pa}`.
+        split_physical_exergy : bool
+            Flag indicating whether physical exergy is split into thermal and mechanical components.
+
+        Returns
+        -------
+        dict
+            Result arrays in the order of the instances.
+
+        Raises
+        ------
+        ValueError
+            If an instance lacks required inlets or outlets.
+        """
+        for component in components:
+            component.check_connectors()
+        inl = _connector_arrays([component.inl for component in components])
+        outl = _connector_arrays([component.outl for component in components])
+        dissipative = np.array([bool(getattr(component, "dissipative", False)) for component in components])
+        results = cls.calc_exergy_balance_vectorized(inl, outl, T0, p0, split_physical_exergy, dissipative)
+        for i, component in enumerate(components):
+            for key, values in results.items():
+                setattr(component, key, float(values[i]))
+        return results
+
     def calc_epsilon(self):
         r"""
         Calculate the exergetic efficiency of the component.
@@ -124,3 +224,75 @@ class Component:
             If True, chemical exergy is considered in the calculations.
         """
         return
+
+
+def stream_arrays(streams):
+    r"""
+    Collect the properties of one connector of several instances or operating points.
+
+    Parameters
+    ----------
+    streams : list
+        Connection data (or None for a missing connection) per instance.
+
+    Returns
+    -------
+    dict
+        Arrays of all :data:`KERNEL_PROPERTIES` (NaN where a value is missing)
+        and the boolean masks ``exists`` and ``power`` marking existing and
+        power connections.
+    """
+    arrays = {}
+    for key in KERNEL_PROPERTIES:
+        values = []
+        for stream in streams:
+            value = stream.get(key) if stream is not None else None
+            values.append(np.nan if value is None else value)
+        arrays[key] = np.array(values, dtype=float)
+    arrays["exists"] = np.array([stream is not None for stream in streams], dtype=bool)
+    arrays["power"] = np.array([stream is not None and stream.get("kind") == "power" for stream in streams], dtype=bool)
+    return arrays
+
+
+def _connector_arrays(connectors):
+    connector_ids = sorted({idx for conns in connectors for idx in conns}, key=str)
+    return {idx: stream_arrays([conns.get(idx) for conns in connectors]) for idx in connector_ids}
+
+
+def kernel_epsilon(E_P, E_F):
+    r"""
+    Calculate the exergetic efficiency elementwise, NaN where the exergy fuel is zero.
+
+    Parameters
+    ----------
+    E_P : numpy.ndarray
+        Exergy product.
+    E_F : numpy.ndarray
+        Exergy fuel.
+
+    Returns
+    -------
+    numpy.ndarray
+        Exergetic efficiency, see :meth:`Component.calc_epsilon`.
+    """
+    E_P, E_F = np.broadcast_arrays(np.asarray(E_P, dtype=float), np.asarray(E_F, dtype=float))
+    with np.errstate(invalid="ignore"):
+        return np.divide(E_P, E_F, out=np.full(E_F.shape, np.nan), where=E_F != 0)
+
+
+def log_kernel_cases(level, mask, msg):
+    r"""
+    Log one message for all instances or operating points matching a case mask.
+
+    Parameters
+    ----------
+    level : int
+        Logging level.
+    mask : numpy.ndarray
+        Boolean case mask.
+    msg : str
+        Message, prefixed with the number of matching entries.
+    """
+    count = int(np.count_nonzero(mask))
+    if count:
+        logging.log(level, f"{count} case(s): {msg}")
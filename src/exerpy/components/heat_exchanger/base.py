@@ -2,7 +2,7 @@ import logging
 
 import numpy as np
 
-from exerpy.components.component import Component, component_registry
+from exerpy.components.component import Component, component_registry, kernel_epsilon, log_kernel_cases
 
 
 @component_registry
@@ -63,6 +63,18 @@ class HeatExchanger(Component):
         self.dissipative = False
         super().__init__(**kwargs)
 
+    def check_connectors(self):
+        r"""
+        Check that the heat exchanger has the inlets and outlets its exergy balance requires.
+
+        Raises
+        ------
+        ValueError
+            If required inlets or outlets are missing.
+        """
+        if len(self.inl) < 2 or len(self.outl) < 2:
+            raise ValueError("Heat exchanger requires two inlets and two outlets.")
+
     def calc_exergy_balance(self, T0: float, p0: float, split_physical_exergy) -> None:
         r"""
         Compute the exergy balance of the heat exchanger.
@@ -248,9 +260,7 @@ class HeatExchanger(Component):
         ValueError
             If required inlets or outlets are missing.
         """
-        # Ensure that the component has both inlet and outlet streams
-        if len(self.inl) < 2 or len(self.outl) < 2:
-            raise ValueError("Heat exchanger requires two inlets and two outlets.")
+        self.check_connectors()
 
         # Access the streams via .values() to iterate over the actual stream data
         all_streams = list(self.inl.values()) + list(self.outl.values())
@@ -392,6 +402,93 @@ class HeatExchanger(Component):
             f"Efficiency={self.epsilon:.2%}"
         )
 
+    @classmethod
+    def calc_exergy_balance_vectorized(cls, inl, outl, T0, p0, split_physical_exergy, dissipative=False):
+        r"""
+        Calculate the exergy balance of many heat exchangers or operating points at once.
+
+        Evaluates the cases of :meth:`calc_exergy_balance` with NumPy masks.
+        See :meth:`exerpy.components.component.Component.has_vectorized_kernel`
+        for the parameters and return value.
+        """
+        i0, i1, o0, o1 = inl[0], inl[1], outl[0], outl[1]
+
+        def E(stream, key):
+            return stream["m"] * stream[key]
+
+        with np.errstate(invalid="ignore"):
+            all_T = [i0["T"], i1["T"], o0["T"], o1["T"]]
+            case1 = np.logical_and.reduce([T >= T0 for T in all_T])
+            case2 = ~case1 & np.logical_and.reduce([T <= T0 for T in all_T])
+            rest = ~case1 & ~case2
+            case3 = rest & (i0["T"] > T0) & (o1["T"] > T0) & (o0["T"] <= T0) & (i1["T"] <= T0)
+            hot_in_cold_in = rest & ~case3 & (i0["T"] > T0) & (i1["T"] <= T0)
+            case4 = hot_in_cold_in & (o0["T"] <= T0) & (o1["T"] <= T0)
+            case5 = hot_in_cold_in & ~case4 & (o0["T"] > T0) & (o1["T"] > T0)
+            case6 = hot_in_cold_in & ~case4 & ~case5 & (o0["T"] > T0) & (o1["T"] <= T0)
+
+            if split_physical_exergy:
+                E_P = [
+                    E(o1, "e_T") - E(i1, "e_T"),
+                    E(o0, "e_T") - E(i0, "e_T"),
+                    E(o0, "e_T") + E(o1, "e_T"),
+                    E(o0, "e_T"),
+                    E(o1, "e_T"),
+                ]
+                E_F = [
+                    E(i0, "e_PH") - E(o0, "e_PH") + (E(i1, "e_M") - E(o1, "e_M")),
+                    E(i1, "e_PH") - E(o1, "e_PH") + (E(i0, "e_M") - E(o0, "e_M")),
+                    E(i0, "e_PH") + E(i1, "e_PH") - (E(o0, "e_M") + E(o1, "e_M")),
+                    E(i0, "e_PH") + E(i1, "e_PH") - (E(o1, "e_PH") + E(o0, "e_M")),
+                    E(i0, "e_PH") - E(o0, "e_PH") + (E(i1, "e_PH") - E(o1, "e_M")),
+                ]
+            else:
+                log_kernel_cases(
+                    logging.WARNING,
+                    ~np.asarray(dissipative) & (case2 | case3 | case4 | case5),
+                    "While dealing with heat exchnager below ambient temperautre, "
+                    "physical exergy should be split into thermal and mechanical components!",
+                )
+                E_P = [
+                    E(o1, "e_PH") - E(i1, "e_PH"),
+                    E(o0, "e_PH") - E(i0, "e_PH"),
+                    E(o0, "e_PH") + E(o1, "e_PH"),
+                    E(o0, "e_PH"),
+                    E(o1, "e_PH"),
+                ]
+                E_F = [
+                    E(i0, "e_PH") - E(o0, "e_PH"),
+                    E(i1, "e_PH") - E(o1, "e_PH"),
+                    E(i0, "e_PH") + E(i1, "e_PH"),
+                    E(i0, "e_PH") + (E(i1, "e_PH") - E(o1, "e_PH")),
+                    E(i0, "e_PH") - E(o0, "e_PH") + (E(i1, "e_PH")),
+                ]
+
+            E_F_case6 = E(i0, "e_PH") - E(o0, "e_PH") + (E(i1, "e_PH") - E(o1, "e_PH"))
+            cases = [case1, case2, case3, case4, case5]
+            E_P = np.select(cases, E_P, np.nan)
+            E_F = np.select([*cases, case6], [*E_F, E_F_case6], np.nan)
+
+            # Dissipative heat exchangers
+            E_F_dissipative = E(i0, "e_PH") - E(o0, "e_PH") - E(o1, "e_PH") + E(i1, "e_PH")
+            E_P = np.where(dissipative, np.nan, E_P)
+            E_F = np.where(dissipative, E_F_dissipative, E_F)
+
+            log_kernel_cases(
+                logging.WARNING,
+                ~np.asarray(dissipative) & case6,
+                "Heat exchanger is dissipative. This component should be "
+                "handled with the `dissipative` flag set to True.",
+            )
+            log_kernel_cases(
+                logging.ERROR,
+                ~np.asarray(dissipative) & ~(case1 | case2 | case3 | case4 | case5 | case6),
+                "Heat exchanger has an unexpected temperature configuration. "
+                "Please check the inlet and outlet temperatures.",
+            )
+            E_D = np.where(np.isnan(E_P), E_F, E_F - E_P)
+        return {"E_P": E_P, "E_F": E_F, "E_D": E_D, "epsilon": kernel_epsilon(E_P, E_F)}
+
     def aux_eqs(self, A, b, counter, T0, equations, chemical_exergy_enabled):
         r"""
         Add auxiliary cost equations for the heat exchanger.
@@ -2,7 +2,7 @@ import logging
 
 import numpy as np
 
-from exerpy.components.component import Component, component_registry
+from exerpy.components.component import Component, component_registry, kernel_epsilon, log_kernel_cases
 
 
 @component_registry
@@ -62,6 +62,24 @@ class SimpleHeatExchanger(Component):
         """
         super().__init__(**kwargs)
 
+    def check_connectors(self):
+        r"""
+        Check that the simple heat exchanger has the inlets and outlets its exergy balance requires.
+
+        Raises
+        ------
+        ValueError
+            If required inlet or outlet are missing or more than two are connected.
+        """
+        if not hasattr(self, "inl") or not hasattr(self, "outl") or len(self.inl) < 1 or len(self.outl) < 1:
+            msg = "SimpleHeatExchanger requires at least one inlet and one outlet as well as one heat flow."
+            logging.error(msg)
+            raise ValueError(msg)
+        if len(self.inl) > 2 or len(self.outl) > 2:
+            msg = "SimpleHeatExchanger requires a maximum of two inlets and two outlets."
+            logging.error(msg)
+            raise ValueError(msg)
+
     def calc_exergy_balance(self, T0: float, p0: float, split_physical_exergy) -> None:
         r"""
         Compute the exergy balance of the simple heat exchanger.
@@ -280,15 +298,7 @@ class SimpleHeatExchanger(Component):
         ValueError
             If required inlet or outlet are missing.
         """
-        # Validate the number of inlets and outlets
-        if not hasattr(self, "inl") or not hasattr(self, "outl") or len(self.inl) < 1 or len(self.outl) < 1:
-            msg = "SimpleHeatExchanger requires at least one inlet and one outlet as well as one heat flow."
-            logging.error(msg)
-            raise ValueError(msg)
-        if len(self.inl) > 2 or len(self.outl) > 2:
-            msg = "SimpleHeatExchanger requires a maximum of two inlets and two outlets."
-            logging.error(msg)
-            raise ValueError(msg)
+        self.check_connectors()
 
         # Extract inlet and outlet streams
         inlet = self.inl[0]
@@ -401,6 +411,87 @@ class SimpleHeatExchanger(Component):
             f"Efficiency={self.epsilon:.2%}"
         )
 
+    @classmethod
+    def calc_exergy_balance_vectorized(cls, inl, outl, T0, p0, split_physical_exergy, dissipative=False):
+        r"""
+        Calculate the exergy balance of many simple heat exchangers or operating points at once.
+
+        Evaluates the cases of :meth:`calc_exergy_balance` with NumPy masks.
+        See :meth:`exerpy.components.component.Component.has_vectorized_kernel`
+        for the parameters and return value.
+        """
+        inlet, outlet = inl[0], outl[0]
+        m_in, m_out = inlet["m"], outlet["m"]
+        T_in, T_out = inlet["T"], outlet["T"]
+        with np.errstate(invalid="ignore"):
+            # Calculate heat transfer Q
+            Q = outlet["m"] * outlet["h"] - inlet["m"] * inlet["h"]
+            release = Q < 0
+            injection = Q > 0
+
+            # Heat is released (Q < 0)
+            r1 = release & (T_in >= T0) & (T_out >= T0)
+            r2 = release & ~r1 & (T_in >= T0) & (T_out < T0)
+            r3 = release & ~r1 & ~r2 & (T_in <= T0) & (T_out < T0)
+            # Heat is added (Q > 0)
+            i1 = injection & (T_in >= T0) & (T_out >= T0)
+            i2 = injection & ~i1 & (T_in < T0) & (T_out >= T0)
+            i3 = injection & ~i1 & ~i2 & (T_in < T0) & (T_out <= T0)
+
+            dE_PH_in = m_in * (inlet["e_PH"] - outlet["e_PH"])
+            dE_PH_out = m_out * (outlet["e_PH"] - inlet["e_PH"])
+            if split_physical_exergy:
+                E_P_r3 = m_out * (outlet["e_T"] - inlet["e_T"])
+                E_P = [
+                    np.where(dissipative, np.nan, m_in * (inlet["e_T"] - outlet["e_T"])),
+                    m_out * outlet["e_T"],
+                    E_P_r3,
+                    dE_PH_out,
+                    m_out * (outlet["e_T"] + inlet["e_T"]),
+                    np.where(
+                        dissipative,
+                        np.nan,
+                        m_in * (inlet["e_T"] - outlet["e_T"]) + (m_out * outlet["e_M"] - m_in * inlet["e_M"]),
+                    ),
+                ]
+                E_F = [
+                    dE_PH_in,
+                    m_in * inlet["e_T"] + m_out * outlet["e_T"] + (m_in * inlet["e_M"] - m_out * outlet["e_M"]),
+                    E_P_r3 + m_in * (inlet["e_M"] - m_out * outlet["e_M"]),
+                    m_out * (outlet["e_T"] - inlet["e_T"]),
+                    m_in * inlet["e_T"] + (m_in * inlet["e_M"] - m_out * outlet["e_M"]),
+                    m_in * (inlet["e_T"] - outlet["e_T"]),
+                ]
+            else:
+                E_P = [
+                    np.where(dissipative, np.nan, dE_PH_in),
+                    m_out * outlet["e_PH"],
+                    np.where(dissipative, np.nan, dE_PH_out),
+                    dE_PH_out,
+                    dE_PH_out,
+                    np.where(dissipative, np.nan, dE_PH_in),
+                ]
+                E_F = [dE_PH_in, m_in * inlet["e_PH"], dE_PH_out, dE_PH_out, dE_PH_out, dE_PH_in]
+
+            cases = [r1, r2, r3, i1, i2, i3]
+            # Fully dissipative or Q == 0
+            neutral = ~release & ~injection
+            E_P = np.select(cases, E_P, np.nan)
+            E_F = np.select([*cases, neutral], [*E_F, dE_PH_in], np.nan)
+
+            log_kernel_cases(
+                logging.WARNING,
+                release & ~(r1 | r2 | r3),
+                "SimpleHeatExchanger: unimplemented case (Q < 0, T_in < T0 < T_out?).",
+            )
+            log_kernel_cases(
+                logging.WARNING,
+                injection & ~(i1 | i2 | i3),
+                "SimpleHeatExchanger: unimplemented case (Q > 0, T_in > T0 > T_out?).",
+            )
+            E_D = np.where(np.isnan(E_P), E_F, E_F - E_P)
+        return {"E_P": E_P, "E_F": E_F, "E_D": E_D, "epsilon": kernel_epsilon(E_P, E_F)}
+
     def aux_eqs(self, A, b, counter, T0, equations, chemical_exergy_enabled):
         r"""
         This function must be implemented in the future.
@@ -2,7 +2,7 @@ import logging
 
 import numpy as np
 
-from exerpy.components.component import Component, component_registry
+from exerpy.components.component import Component, component_registry, kernel_epsilon
 
 
 @component_registry
@@ -95,6 +95,18 @@ class Mixer(Component):
         r"""Initialize mixer component with given parameters."""
         super().__init__(**kwargs)
 
+    def check_connectors(self):
+        r"""
+        Check that the mixer has the inlets and outlets its exergy balance requires.
+
+        Raises
+        ------
+        ValueError
+            If less than two inlets or no outlet are connected.
+        """
+        if len(self.inl) < 2 or len(self.outl) < 1:
+            raise ValueError("Mixer requires at least two inlets and one outlet.")
+
     def calc_exergy_balance(self, T0: float, p0: float, split_physical_exergy) -> None:
         r"""
         Calculate the exergy balance of the mixer.
@@ -116,9 +128,7 @@ class Mixer(Component):
         ValueError
             If the required inlet and outlet streams are not properly defined.
         """
-        # Ensure that the component has at least two inlets and one outlet.
-        if len(self.inl) < 2 or len(self.outl) < 1:
-            raise ValueError("Mixer requires at least two inlets and one outlet.")
+        self.check_connectors()
 
         # Compute effective outlet state by aggregating all outlet streams.
         # Assume that all outlets share the same thermodynamic state.
@@ -182,6 +192,52 @@ class Mixer(Component):
             f"Efficiency={self.epsilon:.2%}"
         )
 
+    @classmethod
+    def calc_exergy_balance_vectorized(cls, inl, outl, T0, p0, split_physical_exergy, dissipative=False):
+        r"""
+        Calculate the exergy balance of many mixers or operating points at once.
+
+        Evaluates the cases of :meth:`calc_exergy_balance` with NumPy masks,
+        assuming all outlets share the thermodynamic state of the first outlet.
+        See :meth:`exerpy.components.component.Component.has_vectorized_kernel`
+        for the parameters and return value.
+        """
+        outlet = next(iter(outl.values()))
+        T_out = outlet["T"]
+        e_out_PH = outlet["e_PH"]
+        E_P = np.zeros(np.shape(T_out))
+        E_F = np.zeros(np.shape(T_out))
+        with np.errstate(invalid="ignore"):
+            above = T_out > T0
+            ambient = T_out == T0
+            below = ~above & ~ambient
+            for inlet in inl.values():
+                exists = inlet["exists"]
+                m, T_in, e_in_PH = inlet["m"], inlet["T"], inlet["e_PH"]
+                # Outlet temperature is greater than ambient
+                colder = above & (T_in < T_out)
+                E_P_in = np.select(
+                    [colder & (T_in >= T0), colder & ~(T_in >= T0)], [m * (e_out_PH - e_in_PH), m * e_out_PH], 0.0
+                )
+                E_F_in = np.select(
+                    [colder & ~(T_in >= T0), above & ~(T_in < T_out)], [m * e_in_PH, m * (e_in_PH - e_out_PH)], 0.0
+                )
+                # Outlet temperature equals ambient
+                E_F_in = np.where(ambient, m * e_in_PH, E_F_in)
+                # Outlet temperature is less than ambient
+                warmer = below & (T_in > T_out)
+                E_P_in = np.select(
+                    [warmer & (T_in >= T0), warmer & ~(T_in >= T0)], [m * e_out_PH, m * (e_out_PH - e_in_PH)], E_P_in
+                )
+                E_F_in = np.select(
+                    [warmer & (T_in >= T0), below & ~(T_in > T_out)], [m * e_in_PH, m * (e_in_PH - e_out_PH)], E_F_in
+                )
+                E_P = E_P + np.where(exists, E_P_in, 0.0)
+                E_F = E_F + np.where(exists, E_F_in, 0.0)
+            E_P = np.where(ambient, np.nan, E_P)
+            E_D = E_F - E_P
+        return {"E_P": E_P, "E_F": E_F, "E_D": E_D, "epsilon": kernel_epsilon(E_P, E_F)}
+
     def aux_eqs(self, A, b, counter, T0, equations, chemical_exergy_enabled):
         """
         Auxiliary equations for the mixer.
@@ -2,7 +2,7 @@ import logging
 
 import numpy as np
 
-from exerpy.components.component import Component, component_registry
+from exerpy.components.component import Component, component_registry, kernel_epsilon, log_kernel_cases
 
 
 @component_registry
@@ -94,6 +94,18 @@ class Valve(Component):
         r"""Initialize valve component with given parameters."""
         super().__init__(**kwargs)
 
+    def check_connectors(self):
+        r"""
+        Check that the valve has the inlets and outlets its exergy balance requires.
+
+        Raises
+        ------
+        ValueError
+            If the inlet or the outlet stream is missing.
+        """
+        if len(self.inl) < 1 or len(self.outl) < 1:
+            raise ValueError("Valve requires at least one inlet and one outlet.")
+
     def calc_exergy_balance(self, T0: float, p0: float, split_physical_exergy) -> None:
         r"""
         Calculate the exergy balance of the valve.
@@ -115,9 +127,7 @@ class Valve(Component):
         ValueError
             If the required inlet and outlet streams are not properly defined.
         """
-        # Ensure that the component has both inlet and outlet streams
-        if len(self.inl) < 1 or len(self.outl) < 1:
-            raise ValueError("Valve requires at least one inlet and one outlet.")
+        self.check_connectors()
 
         T_in = self.inl[0]["T"]
         T_out = self.outl[0]["T"]
@@ -218,6 +228,64 @@ class Valve(Component):
             f"Efficiency={self.epsilon:.2%}"
         )
 
+    @classmethod
+    def calc_exergy_balance_vectorized(cls, inl, outl, T0, p0, split_physical_exergy, dissipative=False):
+        r"""
+        Calculate the exergy balance of many valves or operating points at once.
+
+        Evaluates the cases of :meth:`calc_exergy_balance` with NumPy masks.
+        See :meth:`exerpy.components.component.Component.has_vectorized_kernel`
+        for the parameters and return value.
+        """
+        i0, o0 = inl[0], outl[0]
+        T_in, T_out = i0["T"], o0["T"]
+        p_in, p_out = i0["p"], o0["p"]
+        with np.errstate(invalid="ignore"):
+            zero_flow = abs(i0["m"]) < 1e-10
+            identical = ~zero_flow & (abs(T_in - T_out) < 1e-2) & (abs(p_in - p_out) <= 1e-4 * np.maximum(p_in, 1e-9))
+            rest = ~zero_flow & ~identical
+            case1 = rest & (T_in > T0) & (T_out > T0)
+            case2 = rest & (T_in > T0) & (T_out <= T0)
+            case3 = rest & (T_in <= T0) & (T_out <= T0)
+            case4 = rest & (T_in <= T0) & (T_out > T0)
+            unexpected = rest & ~(case1 | case2 | case3 | case4)
+
+            E_F_dissipative = i0["m"] * (i0["e_PH"] - o0["e_PH"])
+            E_P = np.full(np.shape(E_F_dissipative), np.nan)
+            E_F = np.where(case1 | case2 | case3 | case4, E_F_dissipative, np.nan)
+            if split_physical_exergy:
+                E_P = np.select([case2, case3], [i0["m"] * o0["e_T"], i0["m"] * (o0["e_T"] - i0["e_T"])], E_P)
+                E_F = np.select(
+                    [case2, case3],
+                    [i0["m"] * (i0["e_T"] + i0["e_M"] - o0["e_M"]), i0["m"] * (i0["e_M"] - o0["e_M"])],
+                    E_F,
+                )
+            else:
+                log_kernel_cases(
+                    logging.WARNING,
+                    case2 | case3,
+                    "Exergy balance of a valve, where outlet temperature is smaller than or equal to "
+                    "ambient temperature, is not implemented for non-split physical exergy. "
+                    "Valve is treated as dissipative.",
+                )
+            log_kernel_cases(
+                logging.WARNING,
+                case4,
+                "Valve with temperature increase from below ambient to above ambient - "
+                "non-physical behavior. Treated as dissipative.",
+            )
+            log_kernel_cases(
+                logging.ERROR,
+                unexpected,
+                "Valve encountered an unexpected condition - exergy balance cannot be calculated.",
+            )
+
+            E_P = np.where(identical, 0.0, E_P)
+            E_F = np.where(identical, 0.0, E_F)
+            E_D = np.where(np.isnan(E_P), E_F, E_F - E_P)
+            epsilon = np.where(identical, 1.0, kernel_epsilon(E_P, E_F))
+        return {"E_P": E_P, "E_F": E_F, "E_D": E_D, "epsilon": epsilon}
+
     def aux_eqs(self, A, b, counter, T0, equations, chemical_exergy_enabled):
         """
         Auxiliary equations for the valve.
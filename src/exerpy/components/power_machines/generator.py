@@ -50,6 +50,9 @@ class Generator(Component):
         - :math:`\dot{W}_\mathrm{in}`: Input power
     """
 
+    # The relative cost difference is defined on the cost rates
+    r_basis = "rates"
+
     def __init__(self, **kwargs):
         r"""Initialize generator component with given parameters."""
         super().__init__(**kwargs)
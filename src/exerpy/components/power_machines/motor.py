@@ -50,6 +50,9 @@ class Motor(Component):
         - :math:`\dot{W}_\mathrm{el}`: Electrical power input
     """
 
+    # The relative cost difference is defined on the cost rates
+    r_basis = "rates"
+
     def __init__(self, **kwargs):
         r"""Initialize motor component with given parameters."""
         super().__init__(**kwargs)
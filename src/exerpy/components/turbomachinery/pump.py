@@ -2,7 +2,7 @@ import logging
 
 import numpy as np
 
-from exerpy.components.component import Component, component_registry
+from exerpy.components.component import Component, component_registry, kernel_epsilon, log_kernel_cases
 
 
 @component_registry
@@ -77,11 +77,26 @@ class Pump(Component):
         - :math:`e^\mathrm{M}`: Mechanical exergy
     """
 
+    # The relative cost difference is defined on the cost rates
+    r_basis = "rates"
+
     def __init__(self, **kwargs):
         r"""Initialize pump component with given parameters."""
         super().__init__(**kwargs)
         self.P = None
 
+    def check_connectors(self):
+        r"""
+        Check that the pump has the inlets and outlets its exergy balance requires.
+
+        Raises
+        ------
+        ValueError
+            If the inlet or the outlet stream is missing.
+        """
+        if 0 not in self.inl or 0 not in self.outl:
+            raise ValueError("Pump requires at least one inlet and one outlet.")
+
     def calc_exergy_balance(self, T0: float, p0: float, split_physical_exergy) -> None:
         r"""
         Calculate the exergy balance of the pump.
@@ -98,7 +113,13 @@ class Pump(Component):
         split_physical_exergy : bool
             Flag indicating whether physical exergy is split into thermal and mechanical components.
 
+        Raises
+        ------
+        ValueError
+            If the inlet or the outlet stream is missing.
         """
+        self.check_connectors()
+
         # Get power flow
         if (
             1 in self.inl
@@ -172,6 +193,66 @@ class Pump(Component):
             f"Efficiency={self.epsilon:.2%}"
         )
 
+    @classmethod
+    def calc_exergy_balance_vectorized(cls, inl, outl, T0, p0, split_physical_exergy, dissipative=False):
+        r"""
+        Calculate the exergy balance of many pumps or operating points at once.
+
+        Evaluates the cases of :meth:`calc_exergy_balance` with NumPy masks.
+        See :meth:`exerpy.components.component.Component.has_vectorized_kernel`
+        for the parameters and return value.
+        """
+        i0, o0 = inl[0], outl[0]
+        with np.errstate(invalid="ignore"):
+            # Get power flow
+            P = o0["m"] * (o0["h"] - i0["h"])
+            if 1 in inl:
+                has_power = inl[1]["power"] & ~np.isnan(inl[1]["energy_flow"])
+                P = np.where(has_power, inl[1]["energy_flow"], P)
+
+            T_in = np.round(i0["T"], 5)
+            T_out = np.round(o0["T"], 5)
+            invalid = i0["T"] > o0["T"]
+            case1 = ~invalid & (T_in >= T0) & (T_out > T0)
+            case2 = ~invalid & ~case1 & (T_in < T0) & (T_out > T0)
+            case3 = ~invalid & ~case1 & ~case2 & (T_in < T0) & (T_out <= T0)
+
+            E_P_PH = o0["m"] * (o0["e_PH"] - i0["e_PH"])
+            if split_physical_exergy:
+                E_P = np.select(
+                    [case1, case2, case3],
+                    [
+                        E_P_PH,
+                        o0["m"] * o0["e_T"] + o0["m"] * (o0["e_M"] - i0["e_M"]),
+                        o0["m"] * (o0["e_M"] - i0["e_M"]),
+                    ],
+                    np.nan,
+                )
+                E_F = np.select(
+                    [case1, case2, case3],
+                    [abs(P), abs(P) + i0["m"] * i0["e_T"], abs(P) + i0["m"] * (i0["e_T"] - o0["e_T"])],
+                    np.nan,
+                )
+            else:
+                log_kernel_cases(
+                    logging.WARNING,
+                    case2 | case3,
+                    "While dealing with pump below ambient, "
+                    "physical exergy should be split into thermal and mechanical components!",
+                )
+                valid = case1 | case2 | case3
+                E_P = np.where(valid, E_P_PH, np.nan)
+                E_F = np.where(valid, abs(P), np.nan)
+
+            log_kernel_cases(
+                logging.WARNING,
+                ~(case1 | case2 | case3),
+                "Exergy balance of a pump where outlet temperature is smaller "
+                "than inlet temperature is not implemented.",
+            )
+            E_D = E_F - E_P
+        return {"P": P, "E_P": E_P, "E_F": E_F, "E_D": E_D, "epsilon": kernel_epsilon(E_P, E_F)}
+
     def aux_eqs(self, A, b, counter, T0, equations, chemical_exergy_enabled):
         """
         Auxiliary equations for the pump.
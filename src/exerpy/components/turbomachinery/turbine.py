@@ -2,7 +2,7 @@ import logging
 
 import numpy as np
 
-from exerpy.components.component import Component, component_registry
+from exerpy.components.component import Component, component_registry, kernel_epsilon, log_kernel_cases
 
 
 @component_registry
@@ -66,11 +66,26 @@ class Turbine(Component):
         \end{cases}
     """
 
+    # The relative cost difference is defined on the cost rates
+    r_basis = "rates"
+
     def __init__(self, **kwargs):
         r"""Initialize turbine component with given parameters."""
         super().__init__(**kwargs)
         self.P = None
 
+    def check_connectors(self):
+        r"""
+        Check that the turbine has the inlets and outlets its exergy balance requires.
+
+        Raises
+        ------
+        ValueError
+            If the inlet or the outlet stream is missing.
+        """
+        if 0 not in self.inl or 0 not in self.outl:
+            raise ValueError("Turbine requires at least one inlet and one outlet.")
+
     def calc_exergy_balance(self, T0: float, p0: float, split_physical_exergy) -> None:
         r"""
         Calculate the exergy balance of the turbine.
@@ -86,7 +101,14 @@ class Turbine(Component):
             Ambient pressure in :math:`\mathrm{Pa}`.
         split_physical_exergy : bool
             Flag indicating whether physical exergy is split into thermal and mechanical components.
+
+        Raises
+        ------
+        ValueError
+            If the inlet or the outlet stream is missing.
         """
+        self.check_connectors()
+
         # Get net power flow
         net_power = 0.0  # Initialize to 0.0, not None
         for idx, conn in self.inl.items():
@@ -158,6 +180,71 @@ class Turbine(Component):
             f"Efficiency={self.epsilon:.2%}"
         )
 
+    @classmethod
+    def calc_exergy_balance_vectorized(cls, inl, outl, T0, p0, split_physical_exergy, dissipative=False):
+        r"""
+        Calculate the exergy balance of many turbines or operating points at once.
+
+        Evaluates the cases of :meth:`calc_exergy_balance` with NumPy masks.
+        See :meth:`exerpy.components.component.Component.has_vectorized_kernel`
+        for the parameters and return value.
+        """
+        i0, o0 = inl[0], outl[0]
+        with np.errstate(invalid="ignore"):
+            # Get net power flow
+            net_power = np.zeros(np.shape(i0["m"]))
+            for sign, connectors in ((-1, inl), (1, outl)):
+                for conn in connectors.values():
+                    has_power = conn["power"] & ~np.isnan(conn["energy_flow"])
+                    net_power = net_power + sign * np.where(has_power, conn["energy_flow"], 0.0)
+
+            def total_outlet(property_name):
+                total = 0.0
+                for conn in outl.values():
+                    valid = conn["exists"] & ~conn["power"] & ~np.isnan(conn["m"]) & ~np.isnan(conn[property_name])
+                    total = total + np.where(valid, conn["m"] * conn[property_name], 0.0)
+                return total
+
+            P = np.where(net_power != 0.0, abs(net_power), total_outlet("h") - i0["m"] * i0["h"])
+
+            T_in, T_out = i0["T"], o0["T"]
+            case1 = (T_in >= T0) & (T_out >= T0) & (T_in >= T_out)
+            case2 = ~case1 & (T_in > T0) & (T_out <= T0)
+            case3 = ~case1 & ~case2 & (T_in <= T0) & (T_out <= T0)
+
+            E_P = np.where(case1, abs(P), np.nan)
+            E_F = np.where(case1, i0["m"] * i0["e_PH"] - total_outlet("e_PH"), np.nan)
+            if split_physical_exergy:
+                E_P = np.select(
+                    [case2, case3],
+                    [abs(P) + total_outlet("e_T"), abs(P) + (total_outlet("e_T") - i0["m"] * i0["e_T"])],
+                    E_P,
+                )
+                E_F = np.select(
+                    [case2, case3],
+                    [
+                        i0["m"] * i0["e_T"] + i0["m"] * i0["e_M"] - total_outlet("e_M"),
+                        i0["m"] * i0["e_M"] - total_outlet("e_M"),
+                    ],
+                    E_F,
+                )
+            else:
+                log_kernel_cases(
+                    logging.WARNING,
+                    case2 | case3,
+                    "While dealing with expander below ambient, "
+                    "physical exergy should be split into thermal and mechanical components!",
+                )
+
+            log_kernel_cases(
+                logging.WARNING,
+                ~(case1 | case2 | case3),
+                "Exergy balance of a turbine where outlet temperature is larger "
+                "than inlet temperature is not implemented.",
+            )
+            E_D = E_F - E_P
+        return {"P": P, "E_P": E_P, "E_F": E_F, "E_D": E_D, "epsilon": kernel_epsilon(E_P, E_F)}
+
     def _total_outlet(self, mass_flow: str, property_name: str) -> float:
         r"""
         Calculate the sum of mass flow times property across all outlets.
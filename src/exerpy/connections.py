@@ -0,0 +1,447 @@
+import copy
+import numbers
+from collections.abc import Mapping, MutableMapping
+
+import numpy as np
+
+#: Numeric connection properties stored in the columns of a ConnectionTable.
+NUMERIC_PROPERTIES = (
+    "m",
+    "T",
+    "p",
+    "h",
+    "s",
+    "e_PH",
+    "e_T",
+    "e_M",
+    "e_CH",
+    "E",
+    "E_PH",
+    "E_T",
+    "E_M",
+    "E_CH",
+    "energy_flow",
+    "C_T",
+    "C_M",
+    "C_CH",
+    "C_PH",
+    "C_TOT",
+    "c_T",
+    "c_M",
+    "c_CH",
+    "c_PH",
+    "c_TOT",
+)
+
+
+def _is_number(value):
+    return isinstance(value, numbers.Real) and not isinstance(value, bool | np.bool_)
+
+
+class ConnectionView(MutableMapping):
+    r"""
+    Dictionary-like view on a single row of a :class:`ConnectionTable`.
+
+    Reading and writing numeric properties goes to the columns of the table,
+    all other entries (e.g. ``kind``, ``source_component`` or the fluid
+    composition) are kept in a small per-row dictionary. Components can use
+    the view exactly like the connection dictionaries produced by the parsers.
+
+    Parameters
+    ----------
+    table : ConnectionTable
+        The table holding the data.
+    row : int
+        Row index of the connection in the table.
+    """
+
+    __slots__ = ("_table", "_row")
+
+    def __init__(self, table, row):
+        self._table = table
+        self._row = row
+
+    def __getitem__(self, key):
+        table = self._table
+        col = table._column_index.get(key)
+        if col is not None and table._mask[col, self._row]:
+            return float(table._data[col, self._row])
+        return table._extra[self._row][key]
+
+    def get(self, key, default=None):
+        table = self._table
+        col = table._column_index.get(key)
+        if col is not None and table._mask[col, self._row]:
+            return float(table._data[col, self._row])
+        return table._extra[self._row].get(key, default)
+
+    def __contains__(self, key):
+        table = self._table
+        col = table._column_index.get(key)
+        if col is not None and table._mask[col, self._row]:
+            return True
+        return key in table._extra[self._row]
+
+    def __setitem__(self, key, value):
+        self._table._set(self._row, key, value)
+
+    def __delitem__(self, key):
+        table = self._table
+        table.modifications += 1
+        col = table._column_index.get(key)
+        if col is not None and table._mask[col, self._row]:
+            table._mask[col, self._row] = False
+            table._data[col, self._row] = np.nan
+        else:
+            del table._extra[self._row][key]
+
+    def __iter__(self):
+        table = self._table
+        for col in np.flatnonzero(table._mask[:, self._row]):
+            yield table.columns[col]
+        yield from table._extra[self._row]
+
+    def __len__(self):
+        return int(self._table._mask[:, self._row].sum()) + len(self._table._extra[self._row])
+
+    def __repr__(self):
+        return f"ConnectionView({dict(self)!r})"
+
+    def to_dict(self):
+        """Return the connection data as a plain dictionary."""
+        return dict(self.items())
+
+
+class ConnectionTable(MutableMapping):
+    r"""
+    Columnar store of the connection data of a model.
+
+    Every numeric connection property listed in :data:`NUMERIC_PROPERTIES` is
+    held in a NumPy array with one entry per connection, together with a
+    boolean mask marking which connections actually provide the value. All
+    other entries are kept in a per-connection dictionary. Indexing the table
+    with a connection name returns a :class:`ConnectionView`, which behaves
+    like the connection dictionary the parsers create, so component code works
+    on the table without changes. Whole-model calculations can instead read
+    and write complete columns with :meth:`get_column` and :meth:`set_column`.
+
+    Parameters
+    ----------
+    connection_data : dict, optional
+        Connection data mapping connection names to dictionaries of their
+        properties.
+
+    Attributes
+    ----------
+    columns : tuple
+        Names of the numeric columns.
+    modifications : int
+        Counter incremented on every change of the connection data, e.g. to
+        detect outdated copies of the data.
+
+    Notes
+    -----
+    Missing values and values that are not real numbers (e.g. ``None``) are
+    never stored in the columns: a connection without a value for a numeric
+    property reads as ``NaN`` from :meth:`get_column` and is masked out in
+    :meth:`present`, while ``None`` values are kept as they are in the
+    per-connection dictionary.
+
+    Examples
+    --------
+    >>> from exerpy.connections import ConnectionTable
+    >>> table = ConnectionTable({
+    ...     "1": {"kind": "material", "m": 2.0, "e_PH": 1500.0},
+    ...     "2": {"kind": "material", "m": 1.0, "e_PH": 500.0},
+    ... })
+    >>> table["1"]["kind"]
+    'material'
+    >>> (table.get_column("m") * table.get_column("e_PH")).tolist()
+    [3000.0, 500.0]
+    >>> table.set_column("E", [3000.0, 500.0])
+    >>> table["2"]["E"]
+    500.0
+    """
+
+    def __init__(self, connection_data=None):
+        self.columns = NUMERIC_PROPERTIES
+        self._column_index = {key: col for col, key in enumerate(self.columns)}
+        self._index = {}
+        self._views = []
+        self._extra = []
+        self._shadowed = set()
+        self._capacity = 0
+        self._data = np.empty((len(self.columns), 0))
+        self._mask = np.zeros((len(self.columns), 0), dtype=bool)
+        self.modifications = 0
+
+        if connection_data is not None:
+            self._reserve(len(connection_data))
+            for name, conn in connection_data.items():
+                self[name] = conn
+
+    @classmethod
+    def from_data(cls, connection_data):
+        """
+        Return connection data as ConnectionTable.
+
+        Parameters
+        ----------
+        connection_data : dict or ConnectionTable
+            Connection data. A ConnectionTable is returned as it is.
+
+        Returns
+        -------
+        ConnectionTable
+            Columnar connection data.
+        """
+        if isinstance(connection_data, cls):
+            return connection_data
+        return cls(connection_data)
+
+    def _reserve(self, size):
+        if size <= self._capacity:
+            return
+        capacity = max(size, 2 * self._capacity, 8)
+        data = np.full((len(self.columns), capacity), np.nan)
+        mask = np.zeros((len(self.columns), capacity), dtype=bool)
+        data[:, : self._capacity] = self._data
+        mask[:, : self._capacity] = self._mask
+        self._data = data
+        self._mask = mask
+        self._capacity = capacity
+
+    def _set(self, row, key, value):
+        self.modifications += 1
+        col = self._column_index.get(key)
+        if col is not None and _is_number(value):
+            self._data[col, row] = value
+            self._mask[col, row] = True
+            self._extra[row].pop(key, None)
+        else:
+            if col is not None:
+                self._data[col, row] = np.nan
+                self._mask[col, row] = False
+                self._shadowed.add(key)
+            self._extra[row][key] = value
+
+    def __getitem__(self, name):
+        return self._views[self._index[name]]
+
+    def get(self, name, default=None):
+        row = self._index.get(name)
+        if row is None:
+            return default
+        return self._views[row]
+
+    def __contains__(self, name):
+        return name in self._index
+
+    def __setitem__(self, name, conn):
+        if not isinstance(conn, Mapping):
+            raise TypeError(f"Connection data of '{name}' must be a mapping, got {type(conn).__name__}.")
+        if isinstance(conn, ConnectionView):
+            conn = conn.to_dict()
+        self.modifications += 1
+        row = self._index.get(name)
+        if row is None:
+            row = len(self._views)
+            self._reserve(row + 1)
+            self._index[name] = row
+            self._views.append(ConnectionView(self, row))
+            self._extra.append({})
+        else:
+            self._data[:, row] = np.nan
+            self._mask[:, row] = False
+            self._extra[row] = {}
+        for key, value in conn.items():
+            self._set(row, key, value)
+
+    def __delitem__(self, name):
+        row = self._index.pop(name)
+        self.modifications += 1
+        # The row is left in place, only the name lookup is removed.
+        self._data[:, row] = np.nan
+        self._mask[:, row] = False
+        self._extra[row] = {}
+
+    def __iter__(self):
+        return iter(self._index)
+
+    def __len__(self):
+        return len(self._index)
+
+    def __repr__(self):
+        return f"ConnectionTable({len(self)} connections)"
+
+    def rows(self, names=None):
+        """
+        Get the row indices of connections.
+
+        Parameters
+        ----------
+        names : iterable of str, optional
+            Connection names, all connections if not provided.
+
+        Returns
+        -------
+        numpy.ndarray
+            Row indices in the order of the names.
+        """
+        if names is None:
+            return np.fromiter(self._index.values(), dtype=int, count=len(self._index))
+        return np.array([self._index[name] for name in names], dtype=int)
+
+    def get_column(self, key, names=None):
+        """
+        Get the values of a numeric property for several connections.
+
+        Parameters
+        ----------
+        key : str
+            Name of the numeric property, e.g. ``"E"``.
+        names : iterable of str, optional
+            Connection names, all connections if not provided.
+
+        Returns
+        -------
+        numpy.ndarray
+            Values of the property, ``NaN`` where a connection has no value.
+        """
+        return self._data[self._column_index[key], self.rows(names)]
+
+    def get_columns(self, keys, names=None):
+        """
+        Get the values of several numeric properties for several connections.
+
+        Parameters
+        ----------
+        keys : iterable of str
+            Names of the numeric properties.
+        names : iterable of str, optional
+            Connection names, all connections if not provided.
+
+        Returns
+        -------
+        numpy.ndarray
+            Values of shape (properties, connections), ``NaN`` where a
+            connection has no value.
+        """
+        cols = [self._column_index[key] for key in keys]
+        return self._data[np.ix_(cols, self.rows(names))]
+
+    def present(self, key, names=None):
+        """
+        Get the mask of connections providing a numeric value for a property.
+
+        Parameters
+        ----------
+        key : str
+            Name of the numeric property.
+        names : iterable of str, optional
+            Connection names, all connections if not provided.
+
+        Returns
+        -------
+        numpy.ndarray
+            Boolean mask in the order of the names.
+        """
+        return self._mask[self._column_index[key], self.rows(names)]
+
+    def set_column(self, key, values, names=None):
+        """
+        Set the values of a numeric property for several connections.
+
+        Parameters
+        ----------
+        key : str
+            Name of the numeric property.
+        values : array-like
+            New values in the order of the names.
+        names : iterable of str, optional
+            Connection names, all connections if not provided.
+        """
+        col = self._column_index[key]
+        rows = self.rows(names)
+        self.modifications += 1
+        self._data[col, rows] = values
+        self._mask[col, rows] = True
+        if key in self._shadowed:
+            for row in rows:
+                self._extra[row].pop(key, None)
+
+    def clear_column(self, key, names=None):
+        """
+        Remove the values of a numeric property from several connections.
+
+        Parameters
+        ----------
+        key : str
+            Name of the numeric property.
+        names : iterable of str, optional
+            Connection names, all connections if not provided.
+        """
+        col = self._column_index[key]
+        rows = self.rows(names)
+        self.modifications += 1
+        self._data[col, rows] = np.nan
+        self._mask[col, rows] = False
+        if key in self._shadowed:
+            for row in rows:
+                self._extra[row].pop(key, None)
+
+    def snapshot(self, numeric_only=False):
+        """
+        Take a copy of the current connection values.
+
+        Parameters
+        ----------
+        numeric_only : bool, optional
+            Copy only the columns and masks of the numeric properties, e.g. if
+            only numeric values change until the snapshot is restored, by
+            default False.
+
+        Returns
+        -------
+        tuple
+            Copy of the columns, the masks and the per-connection data, to be
+            passed to :meth:`restore`.
+        """
+        if numeric_only:
+            return self._data.copy(), self._mask.copy()
+        extra = [{key: copy.copy(value) for key, value in row.items()} for row in self._extra]
+        return self._data.copy(), self._mask.copy(), extra, set(self._shadowed)
+
+    def restore(self, snapshot):
+        """
+        Reset the connection values to a snapshot taken with :meth:`snapshot`.
+
+        The connection views stay valid, so components referencing them see
+        the restored values. Connections added after the snapshot are kept.
+
+        Parameters
+        ----------
+        snapshot : tuple
+            Snapshot of the connection values.
+        """
+        data, mask, *other = snapshot
+        self.modifications += 1
+        rows = data.shape[1]
+        self._data[:, :rows] = data
+        self._mask[:, :rows] = mask
+        if other:
+            extra, shadowed = other
+            for row, values in enumerate(extra):
+                self._extra[row] = {key: copy.copy(value) for key, value in values.items()}
+            self._shadowed = set(shadowed)
+
+    def to_dict(self):
+        """
+        Get the connection data as plain dictionaries.
+
+        Returns
+        -------
+        dict
+            Connection names mapped to dictionaries of their properties.
+        """
+        return {name: self._views[row].to_dict() for name, row in self._index.items()}
@@ -0,0 +1,900 @@
+import numpy as np
+
+try:
+    import scipy.linalg
+    import scipy.sparse
+    import scipy.sparse.linalg
+
+    __scipy_available__ = True
+except ImportError:
+    __scipy_available__ = False
+
+
+class CostMatrix:
+    r"""
+    Coefficient matrix of the exergoeconomic cost equations.
+
+    The matrix is assembled from (row, column, value) triplets. Components
+    write their coefficients with the same item assignment as into a dense
+    array, ``A[row, col] = value``, and a later assignment to the same entry
+    replaces the earlier one. Only the non-zero structure is stored, the
+    matrix is converted to a sparse CSR/CSC matrix or a dense array for
+    solving.
+
+    Parameters
+    ----------
+    num_rows : int
+        Number of equations.
+    num_cols : int, optional
+        Number of variables, equal to the number of equations if not
+        provided.
+
+    Examples
+    --------
+    >>> from exerpy.cost_matrix import CostMatrix
+    >>> A = CostMatrix(2)
+    >>> A[0, 0] = 1
+    >>> A[1, 0] = -1
+    >>> A[1, 1] = 2
+    >>> A.nnz
+    3
+    >>> A.toarray().tolist()
+    [[1.0, 0.0], [-1.0, 2.0]]
+    >>> A.solve([1.0, 3.0]).tolist()
+    [1.0, 2.0]
+    """
+
+    def __init__(self, num_rows, num_cols=None):
+        self.shape = (num_rows, num_rows if num_cols is None else num_cols)
+        self._entries = {}
+
+    def _check_index(self, key):
+        row, col = key
+        row, col = int(row), int(col)
+        if not (0 <= row < self.shape[0] and 0 <= col < self.shape[1]):
+            raise IndexError(f"Index ({row}, {col}) is out of bounds for a cost matrix of shape {self.shape}.")
+        return row, col
+
+    def __setitem__(self, key, value):
+        self._entries[self._check_index(key)] = float(value)
+
+    def __getitem__(self, key):
+        if isinstance(key, tuple):
+            return self._entries.get(self._check_index(key), 0.0)
+        return self.toarray()[key]
+
+    def __array__(self, dtype=None, copy=None):
+        array = self.toarray()
+        return array if dtype is None else array.astype(dtype)
+
+    @property
+    def ndim(self):
+        """Number of dimensions, always two."""
+        return 2
+
+    @property
+    def nnz(self):
+        """Number of stored entries."""
+        return len(self._entries)
+
+    def to_coo(self):
+        """
+        Get the stored entries as triplets.
+
+        Returns
+        -------
+        tuple of numpy.ndarray
+            Row indices, column indices and values of the stored entries.
+        """
+        if not self._entries:
+            return np.zeros(0, dtype=int), np.zeros(0, dtype=int), np.zeros(0)
+        rows, cols = np.array(list(self._entries.keys()), dtype=int).T
+        values = np.fromiter(self._entries.values(), dtype=float, count=len(self._entries))
+        return rows, cols, values
+
+    def toarray(self):
+        """
+        Get the matrix as dense array.
+
+        Returns
+        -------
+        numpy.ndarray
+            Dense coefficient matrix.
+        """
+        array = np.zeros(self.shape)
+        rows, cols, values = self.to_coo()
+        array[rows, cols] = values
+        return array
+
+    def tocsr(self):
+        """
+        Get the matrix in compressed sparse row format.
+
+        Returns
+        -------
+        scipy.sparse.csr_matrix
+            Sparse coefficient matrix.
+        """
+        if not __scipy_available__:
+            raise ValueError(
+                "The sparse cost matrix requires SciPy, please install exerpy[sparse] or use the dense solver."
+            )
+        rows, cols, values = self.to_coo()
+        return scipy.sparse.csr_matrix((values, (rows, cols)), shape=self.shape)
+
+    def _rows(self):
+        """Get the stored entries grouped by row as dictionaries of column and value."""
+        rows = [{} for _ in range(self.shape[0])]
+        for (row, col), value in self._entries.items():
+            rows[row][col] = value
+        return rows
+
+    def zero_rows_and_columns(self, tol=1e-12):
+        """
+        Find the rows and columns without an entry of magnitude ``tol`` or larger.
+
+        Parameters
+        ----------
+        tol : float, optional
+            Entries below this magnitude count as zero, by default 1e-12.
+
+        Returns
+        -------
+        tuple of list
+            Indices of the zero rows and the zero columns.
+        """
+        rows, cols, values = self.to_coo()
+        significant = np.abs(values) >= tol
+        used_rows = np.zeros(self.shape[0], dtype=bool)
+        used_cols = np.zeros(self.shape[1], dtype=bool)
+        used_rows[rows[significant]] = True
+        used_cols[cols[significant]] = True
+        return np.flatnonzero(~used_rows).tolist(), np.flatnonzero(~used_cols).tolist()
+
+    def colinear_rows(self, tol_strict=1e-12, tol_near=1e-8):
+        r"""
+        Find pairs of rows pointing in the same direction.
+
+        The rows are hashed by the columns and signs of their entries relative
+        to the row norm, so only rows with the same pattern are compared. For
+        these, the colinearity error :math:`1 - \cos\theta` between the rows
+        is computed.
+
+        Parameters
+        ----------
+        tol_strict : float, optional
+            Maximum error of exactly colinear rows, by default 1e-12.
+        tol_near : float, optional
+            Maximum error of nearly colinear rows, by default 1e-8.
+
+        Returns
+        -------
+        tuple of list
+            Exactly colinear row pairs and nearly colinear row pairs, each pair
+            ordered by row index.
+        """
+        buckets = {}
+        for index, row in enumerate(self._rows()):
+            norm = np.sqrt(sum(value**2 for value in row.values()))
+            if norm <= tol_strict:
+                continue
+            key = tuple(sorted((col, value > 0) for col, value in row.items() if abs(value) > tol_near * norm))
+            buckets.setdefault(key, []).append((index, row, norm))
+
+        strict, near = [], []
+        for members in buckets.values():
+            for k, (i, row_i, norm_i) in enumerate(members):
+                for j, row_j, norm_j in members[k + 1 :]:
+                    dot = sum(value * row_j.get(col, 0.0) for col, value in row_i.items())
+                    error = abs(1 - dot / (norm_i * norm_j))
+                    if error <= tol_strict:
+                        strict.append((i, j))
+                    elif error <= tol_near:
+                        near.append((i, j))
+        return sorted(strict), sorted(near)
+
+    def rank_analysis(self, tol=None):
+        """
+        Determine the numerical rank and the null spaces with a singular value decomposition.
+
+        The coefficients of the cost equations span many orders of magnitude, so
+        the rows and columns are scaled to a largest magnitude of one before the
+        decomposition. The scaling does not change the rank.
+
+        Parameters
+        ----------
+        tol : float, optional
+            Singular values of the scaled matrix up to this value count as zero,
+            by default the largest singular value times the largest dimension
+            times the machine precision.
+
+        Returns
+        -------
+        tuple
+            Numerical rank, null space with one direction of the variables per
+            column and left null space with one combination of the equations per
+            column, each direction normalized to unit length.
+        """
+        A = self.toarray()
+        row_scale = _inverse_max(A, axis=1)
+        A *= row_scale[:, None]
+        col_scale = _inverse_max(A, axis=0)
+        A *= col_scale[None, :]
+
+        # The singular vectors are only computed if the matrix is rank deficient
+        singular_values = np.linalg.svd(A, compute_uv=False)
+        if tol is None:
+            largest = singular_values[0] if singular_values.size else 0.0
+            tol = largest * max(self.shape) * np.finfo(float).eps
+        rank = int((singular_values > tol).sum())
+        if rank == self.shape[0] == self.shape[1]:
+            return rank, np.zeros((self.shape[1], 0)), np.zeros((self.shape[0], 0))
+        U, _, Vt = np.linalg.svd(A)
+        null_space = col_scale[:, None] * Vt[rank:].T
+        left_null_space = row_scale[:, None] * U[:, rank:]
+        for directions in (null_space, left_null_space):
+            directions /= np.maximum(np.linalg.norm(directions, axis=0), np.finfo(float).tiny)
+        return rank, null_space, left_null_space
+
+    def structural_analysis(self):
+        """
+        Analyse the sparsity structure with a maximum matching of rows and columns.
+
+        Every row (equation) is matched to a different column (variable) it
+        contains. Rows which cannot be matched belong to an over-determined
+        part of the system, columns which cannot be matched to an
+        under-determined part. The parts are completed by alternating paths
+        from the unmatched rows and columns, as in the coarse Dulmage-Mendelsohn
+        decomposition.
+
+        Returns
+        -------
+        tuple
+            Structural rank, indices of the over-determined rows and indices of
+            the under-determined columns.
+        """
+        num_rows, num_cols = self.shape
+        row_cols = [[] for _ in range(num_rows)]
+        col_rows = [[] for _ in range(num_cols)]
+        for row, col in sorted(self._entries):
+            row_cols[row].append(col)
+            col_rows[col].append(row)
+
+        match_row, match_col = _maximum_matching(row_cols, num_cols)
+
+        def alternating_reach(start, adjacency, match):
+            reached, stack = set(start), list(start)
+            while stack:
+                for neighbour in adjacency[stack.pop()]:
+                    partner = match[neighbour]
+                    if partner >= 0 and partner not in reached:
+                        reached.add(partner)
+                        stack.append(partner)
+            return sorted(reached)
+
+        over = alternating_reach([row for row in range(num_rows) if match_row[row] < 0], row_cols, match_col)
+        under = alternating_reach([col for col in range(num_cols) if match_col[col] < 0], col_rows, match_row)
+        structural_rank = sum(1 for col in match_row if col >= 0)
+        return structural_rank, over, under
+
+    def submatrix(self, rows, cols):
+        """
+        Get the matrix of selected rows and columns.
+
+        Parameters
+        ----------
+        rows : list of int
+            Row indices, in the order of the rows of the submatrix.
+        cols : list of int
+            Column indices, in the order of the columns of the submatrix.
+
+        Returns
+        -------
+        CostMatrix
+            Matrix of the selected entries.
+        """
+        row_index = {row: i for i, row in enumerate(rows)}
+        col_index = {col: j for j, col in enumerate(cols)}
+        matrix = CostMatrix(len(rows), len(cols))
+        for (row, col), value in self._entries.items():
+            if row in row_index and col in col_index:
+                matrix._entries[row_index[row], col_index[col]] = value
+        return matrix
+
+    def block_triangular_decomposition(self):
+        """
+        Permute the matrix to block-triangular form.
+
+        Every equation is matched to a variable it contains. The equations
+        depending on each other's variables form strongly connected components,
+        which are the diagonal blocks of the permuted matrix. The blocks are
+        returned in the order they can be solved in: every block only depends
+        on the variables of the blocks before it.
+
+        Returns
+        -------
+        list of tuple
+            Row indices and column indices of each block.
+
+        Raises
+        ------
+        SingularBlockError
+            If the matrix is structurally singular, with the over-determined rows
+            and under-determined columns.
+        """
+        if self.shape[0] != self.shape[1]:
+            raise np.linalg.LinAlgError(f"The cost matrix of shape {self.shape} is not square.")
+        row_cols = [[] for _ in range(self.shape[0])]
+        for row, col in sorted(self._entries):
+            row_cols[row].append(col)
+        match_row, match_col = _maximum_matching(row_cols, self.shape[1])
+        if min(match_row, default=0) < 0:
+            _, over, under = self.structural_analysis()
+            raise SingularBlockError("The cost matrix is structurally singular.", over, under)
+
+        # An equation depends on the equations matched to the other variables it contains
+        dependencies = [[match_col[col] for col in cols if col != match_row[row]] for row, cols in enumerate(row_cols)]
+        blocks = []
+        for rows in _strongly_connected_components(dependencies):
+            rows = sorted(rows)
+            blocks.append((rows, [match_row[row] for row in rows]))
+        return blocks
+
+    def factorize(self, sparse=None, block_triangular=False):
+        """
+        Compute the LU factorization of the matrix.
+
+        Parameters
+        ----------
+        sparse : bool, optional
+            Use the sparse LU factorization, by default if SciPy is installed.
+        block_triangular : bool, optional
+            Factorize the diagonal blocks of the block-triangular form
+            separately, by default False.
+
+        Returns
+        -------
+        CostFactorization or BlockTriangularFactorization
+            Factorization to solve for any number of right-hand sides.
+
+        Raises
+        ------
+        numpy.linalg.LinAlgError
+            If the matrix is singular.
+        """
+        if block_triangular:
+            return BlockTriangularFactorization(self, sparse)
+        return CostFactorization(self, sparse)
+
+    def solve(self, b, sparse=None):
+        """
+        Solve the linear equation system for a right-hand side.
+
+        Parameters
+        ----------
+        b : array-like
+            Right-hand side vector.
+        sparse : bool, optional
+            Use the sparse direct solver, by default if SciPy is installed.
+            Otherwise the dense matrix is solved with NumPy.
+
+        Returns
+        -------
+        numpy.ndarray
+            Solution vector.
+
+        Raises
+        ------
+        numpy.linalg.LinAlgError
+            If the matrix is singular.
+        """
+        if sparse is None:
+            sparse = __scipy_available__
+        if not sparse:
+            return np.linalg.solve(self.toarray(), np.asarray(b, dtype=float))
+        return self.factorize(sparse).solve(b)
+
+
+class SingularBlockError(np.linalg.LinAlgError):
+    """
+    Singular part of the cost equations.
+
+    Parameters
+    ----------
+    message : str
+        Description of the error.
+    equations : list of int
+        Row indices of the singular part.
+    variables : list of int
+        Column indices of the singular part.
+    """
+
+    def __init__(self, message, equations, variables):
+        super().__init__(message)
+        self.equations = equations
+        self.variables = variables
+
+
+def _inverse_max(array, axis):
+    """Get the inverse of the largest magnitude along an axis, one for all-zero rows or columns."""
+    largest = np.abs(array).max(axis=axis) if array.size else np.zeros(array.shape[1 - axis])
+    return 1 / np.where(largest > 0, largest, 1)
+
+
+def _maximum_matching(row_cols, num_cols):
+    """
+    Match rows to columns with the Hopcroft-Karp algorithm.
+
+    Every phase finds the shortest augmenting paths with a breadth-first
+    search from the unmatched rows and augments a maximal set of disjoint
+    paths along these layers. At most about sqrt(V) phases of O(E) work each
+    are needed for E entries and V rows and columns.
+
+    Parameters
+    ----------
+    row_cols : list of list of int
+        Columns of the entries of every row.
+    num_cols : int
+        Number of columns.
+
+    Returns
+    -------
+    tuple of list
+        Matched column of every row and matched row of every column, -1 if unmatched.
+    """
+    num_rows = len(row_cols)
+    match_row = [-1] * num_rows
+    match_col = [-1] * num_cols
+    # A greedy start leaves only few rows for the phases
+    for row, cols in enumerate(row_cols):
+        for col in cols:
+            if match_col[col] < 0:
+                match_row[row], match_col[col] = col, row
+                break
+
+    while True:
+        # Layer the rows by the length of the alternating paths from the unmatched rows
+        layer = [-1] * num_rows
+        queue = [row for row in range(num_rows) if match_row[row] < 0 and row_cols[row]]
+        for row in queue:
+            layer[row] = 0
+        found = False
+        for row in queue:
+            for col in row_cols[row]:
+                next_row = match_col[col]
+                if next_row < 0:
+                    found = True
+                elif layer[next_row] < 0:
+                    layer[next_row] = layer[row] + 1
+                    queue.append(next_row)
+        if not found:
+            return match_row, match_col
+
+        # Augment disjoint paths along the layers, rows without a path are removed from the layers
+        position = [0] * num_rows
+        for start in range(num_rows):
+            if match_row[start] >= 0 or layer[start] != 0:
+                continue
+            stack = [start]
+            path = []
+            while stack:
+                row = stack[-1]
+                cols = row_cols[row]
+                advanced = False
+                while position[row] < len(cols):
+                    col = cols[position[row]]
+                    position[row] += 1
+                    next_row = match_col[col]
+                    if next_row < 0:
+                        path.append(col)
+                        for path_row, path_col in zip(stack, path, strict=True):
+                            match_row[path_row], match_col[path_col] = path_col, path_row
+                        stack = []
+                        advanced = True
+                        break
+                    if layer[next_row] == layer[row] + 1:
+                        path.append(col)
+                        stack.append(next_row)
+                        advanced = True
+                        break
+                if not advanced:
+                    layer[row] = -1
+                    stack.pop()
+                    if path:
+                        path.pop()
+
+
+def _strongly_connected_components(adjacency):
+    """
+    Find the strongly connected components of a directed graph with Tarjan's algorithm.
+
+    Parameters
+    ----------
+    adjacency : list of list of int
+        Successors of every node.
+
+    Returns
+    -------
+    list of list of int
+        Nodes of each component. Every component is listed after all
+        components reachable from it.
+    """
+    num_nodes = len(adjacency)
+    index = [-1] * num_nodes
+    low = [0] * num_nodes
+    on_stack = [False] * num_nodes
+    stack = []
+    components = []
+    counter = 0
+    for root in range(num_nodes):
+        if index[root] >= 0:
+            continue
+        index[root] = low[root] = counter
+        counter += 1
+        stack.append(root)
+        on_stack[root] = True
+        work = [(root, iter(adjacency[root]))]
+        while work:
+            node, successors = work[-1]
+            for successor in successors:
+                if index[successor] < 0:
+                    index[successor] = low[successor] = counter
+                    counter += 1
+                    stack.append(successor)
+                    on_stack[successor] = True
+                    work.append((successor, iter(adjacency[successor])))
+                    break
+                elif on_stack[successor]:
+                    low[node] = min(low[node], index[successor])
+            else:
+                work.pop()
+                if work:
+                    parent = work[-1][0]
+                    low[parent] = min(low[parent], low[node])
+                if low[node] == index[node]:
+                    component = []
+                    while True:
+                        member = stack.pop()
+                        on_stack[member] = False
+                        component.append(member)
+                        if member == node:
+                            break
+                    components.append(component)
+    return components
+
+
+class CostFactorization:
+    r"""
+    LU factorization of a :class:`CostMatrix`.
+
+    The factorization is computed once and reused for every right-hand side
+    passed to :meth:`solve`. With ``sparse=True`` SciPy's sparse LU
+    decomposition (SuperLU) is used, otherwise the dense LU decomposition of
+    SciPy. Without SciPy the dense matrix is kept and every call to
+    :meth:`solve` runs NumPy's dense solver.
+
+    Parameters
+    ----------
+    matrix : CostMatrix
+        Matrix to factorize.
+    sparse : bool, optional
+        Use the sparse LU factorization, by default if SciPy is installed.
+
+    Raises
+    ------
+    numpy.linalg.LinAlgError
+        If the matrix is singular.
+    """
+
+    def __init__(self, matrix, sparse=None):
+        if sparse is None:
+            sparse = __scipy_available__
+        if matrix.shape[0] != matrix.shape[1]:
+            raise np.linalg.LinAlgError(f"The cost matrix of shape {matrix.shape} is not square.")
+        self.shape = matrix.shape
+        self.sparse = sparse
+        self._lu = None
+        self._dense = None
+        if sparse:
+            try:
+                self._lu = scipy.sparse.linalg.splu(matrix.tocsr().tocsc())
+            except RuntimeError as e:
+                raise np.linalg.LinAlgError(str(e)) from e
+        elif __scipy_available__:
+            self._lu = scipy.linalg.lu_factor(matrix.toarray(), check_finite=False)
+            if np.any(np.diag(self._lu[0]) == 0):
+                raise np.linalg.LinAlgError("Singular matrix")
+        else:
+            self._dense = matrix.toarray()
+
+    def solve(self, b, transpose=False):
+        """
+        Solve for one or several right-hand sides.
+
+        Parameters
+        ----------
+        b : array-like
+            Right-hand side vector, or matrix with one right-hand side per
+            column.
+        transpose : bool, optional
+            Solve the transposed system :math:`A^T x = b` with the same
+            factorization, as needed for adjoint sensitivities.
+
+        Returns
+        -------
+        numpy.ndarray
+            Solution of the same shape as ``b``.
+        """
+        b = np.asarray(b, dtype=float)
+        if self._dense is not None:
+            return np.linalg.solve(self._dense.T if transpose else self._dense, b)
+        if self.sparse:
+            return self._lu.solve(b, trans="T" if transpose else "N")
+        return scipy.linalg.lu_solve(self._lu, b, trans=1 if transpose else 0, check_finite=False)
+
+
+class BlockTriangularFactorization:
+    r"""
+    Factorization of a :class:`CostMatrix` in block-triangular form.
+
+    The matrix is permuted to block-triangular form with
+    :meth:`CostMatrix.block_triangular_decomposition` and only the diagonal
+    blocks are factorized. A solution runs through the blocks in sequence,
+    moving the contributions of the variables of the blocks already solved to
+    the right-hand side. Weakly coupled parts of a plant end up in separate
+    blocks, and a singular block points to the part of the cost equations the
+    singularity is located in.
+
+    Parameters
+    ----------
+    matrix : CostMatrix
+        Matrix to factorize.
+    sparse : bool, optional
+        Use the sparse LU factorization for the blocks and sparse products for
+        the coupling between the blocks, by default if SciPy is installed.
+
+    Attributes
+    ----------
+    blocks : list of tuple
+        Row indices and column indices of each block in the order of solution.
+
+    Raises
+    ------
+    SingularBlockError
+        If the matrix or one of its blocks is singular.
+    """
+
+    def __init__(self, matrix, sparse=None):
+        if sparse is None:
+            sparse = __scipy_available__
+        self.shape = matrix.shape
+        self.sparse = sparse
+        self.blocks = matrix.block_triangular_decomposition()
+        A = matrix.tocsr() if sparse else matrix.toarray()
+        A_cols = A.tocsc() if sparse else A
+        self._factors = []
+        for k, (rows, cols) in enumerate(self.blocks):
+            if len(rows) == 1:
+                factor = matrix[rows[0], cols[0]]
+                singular = factor == 0
+            else:
+                try:
+                    factor = CostFactorization(matrix.submatrix(rows, cols), sparse)
+                    singular = False
+                except np.linalg.LinAlgError:
+                    singular = True
+            if singular:
+                raise SingularBlockError(
+                    f"Block {k} of the cost matrix with {len(rows)} equations is singular.", rows, cols
+                )
+            # Rows of the block and columns of the block for the coupling to the other blocks
+            self._factors.append((factor, A[rows], A_cols[:, cols].T))
+
+    def solve(self, b, transpose=False):
+        """
+        Solve for one or several right-hand sides.
+
+        Parameters
+        ----------
+        b : array-like
+            Right-hand side vector, or matrix with one right-hand side per
+            column.
+        transpose : bool, optional
+            Solve the transposed system :math:`A^T x = b`, running through the
+            blocks in reverse order.
+
+        Returns
+        -------
+        numpy.ndarray
+            Solution of the same shape as ``b``.
+        """
+        b = np.asarray(b, dtype=float)
+        x = np.zeros(b.shape)
+        order = range(len(self.blocks) - 1, -1, -1) if transpose else range(len(self.blocks))
+        for k in order:
+            rows, cols = self.blocks[k]
+            factor, block_rows, block_cols = self._factors[k]
+            # The unknowns of this block and of the blocks not solved yet are still zero
+            if transpose:
+                rhs = b[cols] - block_cols @ x
+                target = rows
+            else:
+                rhs = b[rows] - block_rows @ x
+                target = cols
+            if isinstance(factor, CostFactorization):
+                x[target] = factor.solve(rhs, transpose)
+            else:
+                x[target] = rhs / factor
+        return x
+
+
+class SingularStackError(np.linalg.LinAlgError):
+    """
+    Singular systems of a :class:`StackedCostSystem`.
+
+    Parameters
+    ----------
+    message : str
+        Description of the error.
+    systems : list of int
+        Positions of the singular systems in the stack.
+    """
+
+    def __init__(self, message, systems):
+        super().__init__(message)
+        self.systems = systems
+
+
+class StackedCostSystem:
+    r"""
+    Stack of cost equation systems sharing one sparsity pattern.
+
+    The cost matrices of the time steps of a time series have the same
+    structure, only the coefficients of the auxiliary equations change with
+    the exergy flows. The pattern is taken once from a :class:`CostMatrix`, and
+    the matrices of all time steps are stored as rows of values in the order
+    of the pattern. A stack is solved at once: with ``sparse=True`` as one
+    block-diagonal sparse system, otherwise with NumPy's batched dense solver.
+
+    Parameters
+    ----------
+    matrix : CostMatrix
+        Matrix defining the sparsity pattern.
+
+    Attributes
+    ----------
+    shape : tuple
+        Shape of each matrix of the stack.
+    rows, cols : numpy.ndarray
+        Row and column indices of the pattern.
+    """
+
+    def __init__(self, matrix):
+        self.shape = matrix.shape
+        self._keys = sorted(matrix._entries)
+        self._slots = {key: slot for slot, key in enumerate(self._keys)}
+        self.rows = np.array([row for row, _ in self._keys], dtype=int)
+        self.cols = np.array([col for _, col in self._keys], dtype=int)
+
+    @property
+    def nnz(self):
+        """Number of entries of the pattern."""
+        return len(self._keys)
+
+    def values(self, matrix):
+        """
+        Get the values of a matrix in the order of the pattern.
+
+        Parameters
+        ----------
+        matrix : CostMatrix
+            Matrix with the entries of the pattern or a subset of them.
+
+        Returns
+        -------
+        numpy.ndarray
+            Values of the pattern entries, zero for entries the matrix does not store.
+
+        Raises
+        ------
+        ValueError
+            If the matrix has entries outside of the pattern.
+        """
+        if matrix.shape != self.shape or not matrix._entries.keys() <= self._slots.keys():
+            raise ValueError("The cost matrix does not match the sparsity pattern of the stack.")
+        entries = matrix._entries
+        return np.fromiter((entries.get(key, 0.0) for key in self._keys), dtype=float, count=len(self._keys))
+
+    def slots(self, entries):
+        """
+        Get the positions of matrix entries in the order of the pattern.
+
+        Parameters
+        ----------
+        entries : iterable of tuple
+            Row and column indices of the entries.
+
+        Returns
+        -------
+        numpy.ndarray
+            Position of every entry in the values of a system.
+
+        Raises
+        ------
+        ValueError
+            If an entry is not part of the pattern.
+        """
+        try:
+            return np.array([self._slots[key] for key in entries], dtype=int)
+        except KeyError:
+            raise ValueError("The cost matrix does not match the sparsity pattern of the stack.") from None
+
+    def solve(self, values, b, sparse=None):
+        """
+        Solve all systems of the stack.
+
+        Parameters
+        ----------
+        values : array-like
+            Matrix values with one row per system in the order of the pattern.
+        b : array-like
+            Right-hand sides with one row per system.
+        sparse : bool, optional
+            Solve the block-diagonal system with SciPy's sparse LU decomposition,
+            by default if SciPy is installed.
+
+        Returns
+        -------
+        numpy.ndarray
+            Solutions with one row per system.
+
+        Raises
+        ------
+        SingularStackError
+            If any system of the stack is singular, with the positions of the
+            singular systems.
+        """
+        if sparse is None:
+            sparse = __scipy_available__
+        values = np.atleast_2d(np.asarray(values, dtype=float))
+        b = np.atleast_2d(np.asarray(b, dtype=float))
+        n_systems, n = len(values), self.shape[0]
+        if self.shape[0] != self.shape[1]:
+            raise np.linalg.LinAlgError(f"The cost matrix of shape {self.shape} is not square.")
+        try:
+            if sparse:
+                offsets = n * np.arange(n_systems)[:, None]
+                A = scipy.sparse.csc_matrix(
+                    (values.ravel(), ((self.rows + offsets).ravel(), (self.cols + offsets).ravel())),
+                    shape=(n_systems * n, n_systems * n),
+                )
+                try:
+                    lu = scipy.sparse.linalg.splu(A)
+                except RuntimeError as e:
+                    raise np.linalg.LinAlgError(str(e)) from e
+                return lu.solve(b.ravel()).reshape(n_systems, n)
+            return np.linalg.solve(self.toarray(values), b[..., None])[..., 0]
+        except np.linalg.LinAlgError:
+            singular = [k for k in range(n_systems) if np.linalg.matrix_rank(self.toarray(values[k])) < n]
+            raise SingularStackError(
+                f"The cost matrices {singular} of the stack are singular.", singular or list(range(n_systems))
+            ) from None
+
+    def toarray(self, values):
+        """
+        Get the dense matrices of the stack.
+
+        Parameters
+        ----------
+        values : array-like
+            Matrix values of one system, or with one row per system.
+
+        Returns
+        -------
+        numpy.ndarray
+            Dense matrix, or stack of dense matrices.
+        """
+        values = np.asarray(values, dtype=float)
+        array = np.zeros(values.shape[:-1] + self.shape)
+        array[..., self.rows, self.cols] = values
+        return array
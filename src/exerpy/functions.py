@@ -1,11 +1,18 @@
-import json
 import logging
 import math
-import os
 
-import CoolProp.CoolProp as CP
+import numpy as np
 
-from exerpy import __datapath__
+from exerpy.chemical_exergy import (
+    ChemicalExergyLibrary,
+    chemical_exergy_cache,
+    composition_key,
+    molar_fraction_cache,
+)
+from exerpy.connections import ConnectionTable
+from exerpy.physical_exergy import physical_exergy
+from exerpy.properties import molar_mass, water_saturation_pressure
+from exerpy.topology import ConnectionTopology
 
 
 def mass_to_molar_fractions(mass_fractions):
@@ -29,7 +36,7 @@ def mass_to_molar_fractions(mass_fractions):
         # Step 1: Get the molar masses for each component
         for fraction in mass_fractions:
             try:
-                molar_masses[fraction] = CP.PropsSI("M", fraction)
+                molar_masses[fraction] = molar_mass(fraction)
             except Exception:
                 #  print(f"Warning: Could not retrieve molar mass for {fraction} ({fraction}). Error: {e}")
                 continue  # Skip this fraction if there's an issue
@@ -71,7 +78,7 @@ def molar_to_mass_fractions(molar_fractions):
     # Step 1: Get the molar masses for each component
     for fraction in molar_fractions:
         try:
-            molar_masses[fraction] = CP.PropsSI("M", fraction)
+            molar_masses[fraction] = molar_mass(fraction)
         except Exception:
             # print(f"Warning: Could not retrieve molar mass for {fraction} ({fraction}). Error: {e}")
             continue  # Skip this fraction if there's an issue
@@ -106,6 +113,7 @@ def calc_chemical_exergy(stream_data, Tamb, pamb, chemExLib):
     - stream_data: Dictionary containing 'mass_composition' of the stream.
     - Tamb: Ambient temperature in Celsius.
     - pamb: Ambient pressure in bar.
+    - chemExLib: Name of the chemical exergy library or a ChemicalExergyLibrary instance.
 
     Returns:
     - eCH: Chemical exergy in kJ/kg.
@@ -115,24 +123,33 @@ def calc_chemical_exergy(stream_data, Tamb, pamb, chemExLib):
     )
 
     try:
+        # Get the chemical exergy data, read from file on first use only
+        library = ChemicalExergyLibrary.load(chemExLib)
+
+        # Streams of the same composition share the result at the same reference environment. The result is
+        # calculated from the normalized composition of the key, so it does not depend on the first stream cached.
+        if "molar_composition" in stream_data:
+            composition = ("molar", composition_key(stream_data["molar_composition"]))
+        else:
+            composition = ("mass", composition_key(stream_data["mass_composition"]))
+        cache_key = (composition, float(Tamb), float(pamb), library.name)
+        eCH = chemical_exergy_cache.get(cache_key)
+        if eCH is not None:
+            logging.info(f"Chemical exergy taken from cache: {eCH} J/kg")
+            return eCH
+
         # Check if molar fractions already exist
         if "molar_composition" in stream_data:
-            molar_fractions = stream_data["molar_composition"]
+            molar_fractions = dict(composition[1])
         else:
             # If not, convert mass composition to molar fractions
-            molar_fractions = mass_to_molar_fractions(stream_data["mass_composition"])
-        try:
-            # Load chemical exergy data
-            chem_ex_file = os.path.join(__datapath__, f"{chemExLib}.json")
-            with open(chem_ex_file) as file:
-                chem_ex_data = json.load(file)  # data in J/kmol
-        except FileNotFoundError:
-            error_msg = f"Chemical exergy data file '{chemExLib}.json' not found. Please ensure the file exists or set chemExLib to 'Ahrendts'."
-            logging.error(error_msg)
-            raise FileNotFoundError(error_msg)
+            molar_fractions = molar_fraction_cache.get(composition[1])
+            if molar_fractions is None:
+                molar_fractions = mass_to_molar_fractions(dict(composition[1]))
+                molar_fraction_cache.put(composition[1], molar_fractions)
 
         R = 8.314  # Universal gas constant in J/(molK)
-        aliases_water = CP.get_aliases("H2O")
+        aliases_water = library.water_aliases
 
         # Handle pure substance (Case A)
         if len(molar_fractions) == 1:
@@ -140,20 +157,12 @@ def calc_chemical_exergy(stream_data, Tamb, pamb, chemExLib):
             substance = next(iter(molar_fractions))  # Get the single key
 
             try:
-                aliases = CP.get_aliases(substance)
-
-                if set(aliases) & set(aliases_water):
-                    eCH = chem_ex_data["WATER"][2] / CP.PropsSI("M", "H2O")  # liquid water, in J/kg
+                if library.is_water(substance):
+                    eCH = library.data["WATER"][2] / library.molar_mass("H2O")  # liquid water, in J/kg
                     logging.info(f"Pure water detected. Chemical exergy: {eCH} J/kg")
                 else:
-                    for alias in aliases:
-                        if alias.upper() in chem_ex_data:
-                            eCH = chem_ex_data[alias.upper()][3] / CP.PropsSI("M", substance)  # in J/kg
-                            logging.info(f"Found exergy data for {substance}. Chemical exergy: {eCH} J/kg")
-                            break
-                    else:
-                        logging.error(f"No matching alias found for {substance}")
-                        raise KeyError(f"No matching alias found for {substance}")
+                    eCH = library.exergy(substance) / library.molar_mass(substance)  # in J/kg
+                    logging.info(f"Found exergy data for {substance}. Chemical exergy: {eCH} J/kg")
 
             except Exception:
                 eCH = 0  # If no aliases found, set chemical exergy to 0
@@ -170,7 +179,7 @@ def calc_chemical_exergy(stream_data, Tamb, pamb, chemExLib):
 
             # Calculate the total molar mass of the mixture
             for substance, fraction in molar_fractions.items():
-                molar_mass = CP.PropsSI("M", substance)  # Molar mass in kg/mol
+                molar_mass = library.molar_mass(substance)  # Molar mass in kg/mol
                 total_molar_mass += fraction * molar_mass  # Weighted sum for molar mass in kg/mol
             logging.info(f"Total molar mass of the mixture: {total_molar_mass} kg/mol")
 
@@ -178,7 +187,7 @@ def calc_chemical_exergy(stream_data, Tamb, pamb, chemExLib):
 
             if water_present:
                 water_alias = next(alias for alias in aliases_water if alias in molar_fractions)
-                pH2O_sat = CP.PropsSI("P", "T", Tamb, "Q", 1, "Water")  # Saturation pressure of water in bar
+                pH2O_sat = water_saturation_pressure(Tamb)  # Saturation pressure of water in bar
                 pH2O = molar_fractions[water_alias] * pamb  # Partial pressure of water
 
                 if pH2O > pH2O_sat:  # Case B: Water condenses
@@ -188,7 +197,7 @@ def calc_chemical_exergy(stream_data, Tamb, pamb, chemExLib):
                     x_H2O_liquid = molar_fractions[water_alias] - x_H2O_gas  # Liquid water fraction
                     x_total_gas = 1 - x_H2O_liquid  # Total gas phase fraction
 
-                    eCH_liquid_mol = x_H2O_liquid * (chem_ex_data["WATER"][2])  # Liquid phase contribution, in J/mol
+                    eCH_liquid_mol = x_H2O_liquid * (library.data["WATER"][2])  # Liquid phase contribution, in J/mol
 
                     for substance, fraction in molar_fractions.items():
                         if substance == water_alias:
@@ -197,14 +206,7 @@ def calc_chemical_exergy(stream_data, Tamb, pamb, chemExLib):
                             molar_fractions_gas[substance] = molar_fractions[substance] / x_total_gas
 
                     for substance, fraction in molar_fractions_gas.items():
-                        aliases = CP.get_aliases(substance)
-                        for alias in aliases:
-                            if alias.upper() in chem_ex_data:
-                                eCH_gas_mol += fraction * (chem_ex_data[alias.upper()][3])  # Exergy is in J/mol
-                                break
-                        else:
-                            logging.error(f"No matching alias found for {substance}")
-                            raise KeyError(f"No matching alias found for {substance}")
+                        eCH_gas_mol += fraction * library.exergy(substance)  # Exergy is in J/mol
 
                         if fraction > 0:  # Avoid log(0)
                             entropy_mixing += fraction * math.log(fraction)
@@ -217,14 +219,7 @@ def calc_chemical_exergy(stream_data, Tamb, pamb, chemExLib):
                     logging.info("Water does not condense.")
                     eCH_mol = 0
                     for substance, fraction in molar_fractions.items():
-                        aliases = CP.get_aliases(substance)
-                        for alias in aliases:
-                            if alias.upper() in chem_ex_data:
-                                eCH_mol += fraction * (chem_ex_data[alias.upper()][3])  # Exergy in J/kmol
-                                break
-                        else:
-                            logging.error(f"No matching alias found for {substance}")
-                            raise KeyError(f"No matching alias found for {substance}")
+                        eCH_mol += fraction * library.exergy(substance)  # Exergy in J/kmol
 
                         if fraction > 0:  # Avoid log(0)
                             entropy_mixing += fraction * math.log(fraction)
@@ -235,14 +230,7 @@ def calc_chemical_exergy(stream_data, Tamb, pamb, chemExLib):
                 logging.info("No water present in the mixture.")
                 eCH_mol = 0
                 for substance, fraction in molar_fractions.items():
-                    aliases = CP.get_aliases(substance)
-                    for alias in aliases:
-                        if alias.upper() in chem_ex_data:
-                            eCH_mol += fraction * (chem_ex_data[alias.upper()][3])  # Exergy in J/kmol
-                            break
-                    else:
-                        logging.error(f"No matching alias found for {substance}")
-                        raise KeyError(f"No matching alias found for {substance}")
+                    eCH_mol += fraction * library.exergy(substance)  # Exergy in J/kmol
 
                     if fraction > 0:  # Avoid log(0)
                         entropy_mixing += fraction * math.log(fraction)
@@ -252,6 +240,7 @@ def calc_chemical_exergy(stream_data, Tamb, pamb, chemExLib):
             eCH = eCH_mol / total_molar_mass  # Divide molar exergy by molar mass of mixture
             logging.info(f"Chemical exergy: {eCH} kJ/kg")
 
+        chemical_exergy_cache.put(cache_key, eCH)
         return eCH
 
     except Exception as e:
@@ -259,6 +248,137 @@ def calc_chemical_exergy(stream_data, Tamb, pamb, chemExLib):
         raise
 
 
+def calc_chemical_exergy_vectorized(molar_fractions, species, Tamb, pamb, chemExLib):
+    r"""
+    Calculate the chemical exergy of many streams from a matrix of molar fractions.
+
+    The cases of :func:`calc_chemical_exergy` are evaluated for all streams at
+    once: the standard chemical exergy and the molar mass of the mixtures are
+    matrix-vector products, the mixing term is a masked sum of
+    :math:`x \cdot \ln x` and the streams where water condenses (Case B) are
+    selected by comparing the partial pressure of water with its saturation
+    pressure.
+
+    Parameters
+    ----------
+    molar_fractions : array-like
+        Molar fractions of shape (streams, species).
+    species : list of str
+        Names of the species in the order of the columns.
+    Tamb : float or array-like
+        Ambient temperature in K, one value or one per stream.
+    pamb : float or array-like
+        Ambient pressure in Pa, one value or one per stream.
+    chemExLib : str or exerpy.chemical_exergy.ChemicalExergyLibrary
+        Chemical exergy library.
+
+    Returns
+    -------
+    numpy.ndarray
+        Chemical exergy of the streams in J/kg.
+
+    Notes
+    -----
+    A stream with a single species of non-zero fraction is a pure substance
+    (Case A), its chemical exergy is zero if the library has no data for it.
+    Species with zero fraction in all mixtures do not need library data.
+
+    Examples
+    --------
+    >>> from exerpy.functions import calc_chemical_exergy_vectorized
+    >>> eCH = calc_chemical_exergy_vectorized(
+    ...     [[0.79, 0.21, 0.0], [0.0, 0.0, 1.0]], ["N2", "O2", "CO2"], 298.15, 101325.0, "Ahrendts"
+    ... )
+    >>> eCH.shape
+    (2,)
+    """
+    library = ChemicalExergyLibrary.load(chemExLib)
+    x = np.atleast_2d(np.asarray(molar_fractions, dtype=float))
+    if x.ndim != 2 or x.shape[1] != len(species):
+        raise ValueError(f"Molar fractions of shape {x.shape} do not match the {len(species)} species.")
+    num_streams = x.shape[0]
+    T0 = np.broadcast_to(np.asarray(Tamb, dtype=float), (num_streams,))
+    p0 = np.broadcast_to(np.asarray(pamb, dtype=float), (num_streams,))
+    R = 8.314  # Universal gas constant in J/(molK)
+
+    # Standard chemical exergy and molar mass of the species, NaN if not available
+    e_std = np.full(len(species), np.nan)
+    molar_masses = np.full(len(species), np.nan)
+    water = np.zeros(len(species), dtype=bool)
+    for col, substance in enumerate(species):
+        try:
+            water[col] = library.is_water(substance)
+            molar_masses[col] = library.molar_mass(substance)
+            e_std[col] = library.exergy(substance)
+        except Exception:
+            continue
+    known = np.isfinite(e_std) & np.isfinite(molar_masses)
+
+    present = x > 0
+    num_present = present.sum(axis=1)
+    if np.any(num_present == 0):
+        raise ValueError(f"Streams {np.flatnonzero(num_present == 0).tolist()} have no positive molar fraction.")
+    pure = num_present == 1
+    mixture = ~pure
+
+    missing = present[mixture] & ~known
+    if missing.any():
+        names = [species[col] for col in np.flatnonzero(missing.any(axis=0))]
+        logging.error(f"No chemical exergy data found for {names}")
+        raise ValueError(f"No chemical exergy data or molar mass found for {names} in library {library.name}.")
+
+    eCH = np.zeros(num_streams)
+
+    # Case A: pure substances
+    if pure.any():
+        col = np.argmax(present[pure], axis=1)
+        e_pure = np.where(known[col], e_std[col] / molar_masses[col], 0.0)
+        if np.any(water[col]):
+            e_pure[water[col]] = library.data["WATER"][2] / library.molar_mass("H2O")  # liquid water
+        for name in {species[c] for c in col[~known[col] & ~water[col]]}:
+            logging.warning(f"No chemical exergy data found for {name}. Setting chemical exergy to 0 J/kg.")
+        eCH[pure] = e_pure
+
+    # Case B and C: mixtures
+    if mixture.any():
+        xm = x[mixture]
+        e0 = np.where(known, e_std, 0.0)
+        M_mix = xm @ np.where(known, molar_masses, 0.0)
+        T_mix = T0[mixture]
+        eCH_mol = xm @ e0 + R * T_mix * _x_log_x(xm).sum(axis=1)
+
+        water_col = next((species.index(alias) for alias in library.water_aliases if alias in species), None)
+        if water_col is not None:
+            p_mix = p0[mixture]
+            pH2O_sat = np.empty_like(T_mix)
+            for T in np.unique(T_mix):
+                pH2O_sat[T_mix == T] = water_saturation_pressure(T)
+            condensing = xm[:, water_col] * p_mix > pH2O_sat
+
+            if condensing.any():
+                xc = xm[condensing]
+                x_dry = xc.sum(axis=1) - xc[:, water_col]
+                x_H2O_gas = x_dry / (p_mix[condensing] / pH2O_sat[condensing] - 1)
+                x_H2O_liquid = xc[:, water_col] - x_H2O_gas
+                x_total_gas = 1 - x_H2O_liquid
+                x_gas = xc / x_total_gas[:, None]
+                x_gas[:, water_col] = x_H2O_gas / x_total_gas
+                eCH_mol[condensing] = (
+                    x_gas @ e0
+                    + R * T_mix[condensing] * _x_log_x(x_gas).sum(axis=1)
+                    + x_H2O_liquid * library.data["WATER"][2]
+                )
+
+        eCH[mixture] = eCH_mol / M_mix
+
+    return eCH
+
+
+def _x_log_x(x):
+    positive = x > 0
+    return np.where(positive, x * np.log(np.where(positive, x, 1.0)), 0.0)
+
+
 def add_chemical_exergy(my_json, Tamb, pamb, chemExLib):
     """
     Adds the chemical exergy to each connection in the JSON data, prioritizing molar composition if available.
@@ -278,6 +398,9 @@ def add_chemical_exergy(my_json, Tamb, pamb, chemExLib):
             "Please ensure they are included in the JSON or passed as arguments."
         )
 
+    # Read the chemical exergy library once for all connections
+    library = ChemicalExergyLibrary.load(chemExLib)
+
     # Iterate over each material connection with kind == 'material'
     for conn_name, conn_data in my_json["connections"].items():
         if conn_data["kind"] == "material":
@@ -294,7 +417,7 @@ def add_chemical_exergy(my_json, Tamb, pamb, chemExLib):
                 logging.info(f"Using mass composition for connection {conn_name}")
 
             # Add the chemical exergy value
-            conn_data["e_CH"] = calc_chemical_exergy(stream_data, Tamb, pamb, chemExLib)
+            conn_data["e_CH"] = calc_chemical_exergy(stream_data, Tamb, pamb, library)
             conn_data["e_CH_unit"] = fluid_property_data["e"]["SI_unit"]
             logging.info(f"Added chemical exergy to connection {conn_name}: {conn_data['e_CH']} kJ/kg")
         else:
@@ -305,7 +428,78 @@ def add_chemical_exergy(my_json, Tamb, pamb, chemExLib):
     return my_json
 
 
-def add_total_exergy_flow(my_json, split_physical_exergy):
+def add_physical_exergy(my_json, Tamb, pamb, overwrite=False, backend="HEOS", mixing_rule="ideal-cond"):
+    """
+    Adds the physical exergy to the material connections in the JSON data.
+
+    The thermal and mechanical exergy are calculated from the pressure and the
+    temperature of the stream, or the vapor quality of wet pure fluids, with
+    :func:`exerpy.physical_exergy.physical_exergy`. The enthalpy is only used
+    if the state is not defined otherwise, e.g. saturated streams without vapor
+    quality, as the enthalpy reference of the simulators may differ from the
+    one of CoolProp. Connections that cannot be evaluated are skipped with a
+    warning.
+
+    Parameters
+    ----------
+    my_json : dict
+        The JSON object containing the components and connections.
+    Tamb : float
+        Ambient temperature in K.
+    pamb : float
+        Ambient pressure in Pa.
+    overwrite : bool, optional
+        Recalculate the physical exergy of connections that already carry it,
+        by default only connections without physical exergy are evaluated.
+    backend : str, optional
+        CoolProp backend, by default "HEOS".
+    mixing_rule : str, optional
+        Mixing rule of mixtures, by default "ideal-cond".
+
+    Returns
+    -------
+    dict
+        The modified JSON object with added physical exergy.
+    """
+    if Tamb is None or pamb is None:
+        raise ValueError("Ambient temperature (Tamb) and pressure (pamb) are required for physical exergy calculation.")
+
+    unit = fluid_property_data["e"]["SI_unit"]
+    for conn_name, conn_data in my_json["connections"].items():
+        if conn_data.get("kind") != "material":
+            continue
+        if not overwrite and conn_data.get("e_PH") is not None:
+            continue
+        composition = conn_data.get("mass_composition")
+        if not composition or conn_data.get("p") is None:
+            logging.warning(f"Missing pressure or composition of connection {conn_name}, physical exergy not added.")
+            continue
+        states = [{"T": conn_data.get("T"), "x": conn_data.get("x")}, {"h": conn_data.get("h")}]
+        states = [state for state in states if any(value is not None for value in state.values())]
+        for state in states:
+            try:
+                e_T, e_M = physical_exergy(
+                    conn_data["p"], Tamb, pamb, composition, backend=backend, mixing_rule=mixing_rule, **state
+                )
+                break
+            except ValueError as error:
+                message = str(error)
+        else:
+            if not states:
+                message = "temperature, vapor quality and enthalpy are missing."
+            logging.warning(f"Could not calculate the physical exergy of connection {conn_name}: {message}")
+            continue
+        conn_data["e_T"] = e_T
+        conn_data["e_M"] = e_M
+        conn_data["e_PH"] = e_T + e_M
+        for key in ("e_T", "e_M", "e_PH"):
+            conn_data[f"{key}_unit"] = unit
+        logging.info(f"Added physical exergy to connection {conn_name}: {conn_data['e_PH']} J/kg")
+
+    return my_json
+
+
+def add_total_exergy_flow(my_json, split_physical_exergy, topology=None, names=None):
     r"""
     Adds the total exergy flow to each connection in the JSON data based on its kind.
 
@@ -325,6 +519,12 @@ def add_total_exergy_flow(my_json, split_physical_exergy):
         The JSON object containing the components and connections.
     split_physical_exergy : bool
         Split physical exergy in mechanical and thermal shares.
+    topology : exerpy.topology.ConnectionTopology, optional
+        Topology index of the connections, built from the JSON data if not
+        provided.
+    names : iterable of str, optional
+        Only calculate the exergy flows of these connections, all connections
+        if not provided.
 
     Returns
     -------
@@ -332,7 +532,31 @@ def add_total_exergy_flow(my_json, split_physical_exergy):
         The modified JSON object with added total exergy flow for each
         connection.
     """
-    for conn_name, conn_data in my_json["connections"].items():
+    connections = my_json["connections"]
+    if topology is None:
+        topology = ConnectionTopology(connections)
+
+    # Material connections stored in a ConnectionTable are calculated column-wise,
+    # all remaining connections are handled one by one below.
+    if names is None:
+        selected = topology.names
+    else:
+        names = set(names)
+        selected = [name for name in topology.names if name in names]
+    components = my_json["components"]
+    heat_exchangers = set(components.get("SimpleHeatExchanger", {}))
+    steam_generators = set(components.get("SteamGenerator", {}))
+    handled = set()
+    if isinstance(connections, ConnectionTable):
+        handled = _add_material_exergy_flows(connections, topology, split_physical_exergy, selected)
+        handled |= _add_heat_exergy_flows(
+            connections, topology, heat_exchangers, steam_generators, split_physical_exergy, selected
+        )
+
+    for conn_name in selected:
+        if conn_name in handled:
+            continue
+        conn_data = connections[conn_name]
         try:
             # If E is already provided by the parser (e.g., synthetic heat connections with solar exergy),
             # preserve it and skip recalculation to avoid overwriting valid values. Hier Fragen ob das so ok ist.
@@ -370,22 +594,11 @@ def add_total_exergy_flow(my_json, split_physical_exergy):
                 # Identify the associated component (either source or target)
                 comp_name = conn_data["source_component"] or conn_data["target_component"]
                 # Check if the component is either a SimpleHeatExchanger or a SteamGenerator.
-                if (
-                    "SimpleHeatExchanger" in my_json["components"]
-                    and comp_name in my_json["components"]["SimpleHeatExchanger"]
-                ):
+                if comp_name in heat_exchangers:
                     # Retrieve the inlet material streams: those with this component as target.
-                    inlet_conns = [
-                        c
-                        for c in my_json["connections"].values()
-                        if c.get("target_component") == comp_name and c.get("kind") == "material"
-                    ]
+                    inlet_conns = [connections[c] for c in topology.inlets(comp_name, kind="material")]
                     # Retrieve the outlet material streams: those with this component as source.
-                    outlet_conns = [
-                        c
-                        for c in my_json["connections"].values()
-                        if c.get("source_component") == comp_name and c.get("kind") == "material"
-                    ]
+                    outlet_conns = [connections[c] for c in topology.outlets(comp_name, kind="material")]
                     # Determine which exergy key to use based on the flag.
                     exergy_key = "e_T" if split_physical_exergy else "e_PH"
 
@@ -403,18 +616,10 @@ def add_total_exergy_flow(my_json, split_physical_exergy):
                         logging.warning(
                             f"Not enough material connections for heat exchanger {comp_name} for heat exergy calculation."
                         )
-                elif "SteamGenerator" in my_json["components"] and comp_name in my_json["components"]["SteamGenerator"]:
+                elif comp_name in steam_generators:
                     # Retrieve material connections for the steam generator.
-                    inlet_conns = [
-                        c
-                        for c in my_json["connections"].values()
-                        if c.get("target_component") == comp_name and c.get("kind") == "material"
-                    ]
-                    outlet_conns = [
-                        c
-                        for c in my_json["connections"].values()
-                        if c.get("source_component") == comp_name and c.get("kind") == "material"
-                    ]
+                    inlet_conns = [connections[c] for c in topology.inlets(comp_name, kind="material")]
+                    outlet_conns = [connections[c] for c in topology.outlets(comp_name, kind="material")]
                     if inlet_conns and outlet_conns:
                         # For the steam generator, group the material connections as follows:
                         feed_water = inlet_conns[0]  # inl[0]: Feed water inlet (HP)
@@ -473,6 +678,178 @@ def add_total_exergy_flow(my_json, split_physical_exergy):
     return my_json
 
 
+def _add_material_exergy_flows(table, topology, split_physical_exergy, names):
+    """
+    Calculate the exergy flows of material connections column-wise.
+
+    Only connections without a given exergy flow that provide all required
+    specific exergies are calculated; all others are left for the
+    per-connection calculation in :func:`add_total_exergy_flow`.
+
+    Parameters
+    ----------
+    table : exerpy.connections.ConnectionTable
+        Connection data.
+    topology : exerpy.topology.ConnectionTopology
+        Topology index of the connections.
+    split_physical_exergy : bool
+        Split physical exergy in mechanical and thermal shares.
+    names : list of str
+        Names of the connections to consider.
+
+    Returns
+    -------
+    set
+        Names of the calculated connections.
+    """
+    names = [name for name in names if topology.kind(name) == "material" and table[name].get("E") is None]
+    if not names:
+        return set()
+    valid = table.present("m", names) & table.present("e_PH", names)
+    if split_physical_exergy:
+        valid &= table.present("e_T", names) & table.present("e_M", names)
+    names = [name for name, is_valid in zip(names, valid, strict=True) if is_valid]
+    if not names:
+        return set()
+
+    m = table.get_column("m", names)
+    E_PH = m * table.get_column("e_PH", names)
+    table.set_column("E_PH", E_PH, names)
+
+    has_chemical = table.present("e_CH", names)
+    E_CH = m * table.get_column("e_CH", names)
+    chemical_names = [name for name, has_ch in zip(names, has_chemical, strict=True) if has_ch]
+    if chemical_names:
+        table.set_column("E_CH", E_CH[has_chemical], chemical_names)
+    table.set_column("E", np.where(has_chemical, E_PH + E_CH, E_PH), names)
+    for name, has_ch in zip(names, has_chemical, strict=True):
+        if not has_ch:
+            logging.info(f"Missing chemical exergy for connection {name}. Using only physical exergy.")
+
+    if split_physical_exergy:
+        table.set_column("E_T", m * table.get_column("e_T", names), names)
+        table.set_column("E_M", m * table.get_column("e_M", names), names)
+
+    unit = fluid_property_data["power"]["SI_unit"]
+    for name in names:
+        table[name]["E_unit"] = unit
+    return set(names)
+
+
+def _add_heat_exergy_flows(table, topology, heat_exchangers, steam_generators, split_physical_exergy, names):
+    """
+    Calculate the exergy flows of heat connections column-wise.
+
+    The heat connections of simple heat exchangers and steam generators are
+    calculated from the material inlets and outlets of the component found in
+    the topology index. Connections without a given exergy flow whose
+    material streams provide numeric values (or no values at all) are
+    calculated; all others are left for the per-connection calculation in
+    :func:`add_total_exergy_flow`.
+
+    Parameters
+    ----------
+    table : exerpy.connections.ConnectionTable
+        Connection data.
+    topology : exerpy.topology.ConnectionTopology
+        Topology index of the connections.
+    heat_exchangers : set
+        Names of the simple heat exchangers.
+    steam_generators : set
+        Names of the steam generators.
+    split_physical_exergy : bool
+        Split physical exergy in mechanical and thermal shares.
+    names : list of str
+        Names of the connections to consider.
+
+    Returns
+    -------
+    set
+        Names of the calculated connections.
+    """
+    exergy_key = "e_T" if split_physical_exergy else "e_PH"
+
+    def is_numeric(stream):
+        return stream is None or all(
+            table.present(key, [stream])[0] or key not in table[stream] for key in ("m", exergy_key)
+        )
+
+    # Streams of each heat connection in the order of the steam generator:
+    # outlet HP, feed water, outlet IP, steam inlet, water injection HP and IP.
+    # Simple heat exchangers only use the first two.
+    heat_exchanger_conns, steam_generator_conns = [], []
+    heat_exchanger_streams, steam_generator_streams = [], []
+    for name in names:
+        if topology.kind(name) != "heat" or table[name].get("E") is not None:
+            continue
+        comp_name = topology.source(name) or topology.target(name)
+        if comp_name not in heat_exchangers and comp_name not in steam_generators:
+            continue
+        inlets = topology.inlets(comp_name, kind="material")
+        outlets = topology.outlets(comp_name, kind="material")
+        if not inlets or not outlets:
+            continue
+        if comp_name in heat_exchangers:
+            streams = [outlets[0], inlets[0]]
+        else:
+            inlets = inlets + [None] * (4 - len(inlets))
+            outlets = outlets + [None] * (2 - len(outlets))
+            streams = [outlets[0], inlets[0], outlets[1], inlets[1], inlets[2], inlets[3]]
+        if not all(is_numeric(stream) for stream in streams):
+            continue
+        if comp_name in heat_exchangers:
+            heat_exchanger_conns.append(name)
+            heat_exchanger_streams.append(streams)
+        else:
+            steam_generator_conns.append(name)
+            steam_generator_streams.append(streams)
+
+    if heat_exchanger_conns:
+        E = _stream_exergy_flows(table, heat_exchanger_streams, exergy_key)
+        table.set_column("E", np.abs(E[:, 1] - E[:, 0]), heat_exchanger_conns)
+    if steam_generator_conns:
+        E = _stream_exergy_flows(table, steam_generator_streams, exergy_key)
+        E_F_HP = E[:, 0] - E[:, 1]
+        E_F_IP = E[:, 2] - E[:, 3]
+        E_F_w_inj = E[:, 4] + E[:, 5]
+        table.set_column("E", E_F_HP + E_F_IP - E_F_w_inj, steam_generator_conns)
+
+    unit = fluid_property_data["power"]["SI_unit"]
+    calculated = heat_exchanger_conns + steam_generator_conns
+    for name in calculated:
+        table[name]["E_unit"] = unit
+    return set(calculated)
+
+
+def _stream_exergy_flows(table, streams, exergy_key):
+    """
+    Get the exergy flows of material streams.
+
+    Parameters
+    ----------
+    table : exerpy.connections.ConnectionTable
+        Connection data.
+    streams : list of list
+        Names of the streams per heat connection, None for missing streams.
+    exergy_key : str
+        Specific exergy to use.
+
+    Returns
+    -------
+    numpy.ndarray
+        Mass flow times specific exergy of shape (heat connections, streams),
+        zero for missing streams and values.
+    """
+    streams = np.array(streams, dtype=object)
+    exists = streams != None  # noqa: E711
+    names = streams[exists].tolist()
+    m = np.where(table.present("m", names), table.get_column("m", names), 0.0)
+    e = np.where(table.present(exergy_key, names), table.get_column(exergy_key, names), 0.0)
+    E = np.zeros(streams.shape)
+    E[exists] = m * e
+    return E
+
+
 def convert_to_SI(property, value, unit):
     r"""
     Convert a value to its SI value.
@@ -0,0 +1,147 @@
+import logging
+
+from tespy.connections import Connection
+from tespy.networks import Network
+
+from exerpy.analyses import ExergoeconomicAnalysis, ExergyAnalysis
+from exerpy.parser.from_tespy.tespy_parser import MATERIAL_PROPERTIES, _material_states, _native_fluid
+
+
+class TespyCoupling:
+    """
+    Exergy and exergoeconomic analysis bound to a TESPy network.
+
+    The exergy analysis is built once from the solved network with the bulk
+    export of :meth:`exerpy.ExergyAnalysis.from_tespy`: the topology, the
+    component objects and the chemical exergy of the streams are kept for the
+    lifetime of the coupling. After every further solution of the network,
+    :meth:`update` reads only the numeric states of the connections and power
+    connections into the existing model, recalculates the physical exergy with
+    the cached ambient states of :mod:`exerpy.physical_exergy` and reruns the
+    exergy analysis and, if costs are given, the exergoeconomic analysis.
+
+    Parameters
+    ----------
+    nw : tespy.networks.network.Network
+        Solved network.
+    Tamb : float
+        Ambient temperature in K.
+    pamb : float
+        Ambient pressure in Pa.
+    E_F : dict
+        Dictionary containing input and output connections for fuel exergy.
+    E_P : dict
+        Dictionary containing input and output connections for product exergy.
+    E_L : dict, optional
+        Dictionary containing input and output connections for loss exergy.
+    chemExLib : str, optional
+        Name of the library for chemical exergy tables.
+    split_physical_exergy : bool, optional
+        Flag to split the physical exergy into thermal and mechanical exergy,
+        by default True.
+    costs : dict, optional
+        Costs in the format of the ``Exe_Eco_Costs`` argument of
+        :meth:`exerpy.ExergoeconomicAnalysis.run`. Without costs only the
+        exergy analysis is run.
+    **kwargs
+        Keyword arguments of :class:`exerpy.ExergoeconomicAnalysis`, e.g.
+        ``currency`` or ``sparse``.
+
+    Attributes
+    ----------
+    network : tespy.networks.network.Network
+        Network the analyses are bound to.
+    exergy_analysis : ExergyAnalysis
+        Exergy analysis holding the results of the last solution.
+    exergoeconomic_analysis : ExergoeconomicAnalysis or None
+        Exergoeconomic analysis holding the results of the last solution, None
+        without costs.
+    costs : dict or None
+        Costs of the exergoeconomic analysis.
+
+    Notes
+    -----
+    The components, the connections and the fluid compositions of the network
+    must not change between the solutions. Create a new coupling after
+    structural changes of the network.
+    """
+
+    def __init__(
+        self, nw, Tamb, pamb, E_F, E_P, E_L=None, chemExLib=None, split_physical_exergy=True, costs=None, **kwargs
+    ):
+        if not isinstance(nw, Network):
+            raise TypeError("The coupling requires a tespy network.")
+        self.network = nw
+        self._check_convergence()
+        self.exergy_analysis = ExergyAnalysis.from_tespy(nw, Tamb, pamb, chemExLib, split_physical_exergy, bulk=True)
+        self.exergy_analysis.analyse(E_F, E_P, E_L)
+        self.costs = costs
+        self.exergoeconomic_analysis = None
+        if costs is not None:
+            self.exergoeconomic_analysis = ExergoeconomicAnalysis(self.exergy_analysis, **kwargs)
+            self.exergoeconomic_analysis.run(costs, self.exergy_analysis.Tamb)
+
+        # The connection objects and the evaluation of their fluids are looked up once
+        self._material = [c for c in nw.conns["object"] if isinstance(c, Connection)]
+        self._power = [c for c in nw.conns["object"] if not isinstance(c, Connection)]
+        self._fluids = [_native_fluid(c, self.exergy_analysis.Tamb) for c in self._material]
+
+    def _check_convergence(self):
+        """Raise a RuntimeError if the last solution of the network did not converge."""
+        if not self.network.converged:
+            msg = "The tespy network did not converge, the analyses keep the results of the last converged solution."
+            raise RuntimeError(msg)
+
+    def connection_states(self):
+        """
+        Get the numeric states of all connections of the solved network.
+
+        Returns
+        -------
+        dict
+            Connection names mapped to the properties of
+            :data:`exerpy.parser.from_tespy.tespy_parser.MATERIAL_PROPERTIES`
+            and the physical exergy for material connections and to the energy
+            flow for power and heat connections, in SI units.
+        """
+        ean = self.exergy_analysis
+        states, exergy = _material_states(self._material, ean.pamb, ean.Tamb, self._fluids)
+        connection_states = {}
+        for c, values, (e_T, e_M) in zip(self._material, states.tolist(), exergy.tolist(), strict=True):
+            state = dict(zip(MATERIAL_PROPERTIES, values, strict=True))
+            state.update({"e_T": e_T, "e_M": e_M, "e_PH": e_T + e_M})
+            connection_states[c.label] = state
+        for c in self._power:
+            connection_states[c.label] = {"energy_flow": c.E.val_SI}
+        return connection_states
+
+    def update(self):
+        """
+        Read the solution of the network and rerun the analyses.
+
+        Raises
+        ------
+        RuntimeError
+            If the last solution of the network did not converge.
+        """
+        self._check_convergence()
+        ean = self.exergy_analysis
+        ean.apply_connection_states(self.connection_states())
+        ean.analyse(ean.E_F_dict, ean.E_P_dict, ean.E_L_dict)
+        if self.exergoeconomic_analysis is not None:
+            self.exergoeconomic_analysis.run(self.costs, ean.Tamb)
+        logging.info(f"Analyses updated from the solution of the tespy network: epsilon = {ean.epsilon}.")
+
+    def solve(self, *args, **kwargs):
+        """
+        Solve the network and rerun the analyses.
+
+        All arguments are passed to :meth:`tespy.networks.network.Network.solve`.
+
+        Raises
+        ------
+        RuntimeError
+            If the solution of the network did not converge.
+        """
+        self.network.solve(*args, **kwargs)
+        self.update()
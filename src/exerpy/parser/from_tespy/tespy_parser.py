@@ -1,10 +1,18 @@
+import numpy as np
+import pandas as pd
 from tespy.connections import Connection, PowerConnection
 from tespy.networks import Network
+from tespy.tools.fluid_properties.wrappers import CoolPropWrapper
 
+from exerpy.connections import ConnectionTable
 from exerpy.parser.from_tespy.tespy_config import EXERPY_TESPY_MAPPINGS
+from exerpy.physical_exergy import MIXING_RULES, physical_exergy
 
+#: Material connection properties read from the solved network.
+MATERIAL_PROPERTIES = ("m", "T", "p", "h", "s", "v")
 
-def to_exerpy(nw: Network, Tamb: float, pamb: float) -> dict:
+
+def to_exerpy(nw: Network, Tamb: float, pamb: float, bulk: bool = False) -> dict:
     """Export the network to exerpy
 
     Parameters
@@ -15,42 +23,195 @@ def to_exerpy(nw: Network, Tamb: float, pamb: float) -> dict:
         Ambient temperature.
     pamb : float
         Ambient pressure.
+    bulk : bool, optional
+        Write the connection data column by column into a
+        :class:`exerpy.connections.ConnectionTable` and calculate the physical
+        exergy of all connections of the same fluid with the cached
+        :func:`exerpy.physical_exergy.physical_exergy` from the solved
+        enthalpy and entropy, by default False.
 
     Returns
     -------
     dict
         exerpy compatible input dictionary
     """
+    component_json = _components_to_exerpy(nw)
+
+    if bulk:
+        connection_json = _connections_to_table(nw, pamb, Tamb)
+    else:
+        connection_json = {}
+        for c in nw.conns["object"]:
+            if isinstance(c, Connection):
+                connection_json.update(_connection_to_exerpy(c, pamb, Tamb))
+            else:
+                connection_json.update(_powerconnection_to_exerpy(c, pamb, Tamb))
+
+    return {
+        "components": component_json,
+        "connections": connection_json,
+        "ambient_conditions": {"Tamb": Tamb, "Tamb_unit": "K", "pamb": pamb, "pamb_unit": "Pa"},
+    }
+
+
+def _components_to_exerpy(nw: Network) -> dict:
+    """Serialize the components of a tespy Network to exerpy
+
+    Parameters
+    ----------
+    nw : tespy.networks.network.Network
+        Network to be parsed
+
+    Returns
+    -------
+    dict
+        Serialization of the components grouped by exerpy component class
+    """
     component_results = nw._save_components()
-    component_json = {}
-    for comp_type in nw.comps["comp_type"].unique():
-        if comp_type not in EXERPY_TESPY_MAPPINGS:
-            continue
+    components = {}
+    for comp_type, c in zip(nw.comps["comp_type"], nw.comps["object"], strict=True):
+        if comp_type in EXERPY_TESPY_MAPPINGS:
+            components.setdefault(comp_type, []).append(c)
 
+    component_json = {}
+    for comp_type, objects in components.items():
         key = EXERPY_TESPY_MAPPINGS[comp_type]
         if key not in component_json:
             component_json[key] = {}
 
-        result = component_results[comp_type].dropna(axis=1)
+        # Columns with missing values are dropped, all remaining values of a row are parameters
+        result = component_results[comp_type]
+        values = result.to_numpy(dtype=object)
+        columns = ~pd.isna(values).any(axis=0)
+        names = result.columns[columns].tolist()
+        parameters = {
+            label: dict(zip(names, row, strict=True))
+            for label, row in zip(result.index, values[:, columns].tolist(), strict=True)
+        }
 
-        for c in nw.comps.loc[nw.comps["comp_type"] == comp_type, "object"]:
-            parameters = {}
-            if c.label in result.index and not result.loc[c.label].dropna().empty:
-                parameters = result.loc[c.label].dropna().to_dict()
-            component_json[key][c.label] = {"name": c.label, "type": comp_type, "parameters": parameters}
+        for c in objects:
+            component_json[key][c.label] = {
+                "name": c.label,
+                "type": comp_type,
+                "parameters": parameters.get(c.label, {}),
+            }
 
-    connection_json = {}
+    return component_json
+
+
+def _connections_to_table(nw: Network, pamb: float, Tamb: float) -> ConnectionTable:
+    """Serialize all connections of a tespy Network into a ConnectionTable
+
+    The numeric states of the material connections are collected in one pass
+    and written column by column. The physical exergy is calculated with the
+    cached dead states and ambient temperature isobars of
+    :func:`exerpy.physical_exergy.physical_exergy`, connections of fluids
+    outside of its scope (other backends or mixing rules and fluids that are
+    not fluid at ambient temperature) are evaluated by tespy.
+
+    Parameters
+    ----------
+    nw : tespy.networks.network.Network
+        Network to be parsed
+    Tamb : float
+        Ambient temperature.
+    pamb : float
+        Ambient pressure.
+
+    Returns
+    -------
+    exerpy.connections.ConnectionTable
+        Columnar connection data
+    """
+    table = ConnectionTable()
+    material, power = [], []
     for c in nw.conns["object"]:
         if isinstance(c, Connection):
-            connection_json.update(_connection_to_exerpy(c, pamb, Tamb))
+            table[c.label] = {
+                "source_component": c.source.label,
+                "source_connector": int(c.source_id.removeprefix("out")) - 1,
+                "target_component": c.target.label,
+                "target_connector": int(c.target_id.removeprefix("in")) - 1,
+                "mass_composition": c.fluid.val,
+                "kind": "material",
+                "v": c.v.val_SI,
+            }
+            material.append(c)
         else:
-            connection_json.update(_powerconnection_to_exerpy(c, pamb, Tamb))
+            table.update(_powerconnection_to_exerpy(c, pamb, Tamb))
+            power.append(c)
 
-    return {
-        "components": component_json,
-        "connections": connection_json,
-        "ambient_conditions": {"Tamb": Tamb, "Tamb_unit": "K", "pamb": pamb, "pamb_unit": "Pa"},
-    }
+    names = [c.label for c in material]
+    states, exergy = _material_states(material, pamb, Tamb, [_native_fluid(c, Tamb) for c in material])
+    for col, param in enumerate(MATERIAL_PROPERTIES[:-1]):
+        table.set_column(param, states[:, col], names)
+    table.set_column("e_T", exergy[:, 0], names)
+    table.set_column("e_M", exergy[:, 1], names)
+    table.set_column("e_PH", exergy.sum(axis=1), names)
+
+    return table
+
+
+def _material_states(material: list, pamb: float, Tamb: float, fluids: list) -> tuple:
+    """Get the numeric states and the physical exergy of solved tespy Connections
+
+    Parameters
+    ----------
+    material : list
+        Connection objects
+    pamb : float
+        Ambient pressure.
+    Tamb : float
+        Ambient temperature.
+    fluids : list
+        Result of :func:`_native_fluid` for every connection, connections with
+        None are evaluated by tespy.
+
+    Returns
+    -------
+    tuple
+        Array of the properties :data:`MATERIAL_PROPERTIES` and array of the
+        thermal and mechanical exergy, one row per connection
+    """
+    states = np.array([[c.get_attr(param).val_SI for param in MATERIAL_PROPERTIES] for c in material])
+    states = states.reshape(len(material), len(MATERIAL_PROPERTIES))
+    exergy = np.empty((len(material), 2))
+    for row, (c, fluid) in enumerate(zip(material, fluids, strict=True)):
+        if fluid is None:
+            c._get_physical_exergy(pamb, Tamb)
+            exergy[row] = c.ex_therm, c.ex_mech
+        else:
+            composition, backend, mixing_rule = fluid
+            m, T, p, h, s, v = states[row]
+            exergy[row] = physical_exergy(
+                p, Tamb, pamb, composition, h=h, backend=backend, mixing_rule=mixing_rule, s=s
+            )
+    return states, exergy
+
+
+def _native_fluid(c: Connection, Tamb: float):
+    """Get the composition, backend and mixing rule of a connection for the exerpy physical exergy
+
+    Returns None if tespy evaluates the fluid differently, i.e. for fluid
+    wrappers other than CoolProp's Helmholtz energy backend, for incompressible
+    or humid air mixtures and for fluids below their minimum temperature at
+    ambient temperature.
+    """
+    composition = {}
+    for name, data in c.fluid_data.items():
+        wrapper = data["wrapper"]
+        if not isinstance(wrapper, CoolPropWrapper) or wrapper.back_end != "HEOS" or wrapper.mixture_type is not None:
+            return None
+        if c.fluid.val[name] > 0:
+            composition[wrapper.fluid] = c.fluid.val[name]
+    if len(composition) == 1:
+        wrapper = next(data["wrapper"] for name, data in c.fluid_data.items() if c.fluid.val[name] > 0)
+        if wrapper._T_min > Tamb:
+            return None
+        return composition, "HEOS", "ideal-cond"
+    if c.mixing_rule not in MIXING_RULES:
+        return None
+    return composition, "HEOS", c.mixing_rule
 
 
 def _connection_to_exerpy(c: Connection, pamb: float, Tamb: float) -> dict:
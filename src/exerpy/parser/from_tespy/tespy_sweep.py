@@ -0,0 +1,261 @@
+import itertools
+import logging
+import math
+import os
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+import pandas as pd
+from tespy.networks import Network
+
+from exerpy.parser.from_tespy.tespy_coupling import TespyCoupling
+
+#: Sweep of the worker process, set up once per process by the pool initializer.
+_worker = None
+
+
+def run_sweep(
+    model,
+    grid,
+    Tamb,
+    pamb,
+    E_F,
+    E_P,
+    E_L=None,
+    costs=None,
+    mode="design",
+    design_path=None,
+    init_path=None,
+    processes=None,
+    chunk_size=None,
+    chemExLib=None,
+    split_physical_exergy=True,
+):
+    """
+    Solve and analyse a TESPy network for all cases of a parameter grid in parallel.
+
+    The cases are split into blocks of neighbouring cases, which are solved in
+    a pool of worker processes. Every worker builds its network and its
+    :class:`exerpy.parser.from_tespy.tespy_coupling.TespyCoupling` once: each
+    further case starts from the solution of the previous case of the worker
+    and only updates the stream states of the existing exergy analysis. A
+    network that does not converge for a case, or whose solution or analysis
+    fails with a ValueError (e.g. a CoolProp state out of range or a singular
+    or unbalanced exergoeconomic system), is rebuilt for the next case.
+
+    Parameters
+    ----------
+    model : callable or str
+        Function without arguments returning the network, or path to a
+        network exported with :meth:`tespy.networks.network.Network.export`.
+        The function must be defined at module level to be passed to the
+        worker processes.
+    grid : dict or list of dict
+        Parameter values in the units of the network, keyed by the label of a
+        connection or component and the attribute, e.g.
+        ``{"21.m": [8, 10], "COMP.eta_s": [0.75, 0.8, 0.85]}`` for all
+        combinations of the values (the last parameter varies fastest), or a
+        list of such dictionaries with scalar values, one per case.
+    Tamb : float
+        Ambient temperature in K.
+    pamb : float
+        Ambient pressure in Pa.
+    E_F : dict
+        Dictionary containing input and output connections for fuel exergy.
+    E_P : dict
+        Dictionary containing input and output connections for product exergy.
+    E_L : dict, optional
+        Dictionary containing input and output connections for loss exergy.
+    costs : dict, optional
+        Costs in the format of the ``Exe_Eco_Costs`` argument of
+        :meth:`exerpy.ExergoeconomicAnalysis.run`. The exergoeconomic analysis
+        is only run if costs are given.
+    mode : str, optional
+        Calculation mode of the network, by default "design".
+    design_path : str, optional
+        Design point of an offdesign calculation.
+    init_path : str, optional
+        Starting values of the first solution of every network, saved with
+        :meth:`tespy.networks.network.Network.save`.
+    processes : int, optional
+        Number of worker processes, by default the number of CPUs. With one
+        process the cases are solved in the calling process.
+    chunk_size : int, optional
+        Number of neighbouring cases solved one after another by a worker, by
+        default the cases are split evenly between the processes.
+    chemExLib : str, optional
+        Name of the library for chemical exergy tables.
+    split_physical_exergy : bool, optional
+        Flag to split the physical exergy into thermal and mechanical exergy,
+        by default True.
+
+    Returns
+    -------
+    pandas.DataFrame
+        Component results of :meth:`exerpy.ExergyAnalysis.exergy_results`, and
+        the cost results of the components if costs are given, in long format
+        with the columns "Case" (position of the case in the grid) and one
+        column per parameter. Failed cases are missing.
+
+    Raises
+    ------
+    ValueError
+        If the grid has no cases, a parameter key lacks the attribute, the
+        cases set different parameters or a label is not part of the network.
+    """
+    cases = _grid_cases(grid)
+    if processes is None:
+        processes = os.cpu_count() or 1
+    if chunk_size is None:
+        chunk_size = math.ceil(len(cases) / processes)
+    numbered = list(enumerate(cases))
+    chunks = [numbered[start : start + chunk_size] for start in range(0, len(cases), chunk_size)]
+    solve_kwargs = {"mode": mode, "design_path": design_path}
+    settings = (model, Tamb, pamb, E_F, E_P, E_L, costs, solve_kwargs, init_path, chemExLib, split_physical_exergy)
+
+    if processes == 1:
+        sweep = _Sweep(*settings)
+        results = [sweep.run(chunk) for chunk in chunks]
+    else:
+        with ProcessPoolExecutor(min(processes, len(chunks)), initializer=_init_worker, initargs=settings) as pool:
+            results = list(pool.map(_run_chunk, chunks))
+
+    frames = [frame for chunk_frames, _ in results for frame in chunk_frames]
+    failed = [case for _, chunk_failed in results for case in chunk_failed]
+    if failed:
+        logging.warning(f"The solution or analysis failed for {len(failed)} of {len(cases)} cases: {failed}.")
+    logging.info(f"Sweep of {len(cases)} cases completed with {min(processes, len(chunks))} process(es).")
+    if not frames:
+        return pd.DataFrame(columns=["Case", *cases[0], "Component"])
+    return pd.concat(frames, ignore_index=True)
+
+
+def _grid_cases(grid):
+    """Get the parameter values of all cases of a grid."""
+    if isinstance(grid, dict):
+        values = [np.atleast_1d(value).tolist() for value in grid.values()]
+        cases = [dict(zip(grid, case, strict=True)) for case in itertools.product(*values)]
+    else:
+        cases = [dict(case) for case in grid]
+    if not cases:
+        raise ValueError("The parameter grid has no cases.")
+    for key in cases[0]:
+        if "." not in key:
+            raise ValueError(f"The parameter '{key}' must consist of a label and an attribute, e.g. 'COMP.eta_s'.")
+    if any(case.keys() != cases[0].keys() for case in cases):
+        raise ValueError("All cases of the parameter grid must set the same parameters.")
+    return cases
+
+
+def _init_worker(*settings):
+    """Set up the sweep of a worker process."""
+    global _worker
+    _worker = _Sweep(*settings)
+
+
+def _run_chunk(chunk):
+    """Solve and analyse neighbouring cases in a worker process."""
+    return _worker.run(chunk)
+
+
+class _Sweep:
+    """
+    Network and coupled analyses of one process of a sweep.
+
+    The network is kept between the cases, so every solution starts from the
+    solution of the previous case.
+    """
+
+    def __init__(
+        self, model, Tamb, pamb, E_F, E_P, E_L, costs, solve_kwargs, init_path, chemExLib, split_physical_exergy
+    ):
+        self.model = model
+        self.Tamb = Tamb
+        self.pamb = pamb
+        self.flows = (E_F, E_P, E_L)
+        self.costs = costs
+        self.solve_kwargs = solve_kwargs
+        self.init_path = init_path
+        self.chemExLib = chemExLib
+        self.split_physical_exergy = split_physical_exergy
+        self.network = None
+        self.coupling = None
+
+    def _build_network(self):
+        """Create a new network from the model."""
+        if isinstance(self.model, str):
+            return Network.from_json(self.model)
+        return self.model()
+
+    def run(self, chunk):
+        """
+        Solve and analyse the cases of a chunk.
+
+        Parameters
+        ----------
+        chunk : list
+            Pairs of case number and parameter values.
+
+        Returns
+        -------
+        tuple
+            Result frames of the successful cases and numbers of the failed
+            cases.
+
+        Raises
+        ------
+        ValueError
+            If a label of the parameters is not part of the network.
+        """
+        frames, failed = [], []
+        for case, parameters in chunk:
+            if self.network is None:
+                self.network = self._build_network()
+            for key, value in parameters.items():
+                _set_parameter(self.network, key, value)
+            try:
+                frames.append(self._run_case(case, parameters))
+            except (RuntimeError, ValueError) as error:
+                # The solution of a failed case is no starting point for the next one
+                logging.info(f"Case {case} failed: {error}")
+                failed.append(case)
+                self.network = None
+                self.coupling = None
+        return frames, failed
+
+    def _run_case(self, case, parameters):
+        """Solve and analyse a single case and return its component results."""
+        if self.coupling is None:
+            self.network.solve(**self.solve_kwargs, init_path=self.init_path)
+            self.coupling = TespyCoupling(
+                self.network,
+                self.Tamb,
+                self.pamb,
+                *self.flows,
+                chemExLib=self.chemExLib,
+                split_physical_exergy=self.split_physical_exergy,
+                costs=self.costs,
+            )
+        else:
+            self.coupling.solve(**self.solve_kwargs)
+
+        results = self.coupling.exergy_analysis.exergy_results(print_results=False)[0]
+        exergoeco = self.coupling.exergoeconomic_analysis
+        if exergoeco is not None:
+            costs = pd.DataFrame(exergoeco.component_cost_rows("Case", case)).drop(columns="Case")
+            results = results.merge(costs, on="Component", how="left")
+        results = results.reset_index(drop=True)
+        for position, (key, value) in enumerate({"Case": case, **parameters}.items()):
+            results.insert(position, key, value)
+        return results
+
+
+def _set_parameter(nw, key, value):
+    """Set an attribute of a connection or component, given as "<label>.<attribute>"."""
+    label, _, attribute = key.rpartition(".")
+    if label in nw.conns.index:
+        nw.get_conn(label).set_attr(**{attribute: value})
+    elif label in nw.comps.index:
+        nw.get_comp(label).set_attr(**{attribute: value})
+    else:
+        raise ValueError(f"The network has no connection or component with the label '{label}'.")
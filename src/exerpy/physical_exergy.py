@@ -0,0 +1,359 @@
+import logging
+
+import CoolProp.CoolProp as CP
+
+from exerpy.properties import CompositionCache
+
+MIXING_RULES = ("ideal", "ideal-cond")
+
+_abstract_states = {}
+
+#: Fluids of compositions, backends and mixing rules.
+fluid_cache = CompositionCache(maxsize=256)
+
+#: Specific enthalpy and entropy of the dead states of compositions and reference environments.
+dead_state_cache = CompositionCache(maxsize=1024)
+
+#: Specific enthalpy and entropy on the ambient temperature isobars of compositions and pressures.
+isobar_cache = CompositionCache(maxsize=8192)
+
+
+def abstract_state(fluid, backend="HEOS"):
+    """
+    Get the CoolProp AbstractState of a pure fluid.
+
+    The state is created on the first request and cached for the whole
+    process.
+
+    Parameters
+    ----------
+    fluid : str
+        CoolProp name or alias of the fluid.
+    backend : str, optional
+        CoolProp backend, by default "HEOS".
+
+    Returns
+    -------
+    CoolProp.AbstractState
+        State object of the fluid.
+    """
+    key = (backend, fluid)
+    state = _abstract_states.get(key)
+    if state is None:
+        state = CP.AbstractState(backend, fluid)
+        _abstract_states[key] = state
+    return state
+
+
+class _Fluid:
+    """
+    Pure fluid or ideal mixture of a composition.
+
+    Pure fluids are evaluated as real fluids. Mixtures are evaluated as ideal
+    mixtures of the pure components at their partial pressures, as in TESPy:
+    with the mixing rule "ideal-cond", water exceeding its saturation pressure
+    condenses.
+
+    Parameters
+    ----------
+    composition : tuple
+        Pairs of fluid name and mass fraction.
+    backend : str
+        CoolProp backend.
+    mixing_rule : str
+        Mixing rule of mixtures.
+    """
+
+    def __init__(self, composition, backend, mixing_rule):
+        self.states = []
+        mass_fractions = []
+        for fluid, fraction in composition:
+            try:
+                self.states.append(abstract_state(fluid, backend))
+            except ValueError:
+                logging.warning(f"The fluid {fluid} is unknown to CoolProp and is skipped for the physical exergy.")
+                continue
+            mass_fractions.append(fraction)
+        if not self.states:
+            raise ValueError(f"No fluid of the composition {dict(composition)} is known to CoolProp.")
+        total = sum(mass_fractions)
+        self.w = [fraction / total for fraction in mass_fractions]
+        self.M = [state.molar_mass() for state in self.states]
+        moles = [w / M for w, M in zip(self.w, self.M, strict=True)]
+        self.x = [n / sum(moles) for n in moles]
+        self.M_mix = sum(x * M for x, M in zip(self.x, self.M, strict=True))
+        self.pure = len(self.states) == 1
+        self.mixing_rule = mixing_rule
+        names = [state.fluid_names()[0] for state in self.states]
+        self.water = names.index("Water") if mixing_rule == "ideal-cond" and "Water" in names else None
+
+    def _phase_fractions(self, p, T):
+        """Get the gas phase mass and molar fractions and the mass fraction of condensed water."""
+        if self.water is None:
+            return self.w, self.x, 0.0
+        water = self.states[self.water]
+        if water.T_critical() <= T:
+            return self.w, self.x, 0.0
+        water.update(CP.QT_INPUTS, 1, T)
+        p_sat = water.p()
+        x_water = self.x[self.water]
+        if p_sat >= p * x_water:
+            return self.w, self.x, 0.0
+        water_molar_gas = (1 - x_water) / (p / p_sat - 1)
+        water_molar_liquid = x_water - water_molar_gas
+        x_gas = [x / (1 - water_molar_liquid) for x in self.x]
+        x_gas[self.water] = water_molar_gas / (1 - water_molar_liquid)
+        mass_liquid = water_molar_liquid * self.M[self.water] / self.M_mix
+        M_gas = sum(x * M for x, M in zip(x_gas, self.M, strict=True))
+        w_gas = [x * M / M_gas for x, M in zip(x_gas, self.M, strict=True)]
+        return w_gas, x_gas, mass_liquid
+
+    def h_s_pT(self, p, T):
+        """Get the specific enthalpy and entropy at pressure and temperature."""
+        if self.pure:
+            state = self.states[0]
+            state.update(CP.PT_INPUTS, p, T)
+            return state.hmass(), state.smass()
+        w_gas, x_gas, mass_liquid = self._phase_fractions(p, T)
+        h = s = 0.0
+        for i, state in enumerate(self.states):
+            if w_gas[i] <= 0:
+                continue
+            if i == self.water and mass_liquid > 0:
+                state.update(CP.QT_INPUTS, 0, T)
+                h += state.hmass() * mass_liquid
+                s += state.smass() * mass_liquid
+                state.update(CP.QT_INPUTS, 1, T)
+            else:
+                state.update(CP.PT_INPUTS, p * x_gas[i], T)
+            h += state.hmass() * w_gas[i] * (1 - mass_liquid)
+            s += state.smass() * w_gas[i] * (1 - mass_liquid)
+        return h, s
+
+    def saturated(self, p, T, x):
+        """
+        Check if a pure fluid state lies on the saturation line.
+
+        Raises a ValueError if the temperature lies on the saturation line but
+        the vapor quality is unknown, as the state is not defined then.
+        """
+        if not self.pure:
+            return False
+        state = self.states[0]
+        if p >= state.p_critical():
+            return False
+        if x is not None and 0 < x < 1:
+            return True
+        if T is None:
+            return x is not None
+        state.update(CP.PQ_INPUTS, p, 0)
+        if abs(T - state.T()) >= 1e-2:
+            return False
+        if x is None:
+            raise ValueError(
+                f"The state at p={p} Pa and T={T} K lies on the saturation line, the vapor quality is required."
+            )
+        return x in (0, 1)
+
+    def T_h_s_pQ(self, p, x):
+        """Get the temperature, the specific enthalpy and entropy of a pure fluid at pressure and vapor quality."""
+        state = self.states[0]
+        state.update(CP.PQ_INPUTS, p, x)
+        return state.T(), state.hmass(), state.smass()
+
+    def T_s_ph(self, p, h, T_guess):
+        """
+        Get the temperature, the specific entropy and the two-phase flag at pressure and enthalpy.
+
+        Pure fluids are evaluated directly by CoolProp. For mixtures, the
+        temperature is found by a Newton iteration on :meth:`h_s_pT` starting
+        from ``T_guess``, with the heat capacity from a finite difference; the
+        two-phase flag of a mixture is always False, condensed water is
+        accounted for in the enthalpy and entropy of :meth:`h_s_pT`. A
+        ValueError is raised if the iteration does not converge within 50
+        steps.
+        """
+        if self.pure:
+            state = self.states[0]
+            state.update(CP.HmassP_INPUTS, h, p)
+            return state.T(), state.smass(), state.phase() == CP.iphase_twophase
+        # Newton iteration on the mixture enthalpy with a finite difference heat capacity
+        T = T_guess
+        for _ in range(50):
+            h_T, s_T = self.h_s_pT(p, T)
+            cp = (self.h_s_pT(p, T + 1e-3)[0] - h_T) / 1e-3
+            step = (h - h_T) / cp
+            T += step
+            if abs(step) < 1e-8 * T:
+                return T, self.h_s_pT(p, T)[1], False
+        raise ValueError(f"The temperature of the mixture at p={p} Pa and h={h} J/kg did not converge.")
+
+
+def _fluid(composition, backend, mixing_rule):
+    """Get the cached fluid of a composition."""
+    if mixing_rule not in MIXING_RULES:
+        raise ValueError(f"Unknown mixing rule '{mixing_rule}', use one of {', '.join(MIXING_RULES)}.")
+    key = (tuple(sorted((name, float(fraction)) for name, fraction in composition.items() if fraction > 0)),)
+    key += (backend, mixing_rule)
+    fluid = fluid_cache.get(key)
+    if fluid is None:
+        fluid = _Fluid(key[0], backend, mixing_rule)
+        fluid_cache.put(key, fluid)
+    return key, fluid
+
+
+def _isobar_state(key, fluid, p, Tamb):
+    """Get the cached specific enthalpy and entropy at the pressure and the ambient temperature."""
+    isobar_key = (key, float(p), float(Tamb))
+    values = isobar_cache.get(isobar_key)
+    if values is None:
+        try:
+            values = fluid.h_s_pT(p, Tamb)
+        except ValueError:
+            if not fluid.pure:
+                raise
+            # The pressure is the saturation pressure at the ambient temperature, where the free enthalpy
+            # h - Tamb * s of both phases is equal
+            state = fluid.states[0]
+            state.update(CP.QT_INPUTS, 0, Tamb)
+            values = state.hmass(), state.smass()
+        isobar_cache.put(isobar_key, values)
+    return values
+
+
+def physical_exergy(
+    p, Tamb, pamb, composition, h=None, T=None, x=None, backend="HEOS", mixing_rule="ideal-cond", s=None
+):
+    r"""
+    Calculate the specific thermal and mechanical exergy of a stream.
+
+    The physical exergy is split at the ambient temperature and the pressure
+    of the stream :cite:`morosuk2019splitting`:
+
+    .. math::
+
+        e^\mathrm{T} = h - h\left(p, T_0\right) - T_0 \cdot \left(s - s\left(p, T_0\right)\right)
+
+        e^\mathrm{M} = h\left(p, T_0\right) - h_0 - T_0 \cdot \left(s\left(p, T_0\right) - s_0\right)
+
+    The dead state :math:`h_0, s_0` of every composition and reference
+    environment and the values on the ambient temperature isobar of every
+    pressure are calculated once and kept in bounded least recently used
+    caches, see :func:`cache_info`. Pure fluids
+    are evaluated as real fluids with CoolProp's low-level interface, mixtures
+    as ideal mixtures of the pure components at their partial pressures.
+
+    Parameters
+    ----------
+    p : float
+        Pressure in Pa.
+    Tamb : float
+        Ambient temperature in K.
+    pamb : float
+        Ambient pressure in Pa.
+    composition : dict
+        Mass fractions of the fluids, e.g. ``{"N2": 0.77, "O2": 0.23}``. Fluids
+        unknown to CoolProp are skipped.
+    h : float, optional
+        Specific enthalpy in J/kg on the reference of the CoolProp backend.
+    T : float, optional
+        Temperature in K, used if the enthalpy is not given.
+    x : float, optional
+        Vapor quality of a pure fluid, used with the pressure instead of the
+        temperature if the enthalpy is not given and the stream is wet or its
+        temperature lies within 0.01 K of the saturation temperature. Such
+        states require the vapor quality or the enthalpy.
+    backend : str, optional
+        CoolProp backend, by default "HEOS".
+    mixing_rule : str, optional
+        Mixing rule of mixtures, "ideal" or "ideal-cond" (condensation of
+        water), by default "ideal-cond".
+    s : float, optional
+        Specific entropy in J/kgK of the state given by the enthalpy, e.g.
+        from a simulator using the same CoolProp backend. The entropy is then
+        not recalculated from pressure and enthalpy.
+
+    Returns
+    -------
+    tuple
+        Specific thermal and mechanical exergy in J/kg.
+
+    Raises
+    ------
+    ValueError
+        If neither the enthalpy, the temperature nor the vapor quality is
+        given, if a saturated state lacks the vapor quality, if no fluid of the
+        composition is known to CoolProp or if the mixing rule is unknown.
+
+    Examples
+    --------
+    >>> from exerpy.physical_exergy import physical_exergy
+    >>> e_T, e_M = physical_exergy(10e5, 298.15, 101325, {"water": 1.0}, T=298.15)
+    >>> round(e_T, 6), round(e_M, 1)
+    (0.0, 901.2)
+    """
+    if h is None and T is None and x is None:
+        raise ValueError(
+            "The enthalpy, the temperature or the vapor quality of the stream is required for the physical exergy."
+        )
+    key, fluid = _fluid(composition, backend, mixing_rule)
+    dead_key = (key, float(Tamb), float(pamb))
+    dead_state = dead_state_cache.get(dead_key)
+    if dead_state is None:
+        dead_state = fluid.h_s_pT(pamb, Tamb)
+        dead_state_cache.put(dead_key, dead_state)
+    h0, s0 = dead_state
+
+    if h is not None and s is not None:
+        two_phase = False
+    elif h is None and fluid.saturated(p, T, x):
+        T, h, s = fluid.T_h_s_pQ(p, x)
+        two_phase = 0 < x < 1
+    elif h is None:
+        if T is None:
+            raise ValueError(f"The vapor quality {x} does not define the state of the stream without the temperature.")
+        h, s = fluid.h_s_pT(p, T)
+        two_phase = False
+    else:
+        T, s, two_phase = fluid.T_s_ph(p, h, Tamb if T is None else T)
+    if two_phase and round(T, 6) == round(Tamb, 6):
+        # Wet stream at ambient temperature: the isobar at the ambient temperature lies in the two-phase region
+        return 0.0, (h - h0) - Tamb * (s - s0)
+
+    h_T0_p, s_T0_p = _isobar_state(key, fluid, p, Tamb)
+    e_T = (h - h_T0_p) - Tamb * (s - s_T0_p)
+    e_M = (h_T0_p - h0) - Tamb * (s_T0_p - s0)
+    return e_T, e_M
+
+
+def cache_size():
+    """
+    Get the number of cached values.
+
+    Returns
+    -------
+    dict
+        Number of cached fluids, dead states and ambient temperature isobar values.
+    """
+    return {"fluids": len(fluid_cache), "dead_states": len(dead_state_cache), "isobars": len(isobar_cache)}
+
+
+def cache_info():
+    """
+    Get the statistics of the physical exergy caches.
+
+    Returns
+    -------
+    dict
+        Cache statistics of the fluids, the dead states and the ambient
+        temperature isobar values.
+    """
+    return {"fluids": fluid_cache.info(), "dead_states": dead_state_cache.info(), "isobars": isobar_cache.info()}
+
+
+def clear_cache():
+    """Remove all cached fluids and states and reset the cache statistics."""
+    _abstract_states.clear()
+    fluid_cache.clear()
+    dead_state_cache.clear()
+    isobar_cache.clear()
@@ -0,0 +1,224 @@
+import logging
+from collections import OrderedDict, namedtuple
+
+import CoolProp.CoolProp as CP
+
+CacheInfo = namedtuple("CacheInfo", ["hits", "misses", "maxsize", "currsize"])
+
+
+class CompositionCache:
+    r"""
+    Bounded least recently used cache for property results, e.g. of compositions or ambient states.
+
+    Parameters
+    ----------
+    maxsize : int, optional
+        Maximum number of cached results, the least recently used result is
+        dropped when the cache is full.
+
+    Examples
+    --------
+    >>> from exerpy.properties import CompositionCache
+    >>> cache = CompositionCache(maxsize=2)
+    >>> cache.get("a") is None
+    True
+    >>> cache.put("a", 1.0)
+    >>> cache.get("a")
+    1.0
+    >>> cache.info()
+    CacheInfo(hits=1, misses=1, maxsize=2, currsize=1)
+    """
+
+    def __init__(self, maxsize=1024):
+        if maxsize < 1:
+            raise ValueError(f"The cache size must be at least 1, got {maxsize}.")
+        self.maxsize = maxsize
+        self.hits = 0
+        self.misses = 0
+        self._data = OrderedDict()
+
+    def __len__(self):
+        return len(self._data)
+
+    def get(self, key):
+        """
+        Get a cached result.
+
+        Parameters
+        ----------
+        key : hashable
+            Key of the result.
+
+        Returns
+        -------
+        object
+            The cached result or None if the key is not cached.
+        """
+        value = self._data.get(key)
+        if value is None:
+            self.misses += 1
+            return None
+        self._data.move_to_end(key)
+        self.hits += 1
+        return value
+
+    def put(self, key, value):
+        """
+        Store a result.
+
+        Parameters
+        ----------
+        key : hashable
+            Key of the result.
+        value : object
+            The result, must not be None.
+        """
+        self._data[key] = value
+        self._data.move_to_end(key)
+        while len(self._data) > self.maxsize:
+            self._data.popitem(last=False)
+
+    def resize(self, maxsize):
+        """
+        Change the maximum number of cached results.
+
+        Parameters
+        ----------
+        maxsize : int
+            New maximum number of cached results.
+        """
+        if maxsize < 1:
+            raise ValueError(f"The cache size must be at least 1, got {maxsize}.")
+        self.maxsize = maxsize
+        while len(self._data) > self.maxsize:
+            self._data.popitem(last=False)
+
+    def info(self):
+        """
+        Get the cache statistics.
+
+        Returns
+        -------
+        CacheInfo
+            Number of hits and misses, maximum and current size.
+        """
+        return CacheInfo(self.hits, self.misses, self.maxsize, len(self._data))
+
+    def clear(self):
+        """Remove all cached results and reset the statistics."""
+        self._data.clear()
+        self.hits = 0
+        self.misses = 0
+
+
+_molar_masses = {}
+
+#: Saturation pressure of water at ambient temperatures.
+saturation_pressure_cache = CompositionCache(maxsize=1024)
+
+
+def molar_mass(fluid):
+    """
+    Get the molar mass of a fluid.
+
+    The value is read from CoolProp on the first request and cached for the
+    whole process.
+
+    Parameters
+    ----------
+    fluid : str
+        CoolProp name or alias of the fluid.
+
+    Returns
+    -------
+    float
+        Molar mass in kg/mol.
+
+    Examples
+    --------
+    >>> from exerpy.properties import molar_mass
+    >>> round(molar_mass("N2"), 6)
+    0.028013
+    """
+    value = _molar_masses.get(fluid)
+    if value is None:
+        value = CP.PropsSI("M", fluid)
+        _molar_masses[fluid] = value
+    return value
+
+
+def water_saturation_pressure(T):
+    """
+    Get the saturation pressure of water.
+
+    The value is read from CoolProp on the first request and kept in a
+    bounded least recently used cache, see :func:`cache_info`.
+
+    Parameters
+    ----------
+    T : float
+        Temperature in K.
+
+    Returns
+    -------
+    float
+        Saturation pressure in Pa.
+    """
+    T = float(T)
+    value = saturation_pressure_cache.get(T)
+    if value is None:
+        value = CP.PropsSI("P", "T", T, "Q", 1, "Water")
+        saturation_pressure_cache.put(T, value)
+    return value
+
+
+def preload(species=(), Tamb=None):
+    """
+    Fill the property cache before a calculation.
+
+    Parameters
+    ----------
+    species : iterable of str, optional
+        Fluids to read the molar mass of. Fluids unknown to CoolProp are
+        skipped with a warning.
+    Tamb : float or iterable of float, optional
+        Ambient temperatures in K to read the saturation pressure of water at.
+    """
+    for fluid in species:
+        try:
+            molar_mass(fluid)
+        except Exception:
+            logging.warning(f"Could not retrieve the molar mass of {fluid}.")
+    if Tamb is not None:
+        for T in [Tamb] if isinstance(Tamb, int | float) else Tamb:
+            water_saturation_pressure(T)
+
+
+def cache_size():
+    """
+    Get the number of cached values.
+
+    Returns
+    -------
+    dict
+        Number of cached molar masses and saturation pressures.
+    """
+    return {"molar_mass": len(_molar_masses), "saturation_pressure": len(saturation_pressure_cache)}
+
+
+def cache_info():
+    """
+    Get the statistics of the saturation pressure cache.
+
+    Returns
+    -------
+    dict
+        Cache statistics of the saturation pressures.
+    """
+    return {"saturation_pressure": saturation_pressure_cache.info()}
+
+
+def clear_cache():
+    """Remove all cached property values and reset the cache statistics."""
+    _molar_masses.clear()
+    saturation_pressure_cache.clear()
@@ -0,0 +1,490 @@
+import hashlib
+import json
+import logging
+import os
+import time
+
+import CoolProp
+import CoolProp.CoolProp as CP
+import numpy as np
+
+from .physical_exergy import _fluid, physical_exergy
+
+#: Default directory of the persisted property tables.
+TABLE_DIRECTORY = os.path.join(os.path.expanduser("~"), ".exerpy", "tables")
+
+_FORMAT_VERSION = 1
+_tables = {}
+
+
+class PropertyTable:
+    r"""
+    Tabulated entropy of a fluid for the fast physical exergy of many states.
+
+    The table holds the specific enthalpy and entropy of the fluid on
+    isobars equally spaced in :math:`\ln p`, each evaluated at equally spaced
+    temperatures and, for pure fluids below the critical pressure, at the
+    saturated liquid and vapor states or, for mixtures with condensing water,
+    at the dew point. The entropy of a state given by
+    pressure and enthalpy is interpolated with cubic Hermite polynomials in
+    the enthalpy, using the exact slope :math:`\left(\partial s / \partial
+    h\right)_p = 1 / T`, on the isobars around the pressure and between them
+    with Catmull-Rom cubic Hermite polynomials in :math:`\ln p`, whose slopes
+    are the central differences of the neighbouring isobars (one-sided at the
+    borders of the table). The free enthalpy :math:`g = h - T_0 \cdot s` on
+    the ambient temperature isotherm is calculated exactly for every ambient
+    state at the pressures of the isobars, the ambient pressure and the
+    saturation (or dew point) pressure and interpolated with cubic Hermite
+    polynomials in :math:`\ln p`, whose slopes are finite differences of
+    these nodes, taken separately on both sides of the kink at the
+    saturation (or dew point) pressure. The thermal and mechanical exergy
+    then are
+
+    .. math::
+
+        e^\mathrm{T} = h - T_0 \cdot s\left(p, h\right) - g\left(p, T_0\right)
+
+        e^\mathrm{M} = g\left(p, T_0\right) - g\left(p_0, T_0\right)
+
+    Tables are built once per composition with :meth:`build` and persisted
+    with :meth:`save` or, in one step, with :meth:`cached`.
+
+    Parameters
+    ----------
+    composition : dict
+        Mass fractions of the fluids.
+    backend : str
+        CoolProp backend the table was built with.
+    mixing_rule : str
+        Mixing rule of mixtures.
+    log_p : numpy.ndarray
+        Natural logarithm of the pressures of the isobars in Pa.
+    row_start : numpy.ndarray
+        Index of the first node of every isobar and the total number of nodes.
+    T, h, s : numpy.ndarray
+        Temperature in K, specific enthalpy in J/kg and specific entropy in
+        J/kgK of the nodes, ordered by isobar and enthalpy.
+
+    Notes
+    -----
+    The accuracy was validated with :meth:`validate` against the HEOS backend
+    on the states of the TESPy example plants and 50 random variations of
+    each state by up to 30 % in pressure and 20 kJ/kg in enthalpy. With the
+    default resolution of 400 isobars between 1 kPa and 100 MPa and 300
+    temperatures per isobar, the thermal exergy of pure fluids deviates by
+    less than 0.7 J/kg (largest in the two-phase region of water at high
+    pressure) and the mechanical exergy by less than 0.003 J/kg. Both shares
+    of the flue gas and air mixtures deviate by less than 0.1 J/kg. A state
+    takes about 1 µs to evaluate, compared to 30 µs to 1 ms for the exact
+    calculation. Building the table takes 1 to 3 s for pure fluids and about
+    8 s for mixtures of four fluids. States outside of the table are
+    evaluated with :func:`exerpy.physical_exergy.physical_exergy`.
+
+    Examples
+    --------
+    >>> from exerpy.property_table import PropertyTable
+    >>> table = PropertyTable.build({"water": 1.0}, p_range=(1e4, 1e6), n_p=50, n_T=60)
+    >>> e_T, e_M = table.physical_exergy([5e5, 1e5], [2.8e6, 4e5], 298.15, 101325)
+    >>> e_T.shape
+    (2,)
+    """
+
+    def __init__(self, composition, backend, mixing_rule, log_p, row_start, T, h, s):
+        self.composition = dict(composition)
+        self.backend = backend
+        self.mixing_rule = mixing_rule
+        self.log_p = np.asarray(log_p, dtype=float)
+        self.row_start = np.asarray(row_start, dtype=np.int64)
+        self.T = np.asarray(T, dtype=float)
+        self.h = np.asarray(h, dtype=float)
+        self.s = np.asarray(s, dtype=float)
+        self.fluid = _fluid(self.composition, backend, mixing_rule)[1]
+        # Nodes of all isobars in one sorted array: isobar index times the enthalpy span plus the enthalpy
+        self._h_min = self.h.min()
+        self._h_span = self.h.max() - self._h_min + 1.0
+        rows = np.repeat(np.arange(len(self.log_p)), np.diff(self.row_start))
+        self._keys = rows * self._h_span + (self.h - self._h_min)
+        self._isotherms = {}
+
+    @classmethod
+    def build(
+        cls, composition, p_range=(1e3, 1e8), T_range=None, n_p=400, n_T=300, backend="HEOS", mixing_rule="ideal-cond"
+    ):
+        """
+        Build the table of a composition.
+
+        Parameters
+        ----------
+        composition : dict
+            Mass fractions of the fluids.
+        p_range : tuple, optional
+            Minimum and maximum pressure in Pa, by default 1 kPa to 100 MPa,
+            limited to the maximum pressure of the fluids.
+        T_range : tuple, optional
+            Minimum and maximum temperature in K, by default the range of
+            validity of all fluids.
+        n_p : int, optional
+            Number of isobars, by default 400.
+        n_T : int, optional
+            Number of temperatures per isobar, by default 300.
+        backend : str, optional
+            CoolProp backend, by default "HEOS".
+        mixing_rule : str, optional
+            Mixing rule of mixtures, by default "ideal-cond".
+
+        Returns
+        -------
+        PropertyTable
+            Table of the composition.
+        """
+        fluid = _fluid(composition, backend, mixing_rule)[1]
+        if T_range is None:
+            T_range = (max(state.Tmin() for state in fluid.states), min(state.Tmax() for state in fluid.states))
+        p_max = min(p_range[1], min(state.pmax() for state in fluid.states))
+        if p_range[0] >= p_max or T_range[0] >= T_range[1]:
+            raise ValueError(f"Empty property table range p={p_range} Pa, T={T_range} K.")
+
+        start = time.perf_counter()
+        log_p = np.linspace(np.log(p_range[0]), np.log(p_max), n_p)
+        T_nodes = np.linspace(T_range[0], T_range[1], n_T)
+        row_start = [0]
+        T_all, h_all, s_all = [], [], []
+        for p in np.exp(log_p):
+            nodes = []
+            T_sat = None
+            if fluid.pure and p < fluid.states[0].p_critical():
+                for quality in (0, 1):
+                    T_sat, h, s = fluid.T_h_s_pQ(p, quality)
+                    nodes.append((T_sat, quality, h, s))
+            elif fluid.water is not None:
+                # Dew point of water, where the heat capacity of the mixture jumps
+                water = fluid.states[fluid.water]
+                p_water = p * fluid.x[fluid.water]
+                if p_water < water.p_critical():
+                    water.update(CP.PQ_INPUTS, p_water, 1)
+                    # Slightly above the dew point, CoolProp rejects the water vapor at saturation pressure
+                    T_dew = water.T() + 1e-3
+                    if T_range[0] < T_dew < T_range[1]:
+                        T_sat = T_dew
+                        nodes.append((T_dew, 0, *fluid.h_s_pT(p, T_dew)))
+            for T in T_nodes:
+                if T_sat is not None and abs(T - T_sat) < 1e-3:
+                    continue
+                try:
+                    h, s = fluid.h_s_pT(p, T)
+                except ValueError:
+                    continue
+                nodes.append((T, 0, h, s))
+            nodes.sort()
+            T_all += [node[0] for node in nodes]
+            h_all += [node[2] for node in nodes]
+            s_all += [node[3] for node in nodes]
+            row_start.append(len(h_all))
+
+        table = cls(_fluid_composition(fluid), backend, mixing_rule, log_p, row_start, T_all, h_all, s_all)
+        logging.info(
+            f"Built the property table of {table.composition} with {len(h_all)} nodes in "
+            f"{time.perf_counter() - start:.1f} s."
+        )
+        return table
+
+    @classmethod
+    def load(cls, path):
+        """
+        Load a table saved with :meth:`save`.
+
+        Parameters
+        ----------
+        path : str
+            Path of the table file.
+
+        Returns
+        -------
+        PropertyTable
+            Loaded table.
+        """
+        with np.load(path, allow_pickle=False) as data:
+            meta = json.loads(str(data["meta"]))
+            if meta["format"] != _FORMAT_VERSION:
+                raise ValueError(f"The property table {path} has the unsupported format {meta['format']}.")
+            if meta["coolprop"] != CoolProp.__version__:
+                logging.warning(
+                    f"The property table {path} was built with CoolProp {meta['coolprop']}, "
+                    f"the installed version is {CoolProp.__version__}."
+                )
+            arrays = {key: data[key] for key in ("log_p", "row_start", "T", "h", "s")}
+        return cls(dict(meta["composition"]), meta["backend"], meta["mixing_rule"], **arrays)
+
+    def save(self, path):
+        """
+        Save the table to a compressed NumPy file.
+
+        Parameters
+        ----------
+        path : str
+            Path of the table file.
+        """
+        meta = {
+            "format": _FORMAT_VERSION,
+            "coolprop": CoolProp.__version__,
+            "composition": sorted(self.composition.items()),
+            "backend": self.backend,
+            "mixing_rule": self.mixing_rule,
+        }
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        with open(path, "wb") as f:
+            np.savez_compressed(
+                f, meta=json.dumps(meta), log_p=self.log_p, row_start=self.row_start, T=self.T, h=self.h, s=self.s
+            )
+
+    @classmethod
+    def cached(cls, composition, directory=None, **kwargs):
+        """
+        Get the table of a composition, built on the first request only.
+
+        The table is loaded from the directory if it was saved before,
+        otherwise it is built and saved there. Loaded tables are kept for the
+        whole process.
+
+        Parameters
+        ----------
+        composition : dict
+            Mass fractions of the fluids.
+        directory : str, optional
+            Directory of the table files, by default :data:`TABLE_DIRECTORY`,
+            i.e. ``.exerpy/tables`` in the home directory of the user. The
+            directory is created if it does not exist.
+        **kwargs
+            Resolution and fluid settings passed to :meth:`build`.
+
+        Returns
+        -------
+        PropertyTable
+            Table of the composition.
+        """
+        directory = TABLE_DIRECTORY if directory is None else directory
+        settings = {key: kwargs[key] for key in sorted(kwargs)}
+        key = json.dumps([sorted((name, float(w)) for name, w in composition.items() if w > 0), settings])
+        path = os.path.join(directory, hashlib.sha1(key.encode()).hexdigest()[:16] + ".npz")
+        table = _tables.get(path)
+        if table is None:
+            if os.path.isfile(path):
+                table = cls.load(path)
+            else:
+                table = cls.build(composition, **kwargs)
+                table.save(path)
+            _tables[path] = table
+        return table
+
+    def entropy(self, p, h):
+        """
+        Interpolate the specific entropy.
+
+        Parameters
+        ----------
+        p : array_like
+            Pressure in Pa.
+        h : array_like
+            Specific enthalpy in J/kg.
+
+        Returns
+        -------
+        numpy.ndarray
+            Specific entropy in J/kgK, NaN for states outside of the table.
+        """
+        log_p, h = np.broadcast_arrays(np.log(np.asarray(p, dtype=float)), np.asarray(h, dtype=float))
+        n = len(self.log_p)
+        i = np.clip(np.searchsorted(self.log_p, log_p, side="right") - 1, 0, n - 2)
+        dx = self.log_p[1] - self.log_p[0]
+        t = (log_p - self.log_p[i]) / dx
+        inside = (t >= 0) & (t <= 1)
+        # Catmull-Rom slopes from the neighbouring isobars, one-sided at the borders of the table
+        s_0, s_1 = self._isobar_entropy(i, h), self._isobar_entropy(i + 1, h)
+        s_below = self._isobar_entropy(np.maximum(i - 1, 0), h)
+        s_above = self._isobar_entropy(np.minimum(i + 2, n - 1), h)
+        m_0 = np.where((i > 0) & np.isfinite(s_below), (s_1 - s_below) / 2, s_1 - s_0)
+        m_1 = np.where((i < n - 2) & np.isfinite(s_above), (s_above - s_0) / 2, s_1 - s_0)
+        return np.where(inside, _hermite(t, 1.0, s_0, s_1, m_0, m_1), np.nan)
+
+    def _isobar_entropy(self, row, h):
+        """Interpolate the specific entropy on the isobars with cubic Hermite polynomials."""
+        first, last = self.row_start[row], self.row_start[row + 1] - 1
+        j = np.searchsorted(self._keys, row * self._h_span + (h - self._h_min), side="right") - 1
+        j = np.clip(j, first, np.maximum(last - 1, first))
+        inside = (last > first) & (h >= self.h[first]) & (h <= self.h[last])
+        k = np.minimum(j + 1, len(self.h) - 1)
+        dh = self.h[k] - self.h[j]
+        t = np.where(dh > 0, (h - self.h[j]) / np.where(dh > 0, dh, 1.0), 0.0)
+        s = _hermite(t, dh, self.s[j], self.s[k], 1 / self.T[j], 1 / self.T[k])
+        return np.where(inside, s, np.nan)
+
+    def _gibbs_function(self, Tamb, pamb):
+        """Get the free enthalpy on the ambient temperature isotherm at the nodes and its slopes in ln p."""
+        key = (float(Tamb), float(pamb))
+        values = self._isotherms.get(key)
+        if values is not None:
+            return values
+
+        fluid = self.fluid
+        pressures = set(np.exp(self.log_p)) | {float(pamb)}
+        gibbs = {}
+        kink = None
+        if fluid.pure:
+            state = fluid.states[0]
+            if Tamb < state.T_critical():
+                state.update(CP.QT_INPUTS, 0, Tamb)
+                kink = state.p()
+                gibbs[kink] = state.hmass() - Tamb * state.smass()
+        elif fluid.water is not None:
+            water = fluid.states[fluid.water]
+            if Tamb < water.T_critical():
+                water.update(CP.QT_INPUTS, 1, Tamb)
+                kink = water.p() / fluid.x[fluid.water]
+                pressures.add(kink)
+
+        for p in pressures:
+            if p in gibbs:
+                continue
+            try:
+                h, s = fluid.h_s_pT(p, Tamb)
+            except ValueError:
+                continue
+            gibbs[p] = h - Tamb * s
+        if float(pamb) not in gibbs:
+            # At the saturation pressure both phases have the free enthalpy of the kink
+            if kink is None or not np.isclose(pamb, kink, rtol=1e-9) or kink not in gibbs:
+                raise ValueError(
+                    f"The free enthalpy of {self.composition} cannot be calculated at the ambient state "
+                    f"T={Tamb} K, p={pamb} Pa."
+                )
+            gibbs[float(pamb)] = gibbs[kink]
+        p_nodes = np.array(sorted(gibbs))
+        log_p = np.log(p_nodes)
+        g = np.array([gibbs[p] for p in p_nodes])
+
+        # Slopes from finite differences on both sides of the kink at the saturation or dew point pressure
+        split = len(p_nodes) if kink is None else int(np.searchsorted(p_nodes, kink)) + 1
+        slope_start, slope_end = np.empty(len(g) - 1), np.empty(len(g) - 1)
+        for segment in (slice(0, split), slice(max(split - 1, 0), len(g))):
+            x, y = log_p[segment], g[segment]
+            if len(x) < 2:
+                continue
+            slopes = np.gradient(y, x, edge_order=2) if len(x) > 2 else np.full(2, (y[1] - y[0]) / (x[1] - x[0]))
+            start = segment.start
+            slope_start[start : start + len(x) - 1] = slopes[:-1]
+            slope_end[start : start + len(x) - 1] = slopes[1:]
+        values = log_p, g, slope_start, slope_end, gibbs[float(pamb)]
+        self._isotherms[key] = values
+        return values
+
+    def _gibbs(self, log_p, Tamb, pamb):
+        """Interpolate the free enthalpy on the ambient temperature isotherm, NaN outside of the nodes."""
+        nodes, g, slope_start, slope_end, g_0 = self._gibbs_function(Tamb, pamb)
+        j = np.clip(np.searchsorted(nodes, log_p, side="right") - 1, 0, len(nodes) - 2)
+        dx = nodes[j + 1] - nodes[j]
+        t = (log_p - nodes[j]) / dx
+        inside = (t >= 0) & (t <= 1)
+        return np.where(inside, _hermite(t, dx, g[j], g[j + 1], slope_start[j], slope_end[j]), np.nan), g_0
+
+    def physical_exergy(self, p, h, Tamb, pamb):
+        """
+        Calculate the specific thermal and mechanical exergy of many states.
+
+        Parameters
+        ----------
+        p : array_like
+            Pressure in Pa.
+        h : array_like
+            Specific enthalpy in J/kg on the reference of the CoolProp backend.
+        Tamb : float
+            Ambient temperature in K.
+        pamb : float
+            Ambient pressure in Pa.
+
+        Returns
+        -------
+        tuple
+            Arrays of the specific thermal and mechanical exergy in J/kg.
+
+        Raises
+        ------
+        ValueError
+            If the free enthalpy of the fluid cannot be calculated at the ambient state.
+        """
+        p, h = np.broadcast_arrays(np.asarray(p, dtype=float), np.asarray(h, dtype=float))
+        shape = p.shape
+        p, h = p.ravel(), h.ravel()
+        g, gibbs_0 = self._gibbs(np.log(p), Tamb, pamb)
+        e_T = h - Tamb * self.entropy(p, h) - g
+        e_M = g - gibbs_0
+
+        outside = np.flatnonzero(np.isnan(e_T) | np.isnan(e_M))
+        if len(outside):
+            logging.info(f"{len(outside)} states are outside of the property table and are evaluated exactly.")
+            for k in outside:
+                e_T[k], e_M[k] = physical_exergy(
+                    p[k], Tamb, pamb, self.composition, h=h[k], backend=self.backend, mixing_rule=self.mixing_rule
+                )
+        return e_T.reshape(shape), e_M.reshape(shape)
+
+    def validate(self, p, h, Tamb, pamb):
+        """
+        Compare the table against the exact calculation.
+
+        Parameters
+        ----------
+        p : array_like
+            Pressure in Pa.
+        h : array_like
+            Specific enthalpy in J/kg.
+        Tamb : float
+            Ambient temperature in K.
+        pamb : float
+            Ambient pressure in Pa.
+
+        Returns
+        -------
+        dict
+            Maximum absolute deviation of the thermal and mechanical exergy in
+            J/kg and the time per state of both calculations in s.
+        """
+        p, h = np.broadcast_arrays(np.asarray(p, dtype=float).ravel(), np.asarray(h, dtype=float).ravel())
+        self._gibbs_function(Tamb, pamb)
+        start = time.perf_counter()
+        e_T, e_M = self.physical_exergy(p, h, Tamb, pamb)
+        table_time = time.perf_counter() - start
+
+        start = time.perf_counter()
+        exact = np.array(
+            [
+                physical_exergy(
+                    p_i, Tamb, pamb, self.composition, h=h_i, backend=self.backend, mixing_rule=self.mixing_rule
+                )
+                for p_i, h_i in zip(p, h, strict=True)
+            ]
+        )
+        exact_time = time.perf_counter() - start
+        return {
+            "e_T": float(np.max(np.abs(e_T - exact[:, 0]))),
+            "e_M": float(np.max(np.abs(e_M - exact[:, 1]))),
+            "table_time": table_time / len(p),
+            "exact_time": exact_time / len(p),
+        }
+
+
+def _hermite(t, dx, y_0, y_1, m_0, m_1):
+    """Evaluate the cubic Hermite polynomial of an interval at the relative position t."""
+    t2, t3 = t**2, t**3
+    return (2 * t3 - 3 * t2 + 1) * y_0 + (t3 - 2 * t2 + t) * dx * m_0 + (3 * t2 - 2 * t3) * y_1 + (t3 - t2) * dx * m_1
+
+
+def _fluid_composition(fluid):
+    """Get the mass fractions of the known fluids of a fluid."""
+    return {state.fluid_names()[0]: w for state, w in zip(fluid.states, fluid.w, strict=True)}
+
+
+def clear_cache():
+    """Remove all tables loaded in this process."""
+    _tables.clear()
@@ -0,0 +1,335 @@
+import numpy as np
+
+
+class IncidenceMatrix:
+    r"""
+    Signed incidence matrix of components and connections in coordinate format.
+
+    Every connection entering a component is an entry of +1, every connection
+    leaving it an entry of -1. A connection entering and leaving the same
+    component has both entries. The entries are ordered by component, with the
+    outlets of a component before its inlets.
+
+    Parameters
+    ----------
+    rows : numpy.ndarray
+        Component index of each entry.
+    cols : numpy.ndarray
+        Connection index of each entry.
+    data : numpy.ndarray
+        Sign of each entry.
+    shape : tuple
+        Number of components and connections.
+
+    Notes
+    -----
+    A product with a vector of connection values costs
+    :math:`\mathcal{O}(n)` for :math:`n` entries and gives the balance of the
+    values over every component at once.
+    """
+
+    def __init__(self, rows, cols, data, shape):
+        self.rows = np.asarray(rows, dtype=int)
+        self.cols = np.asarray(cols, dtype=int)
+        self.data = np.asarray(data, dtype=float)
+        self.shape = shape
+        self._indptr = np.searchsorted(self.rows, np.arange(shape[0] + 1))
+
+    def __matmul__(self, values):
+        return self.dot(values)
+
+    @property
+    def nnz(self):
+        """Number of entries."""
+        return len(self.data)
+
+    def dot(self, values):
+        """
+        Multiply the matrix with a vector of connection values.
+
+        Parameters
+        ----------
+        values : array-like
+            One value per connection.
+
+        Returns
+        -------
+        numpy.ndarray
+            Sum of the inlet values minus the sum of the outlet values of every component.
+        """
+        values = np.asarray(values, dtype=float)
+        return np.bincount(self.rows, weights=self.data * values[self.cols], minlength=self.shape[0])
+
+    def inlets(self):
+        """
+        Get the matrix of the inlet entries only.
+
+        Returns
+        -------
+        IncidenceMatrix
+            Matrix with the entries of +1.
+        """
+        mask = self.data > 0
+        return IncidenceMatrix(self.rows[mask], self.cols[mask], self.data[mask], self.shape)
+
+    def outlets(self):
+        """
+        Get the matrix of the outlet entries only.
+
+        Returns
+        -------
+        IncidenceMatrix
+            Matrix with the entries of -1.
+        """
+        mask = self.data < 0
+        return IncidenceMatrix(self.rows[mask], self.cols[mask], self.data[mask], self.shape)
+
+    def row(self, index):
+        """
+        Get the entries of a component.
+
+        Parameters
+        ----------
+        index : int
+            Row index of the component.
+
+        Returns
+        -------
+        tuple of numpy.ndarray
+            Connection indices and signs, outlets first.
+        """
+        entries = slice(self._indptr[index], self._indptr[index + 1])
+        return self.cols[entries], self.data[entries]
+
+    def toarray(self):
+        """
+        Get the matrix as dense array.
+
+        Returns
+        -------
+        numpy.ndarray
+            Dense incidence matrix, with zero for a connection entering and leaving the same component.
+        """
+        array = np.zeros(self.shape)
+        np.add.at(array, (self.rows, self.cols), self.data)
+        return array
+
+
+class ConnectionTopology:
+    r"""
+    Index of the plant topology built once from the connection data.
+
+    The index maps every component to the connections entering and leaving
+    it, keeps the connector numbers of each connection and groups the
+    connections by their kind. It stores connection names only, so it can be
+    used with any mapping of connection data (plain dictionaries or the
+    columnar connection store) as long as the connection names do not change.
+
+    Parameters
+    ----------
+    connection_data : dict
+        Connection data of the model, mapping connection names to their data.
+        Each connection must provide ``source_component`` and
+        ``target_component``; the connector indices and ``kind`` are optional.
+
+    Attributes
+    ----------
+    names : list
+        Names of all connections in the order of the connection data.
+
+    Notes
+    -----
+    Building the index costs :math:`\mathcal{O}(n)` for :math:`n` connections.
+    Looking up the inlets or outlets of a component costs
+    :math:`\mathcal{O}(d)` for a component with :math:`d` attached connections,
+    instead of scanning all connections for every component.
+    """
+
+    def __init__(self, connection_data):
+        self.names = []
+        self._inlets = {}
+        self._outlets = {}
+        self._inlet_connectors = {}
+        self._outlet_connectors = {}
+        self._source = {}
+        self._target = {}
+        self._kind = {}
+        self._by_kind = {}
+
+        for name, conn in connection_data.items():
+            self.names.append(name)
+            source = conn.get("source_component")
+            target = conn.get("target_component")
+            kind = conn.get("kind")
+            self._source[name] = source
+            self._target[name] = target
+            self._kind[name] = kind
+            self._by_kind.setdefault(kind, []).append(name)
+
+            if target is not None:
+                self._inlets.setdefault(target, []).append(name)
+                self._inlet_connectors.setdefault(target, {})[conn.get("target_connector")] = name
+            if source is not None:
+                self._outlets.setdefault(source, []).append(name)
+                self._outlet_connectors.setdefault(source, {})[conn.get("source_connector")] = name
+
+    def __contains__(self, name):
+        return name in self._kind
+
+    def __len__(self):
+        return len(self.names)
+
+    def inlets(self, component, kind=None):
+        """
+        Get the names of the connections entering a component.
+
+        Parameters
+        ----------
+        component : str
+            Name of the component.
+        kind : str or iterable of str, optional
+            Only return connections of this kind (e.g. ``"material"``).
+
+        Returns
+        -------
+        list
+            Connection names in the order of the connection data.
+        """
+        return self._filter(self._inlets.get(component, []), kind)
+
+    def outlets(self, component, kind=None):
+        """
+        Get the names of the connections leaving a component.
+
+        Parameters
+        ----------
+        component : str
+            Name of the component.
+        kind : str or iterable of str, optional
+            Only return connections of this kind (e.g. ``"material"``).
+
+        Returns
+        -------
+        list
+            Connection names in the order of the connection data.
+        """
+        return self._filter(self._outlets.get(component, []), kind)
+
+    def inlet_connectors(self, component):
+        """
+        Get the mapping of target connector to connection name for a component.
+
+        Parameters
+        ----------
+        component : str
+            Name of the component.
+
+        Returns
+        -------
+        dict
+            Target connector index mapped to the connection name. If several
+            connections share a connector, the last one in the connection data
+            is kept.
+        """
+        return dict(self._inlet_connectors.get(component, {}))
+
+    def outlet_connectors(self, component):
+        """
+        Get the mapping of source connector to connection name for a component.
+
+        Parameters
+        ----------
+        component : str
+            Name of the component.
+
+        Returns
+        -------
+        dict
+            Source connector index mapped to the connection name. If several
+            connections share a connector, the last one in the connection data
+            is kept.
+        """
+        return dict(self._outlet_connectors.get(component, {}))
+
+    def of_kind(self, kind):
+        """
+        Get the names of all connections of one or several kinds.
+
+        Parameters
+        ----------
+        kind : str or iterable of str
+            Connection kind(s), e.g. ``"material"``, ``"power"`` or ``"heat"``.
+
+        Returns
+        -------
+        list
+            Connection names in the order of the connection data.
+        """
+        if isinstance(kind, str) or kind is None:
+            return list(self._by_kind.get(kind, []))
+        kinds = set(kind)
+        return [name for name in self.names if self._kind[name] in kinds]
+
+    def source(self, name):
+        """Get the source component name of a connection."""
+        return self._source[name]
+
+    def target(self, name):
+        """Get the target component name of a connection."""
+        return self._target[name]
+
+    def kind(self, name):
+        """Get the kind of a connection."""
+        return self._kind[name]
+
+    def attached(self, component):
+        """
+        Get the names of all connections attached to a component.
+
+        Parameters
+        ----------
+        component : str
+            Name of the component.
+
+        Returns
+        -------
+        list
+            Names of inlet connections followed by outlet connections, without
+            duplicates.
+        """
+        names = list(self._inlets.get(component, []))
+        seen = set(names)
+        names += [name for name in self._outlets.get(component, []) if name not in seen]
+        return names
+
+    def incidence_matrix(self, components):
+        """
+        Build the signed incidence matrix of components and connections.
+
+        Parameters
+        ----------
+        components : list of str
+            Names of the components, one row per component in this order.
+
+        Returns
+        -------
+        IncidenceMatrix
+            Incidence matrix with one column per connection in the order of
+            :attr:`names`.
+        """
+        column = {name: i for i, name in enumerate(self.names)}
+        rows, cols, data = [], [], []
+        for row, component in enumerate(components):
+            for names, sign in ((self._outlets.get(component, []), -1), (self._inlets.get(component, []), 1)):
+                rows += [row] * len(names)
+                cols += [column[name] for name in names]
+                data += [sign] * len(names)
+        return IncidenceMatrix(rows, cols, data, (len(components), len(self.names)))
+
+    def _filter(self, names, kind):
+        if kind is None:
+            return list(names)
+        if isinstance(kind, str):
+            return [name for name in names if self._kind[name] == kind]
+        kinds = set(kind)
+        return [name for name in names if self._kind[name] in kinds]
@@ -0,0 +1,271 @@
+import logging
+import warnings
+
+import numpy as np
+import pandas as pd
+
+from .components.helpers.cycle_closer import CycleCloser
+from .components.helpers.power_bus import PowerBus
+
+DISTRIBUTIONS = ("normal", "uniform", "triangular", "lognormal")
+
+
+class CostUncertainty:
+    """
+    Propagate uncertain costs through an exergoeconomic analysis by Monte Carlo sampling.
+
+    The investment cost rates of the components and the specific costs of the
+    system inputs are multiplied by random factors. All costs of the
+    exergoeconomic analysis are linear in these inputs: the cost vectors of
+    all samples are stacked into one right-hand side matrix and solved with the
+    factorization of the cost matrix of the nominal analysis. The cost rates of
+    the components are obtained from the solution by the linear maps of their
+    exergoeconomic balances.
+
+    If an economic analysis and the purchased equipment costs are provided,
+    the investment cost rates of these components are calculated from the
+    (uncertain) equipment costs with the total revenue requirement method of
+    :class:`exerpy.EconomicAnalysis`.
+
+    Parameters
+    ----------
+    exergoeconomic_analysis : ExergoeconomicAnalysis
+        Exergoeconomic analysis of an analysed exergy analysis.
+    costs : dict
+        Nominal costs in the format of the ``Exe_Eco_Costs`` argument of
+        :meth:`exerpy.ExergoeconomicAnalysis.run`. The investment costs of the
+        components in ``PEC`` are calculated and may be omitted.
+    Tamb : float
+        Ambient temperature in Kelvin.
+    economic_analysis : EconomicAnalysis, optional
+        Economic analysis to calculate the investment cost rates from the
+        purchased equipment costs.
+    PEC : dict, optional
+        Nominal purchased equipment cost of the components in currency.
+    OMC_relative : dict, optional
+        First-year operating and maintenance cost of the components as a
+        fraction of their purchased equipment cost, zero if not provided.
+
+    Attributes
+    ----------
+    Tamb : float
+        Ambient temperature in Kelvin.
+    components : list of str
+        Components the results are calculated for.
+    inputs : list of str
+        Uncertain inputs, named like the keys of ``costs`` and "<component_name>_PEC".
+    samples : dict
+        Samples of the last :meth:`run` with one row per component: the
+        specific cost of the product ``c_P`` in currency/GJ, the cost rate of
+        the exergy destruction ``C_D`` in currency/h and the exergoeconomic
+        factor ``f`` in %.
+    """
+
+    def __init__(self, exergoeconomic_analysis, costs, Tamb, economic_analysis=None, PEC=None, OMC_relative=None):
+        self.analysis = exergoeconomic_analysis
+        self.economic_analysis = economic_analysis
+        self.PEC = dict(PEC or {})
+        if self.PEC and economic_analysis is None:
+            raise ValueError("An economic analysis is required to calculate the investment costs from the PEC.")
+        OMC_relative = OMC_relative or {}
+        self._OMC_relative = np.array([OMC_relative.get(name, 0.0) for name in self.PEC], dtype=float)
+
+        self._costs = dict(costs)
+        self.Tamb = Tamb
+        self._prepare()
+        self.samples = {}
+
+    def _prepare(self):
+        """
+        Run the nominal analysis and set up the linear maps of the costs.
+
+        The cost matrix is factorized for the current exergy state of the
+        analysis. The revision of the exergy analysis is stored, so that
+        :meth:`run` can detect a changed exergy state.
+        """
+        analysis = self.analysis
+        costs = dict(self._costs)
+        if self.PEC:
+            Z = self._investment_cost_rates(np.array(list(self.PEC.values()), dtype=float)[:, None])
+            costs.update({f"{name}_Z": float(z) for name, z in zip(self.PEC, Z[:, 0], strict=True)})
+        analysis.run(costs, self.Tamb)
+        self._revision = analysis.exergy_analysis._revision
+
+        z_inputs, c_inputs, self._db = analysis._cost_vector_derivative()
+        self._factorization = analysis._factorization
+        self.components = [
+            name
+            for name in z_inputs
+            if not isinstance(analysis.components[name], CycleCloser | PowerBus)
+            and hasattr(analysis.components[name], "exergoeconomic_balance")
+        ]
+        self.inputs = [f"{name}_Z" for name in z_inputs] + [f"{name}_c" for name in c_inputs]
+        self.inputs += [f"{name}_PEC" for name in self.PEC]
+        # Nominal inputs in currency/s and currency/J, the same vector the analysis solved
+        self._nominal = analysis._cost_inputs(costs, z_inputs, c_inputs)
+        self._z_rows = {name: i for i, name in enumerate(z_inputs)}
+        self._component_rows = np.array([self._z_rows[name] for name in self.components], dtype=int)
+
+        # Linear maps of the fuel, product and destruction cost rates of the components
+        properties = ("C_F", "C_P", "C_D")
+        self._weights = np.zeros((len(properties), len(self.components), analysis.num_variables))
+        self._z_weights = np.zeros((len(properties), len(self.components)))
+        snapshot = analysis.connections.snapshot()
+        for i, name in enumerate(self.components):
+            weights, z_weights = analysis._component_cost_map(analysis.components[name], properties)
+            self._weights[:, i, :] = weights
+            self._z_weights[:, i] = z_weights
+        analysis.connections.restore(snapshot)
+        self._E_P = np.array(
+            [getattr(analysis.components[name], "E_P", np.nan) for name in self.components], dtype=float
+        )
+
+    def _investment_cost_rates(self, PEC):
+        """
+        Calculate the investment cost rates from the purchased equipment costs.
+
+        Parameters
+        ----------
+        PEC : numpy.ndarray
+            Purchased equipment costs with one row per component and one column per sample.
+
+        Returns
+        -------
+        numpy.ndarray
+            Total cost rates in currency/h of the same shape as ``PEC``.
+        """
+        _, _, Z_total = self.economic_analysis.compute_component_costs(PEC.T, self._OMC_relative)
+        return Z_total.T
+
+    def sample_inputs(self, uncertainties, n_samples, seed=None):
+        """
+        Draw samples of the uncertain inputs.
+
+        Parameters
+        ----------
+        uncertainties : dict
+            Distribution of the factor applied to the nominal value of each
+            uncertain input. The keys are inputs, the values tuples of the name
+            of a distribution of :class:`numpy.random.Generator` (``"normal"``,
+            ``"uniform"``, ``"triangular"`` or ``"lognormal"``) and its
+            parameters, e.g. ``{"E1_c": ("normal", 1.0, 0.1)}``.
+        n_samples : int
+            Number of samples.
+        seed : int or numpy.random.Generator, optional
+            Seed of the random number generator.
+
+        Returns
+        -------
+        tuple
+            Investment cost rates and specific costs in currency/s and currency/J
+            with one column per sample, and dictionary of the sampled factors of
+            the uncertain inputs.
+
+        Raises
+        ------
+        ValueError
+            If an input or a distribution is unknown.
+        """
+        rng = np.random.default_rng(seed)
+        factors = {}
+        for key, (distribution, *parameters) in uncertainties.items():
+            if key not in self.inputs:
+                raise ValueError(f"Unknown uncertain input '{key}', available inputs are: {', '.join(self.inputs)}.")
+            if distribution not in DISTRIBUTIONS:
+                raise ValueError(f"Unknown distribution '{distribution}', use one of {', '.join(DISTRIBUTIONS)}.")
+            factors[key] = getattr(rng, distribution)(*parameters, size=n_samples)
+
+        inputs = np.repeat(self._nominal[:, None], n_samples, axis=1)
+        for i, key in enumerate(self.inputs[: len(self._nominal)]):
+            if key in factors:
+                inputs[i] *= factors[key]
+        if self.PEC:
+            PEC = np.array(
+                [value * factors.get(f"{name}_PEC", 1.0) * np.ones(n_samples) for name, value in self.PEC.items()]
+            )
+            rows = [self._z_rows[name] for name in self.PEC]
+            inputs[rows] = self._investment_cost_rates(PEC) / 3600
+        return inputs, factors
+
+    def run(self, uncertainties, n_samples=10000, seed=None, quantiles=(0.05, 0.5, 0.95), chunk_size=10000):
+        """
+        Propagate the uncertainties to the component results.
+
+        If the exergy state of the analysis has changed since the nominal
+        analysis, e.g. by :meth:`exerpy.ExergyAnalysis.update_connections`,
+        the nominal analysis is run again and the cost matrix factorized for
+        the new state before the samples are solved.
+
+        Parameters
+        ----------
+        uncertainties : dict
+            Distribution of the factor applied to the nominal value of each
+            uncertain input, see :meth:`sample_inputs`.
+        n_samples : int, optional
+            Number of samples, by default 10000.
+        seed : int or numpy.random.Generator, optional
+            Seed of the random number generator.
+        quantiles : tuple of float, optional
+            Quantiles of the results, by default (0.05, 0.5, 0.95).
+        chunk_size : int, optional
+            Number of samples solved at once, limiting the memory of the right-hand
+            side matrix, by default 10000.
+
+        Returns
+        -------
+        pandas.DataFrame
+            Quantiles of the component results, see :meth:`quantiles`.
+        """
+        if self.analysis.exergy_analysis._revision != self._revision:
+            logging.info("The exergy state has changed, the nominal cost analysis is run again.")
+            self._prepare()
+        inputs, _ = self.sample_inputs(uncertainties, n_samples, seed)
+        Z = inputs[self._component_rows]
+        C_F, C_P, C_D = (np.empty((len(self.components), n_samples)) for _ in range(3))
+        for start in range(0, n_samples, chunk_size):
+            chunk = slice(start, start + chunk_size)
+            C_solution = self._factorization.solve(self._db @ inputs[:, chunk])
+            for result, weights, z_weights in zip((C_F, C_P, C_D), self._weights, self._z_weights, strict=True):
+                result[:, chunk] = weights @ C_solution + z_weights[:, None] * Z[:, chunk]
+
+        with np.errstate(divide="ignore", invalid="ignore"):
+            self.samples = {
+                "c_P": C_P / self._E_P[:, None] * 1e9,
+                "C_D": C_D * 3600,
+                "f": np.where(Z + C_D != 0, Z / (Z + C_D), np.nan) * 100,
+            }
+        logging.info(f"Cost uncertainty propagated with {n_samples} samples.")
+        return self.quantiles(quantiles)
+
+    def quantiles(self, quantiles=(0.05, 0.5, 0.95)):
+        """
+        Get the quantiles of the component results of the last run.
+
+        Parameters
+        ----------
+        quantiles : tuple of float, optional
+            Quantiles of the results, by default (0.05, 0.5, 0.95).
+
+        Returns
+        -------
+        pandas.DataFrame
+            Quantiles with one row per component and quantile and the columns
+            "c_P [currency/GJ]", "C_D [currency/h]" and "f [%]".
+
+        Raises
+        ------
+        ValueError
+            If the uncertainty has not been propagated yet.
+        """
+        if not self.samples:
+            raise ValueError("No samples available, run the uncertainty propagation first.")
+        currency = self.analysis.currency
+        labels = {"c_P": f"c_P [{currency}/GJ]", "C_D": f"C_D [{currency}/h]", "f": "f [%]"}
+        index = pd.MultiIndex.from_product([self.components, list(quantiles)], names=["Component", "Quantile"])
+        with warnings.catch_warnings():
+            # Results a component does not define are NaN in all samples
+            warnings.simplefilter("ignore", RuntimeWarning)
+            data = {
+                label: np.nanquantile(self.samples[key], quantiles, axis=1).T.ravel() for key, label in labels.items()
+            }
+        return pd.DataFrame(data, index=index)
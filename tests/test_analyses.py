@@ -347,6 +347,113 @@ def test_invalid_connection_reference(exergy_analysis):
         exergy_analysis.analyse(fuel, product)
 
 
+def test_analyse_batch(exergy_analysis, mock_connection_data):
+    """
+    Test that every operating point of a batch is evaluated on top of the original connection data.
+    """
+    fuel = {"inputs": ["1"]}
+    product = {"inputs": ["3"]}
+    states = [
+        {"1": {"E": 60000}},
+        {"3": {"energy_flow": 40000}},
+        {"1": {"m": 50, "e_PH": 900, "e_T": 500, "e_M": 400}},
+    ]
+    results = exergy_analysis.analyse_batch(fuel, product, None, states)
+
+    assert results["components"] == ["T1", "C1"]
+    assert results["E_F"].shape == (3, 2)
+    assert results["E_D"][:, 0].tolist() == [15000, 15000, 15000]
+    assert results["system"]["E_F"].tolist() == [60000, 50000, 45000]
+    assert results["system"]["E_P"].tolist() == [35000, 40000, 35000]
+    assert results["system"]["epsilon"][1] == pytest.approx(0.8)
+    assert results["y"][0, 1] == pytest.approx(10000 / 60000)
+
+    # The batch gives the same results as a separate analysis of the operating point
+    # The constructor takes the exergy flows as given, the physical exergy flow is the total one here
+    mock_connection_data["1"].update(states[2]["1"], E=50 * 900)
+    reference = ExergyAnalysis(exergy_analysis._component_data, mock_connection_data, 298.15, 101325)
+    reference.analyse(fuel, product)
+    assert results["system"]["E_F"][2] == pytest.approx(reference.E_F)
+    assert results["system"]["epsilon"][2] == pytest.approx(reference.epsilon)
+
+
+def test_analyse_batch_invalid_connection(exergy_analysis):
+    """
+    Test that a state referencing a connection that does not exist raises a ValueError.
+    """
+    with pytest.raises(ValueError, match="The connection nonexistent is not part of the plant's connections."):
+        exergy_analysis.analyse_batch({"inputs": ["1"]}, {"inputs": ["3"]}, None, [{"nonexistent": {"m": 1}}])
+
+
+def test_analyse_batch_missing_connector(mock_connection_data):
+    """
+    Test that a component with a vectorized kernel and a missing outlet fails like the scalar exergy balance.
+    """
+    component_data = {"Valve": {"V1": {"name": "V1", "type": "Valve"}}}
+    connection_data = {"1": {**mock_connection_data["1"], "target_component": "V1"}}
+    analysis = ExergyAnalysis(component_data, connection_data, 298.15, 101325)
+
+    with pytest.raises(ValueError, match="Valve requires at least one inlet and one outlet."):
+        analysis.analyse({"inputs": ["1"]}, {"inputs": []})
+    with pytest.raises(ValueError, match="Valve requires at least one inlet and one outlet."):
+        analysis.analyse_batch({"inputs": ["1"]}, {"inputs": []}, None, [{}])
+
+
+def test_update_connections(exergy_analysis):
+    """
+    Test that updating a connection re-evaluates only the adjacent components and adjusts the system values.
+    """
+    fuel = {"inputs": ["1"]}
+    product = {"inputs": ["3"]}
+    exergy_analysis.analyse(fuel, product)
+
+    updated = exergy_analysis.update_connections({"1": {"E": 60000}})
+
+    assert updated == ["C1"]
+    assert exergy_analysis.E_F == 60000
+    assert exergy_analysis.E_D == 25000
+    assert exergy_analysis.epsilon == pytest.approx(35000 / 60000)
+    # The system values changed, so y is updated for all components
+    assert exergy_analysis.components["T1"].y == pytest.approx(15000 / 60000)
+    assert exergy_analysis.components["T1"].y_star == pytest.approx(15000 / 25000)
+
+    # Exergy flows without a given value are recalculated from the stream state
+    updated = exergy_analysis.update_connections({"3": {"energy_flow": 40000}})
+    assert updated == ["T1"]
+    assert exergy_analysis.connections["3"]["E"] == 40000
+    assert exergy_analysis.E_P == 40000
+
+
+def test_apply_connection_states(exergy_analysis):
+    """
+    Test that applying connection states recalculates the exergy flows and leaves the balances to analyse.
+    """
+    fuel = {"inputs": ["1"]}
+    product = {"inputs": ["3"]}
+    exergy_analysis.analyse(fuel, product)
+    E_F = exergy_analysis.E_F
+
+    exergy_analysis.apply_connection_states({"1": {"E": 60000}, "3": {"energy_flow": 40000}})
+    assert exergy_analysis.connections["3"]["E"] == 40000
+    assert exergy_analysis.E_F == E_F
+
+    exergy_analysis.analyse(fuel, product)
+    assert exergy_analysis.E_F == 60000
+    assert exergy_analysis.E_P == 40000
+
+
+def test_update_connections_requires_analysis(exergy_analysis):
+    """
+    Test that connections can only be updated after the analysis and only for known connections.
+    """
+    with pytest.raises(RuntimeError, match="must be run with analyse"):
+        exergy_analysis.update_connections({"1": {"E": 60000}})
+
+    exergy_analysis.analyse({"inputs": ["1"]}, {"inputs": ["3"]})
+    with pytest.raises(ValueError, match="The connection nonexistent is not part of the plant's connections."):
+        exergy_analysis.update_connections({"nonexistent": {"m": 1}})
+
+
 def test_cyclecloser_skipped(mock_component_data, mock_connection_data, caplog):
     """
     Test that a CycleCloser component is skipped in the exergy analysis calculations,
@@ -558,6 +665,19 @@ def test_export_to_json(tmp_path, mock_component_data, mock_connection_data):
     assert data["connections"] == mock_connection_data
 
 
+def test_connection_data_cached(exergy_analysis):
+    """
+    Test that the plain connection dictionaries are only rebuilt after the connection data changed.
+    """
+    data = exergy_analysis._connection_data
+    assert exergy_analysis._connection_data is data
+
+    exergy_analysis.connections["1"]["m"] = 12.0
+    updated = exergy_analysis._connection_data
+    assert updated is not data
+    assert updated["1"]["m"] == 12.0
+
+
 def test_from_json_with_chemical_exergy(json_file, monkeypatch):
     """
     Test that when a chemical exergy library is provided, the from_json method adds the
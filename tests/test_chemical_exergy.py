@@ -0,0 +1,118 @@
+"""
+Unit tests for the chemical exergy library.
+
+These tests verify that the library is read once per process, that the
+lookups give the same values as the library file and that streams of the same
+composition share their cached chemical exergy.
+"""
+
+import math
+
+import pytest
+
+from exerpy.chemical_exergy import (
+    ChemicalExergyLibrary,
+    CompositionCache,
+    cache_info,
+    chemical_exergy_cache,
+    clear_caches,
+    composition_key,
+)
+from exerpy.functions import add_chemical_exergy, calc_chemical_exergy
+
+
+def test_library_is_shared():
+    """The library is read once and shared by all chemical exergy calculations."""
+    ChemicalExergyLibrary.clear()
+    library = ChemicalExergyLibrary.load("Ahrendts")
+
+    assert ChemicalExergyLibrary.load("Ahrendts") is library
+    assert ChemicalExergyLibrary.load(library) is library
+
+    data = {
+        "connections": {
+            "1": {"kind": "material", "mass_composition": {"N2": 0.7, "O2": 0.3}},
+            "2": {"kind": "material", "mass_composition": {"CO2": 1.0}},
+        }
+    }
+    add_chemical_exergy(data, 298.15, 101325.0, "Ahrendts")
+    assert ChemicalExergyLibrary._libraries == {"Ahrendts": library}
+    assert data["connections"]["2"]["e_CH"] == pytest.approx(library.exergy("CO2") / library.molar_mass("CO2"))
+
+
+def test_alias_lookup():
+    """All CoolProp aliases of a substance point to the same library entry."""
+    library = ChemicalExergyLibrary.load("Ahrendts")
+
+    assert library.entry("CH4") == library.entry("methane") == library.entry("Methane") == "METHANE"
+    assert library.is_water("H2O")
+    assert library.is_water("Water")
+    assert not library.is_water("N2")
+    assert library.exergy("water", column=2) == library.data["WATER"][2]
+    with pytest.raises(KeyError, match="No matching alias found"):
+        library.entry("R134a")
+
+
+def test_missing_values_are_parsed():
+    """The "NaN" strings of the library file are parsed to floats."""
+    library = ChemicalExergyLibrary.load("Ahrendts")
+
+    assert math.isnan(library.data["ACETONE"][3])
+    with pytest.raises(ValueError, match="No chemical exergy data"):
+        library.exergy("Acetone")
+    # A pure substance without data has no chemical exergy.
+    assert calc_chemical_exergy({"mass_composition": {"Acetone": 1.0}}, 298.15, 101325.0, library) == 0
+
+
+def test_composition_cache():
+    """Streams of the same composition reuse the chemical exergy of the first stream."""
+    clear_caches()
+    air = {"mass_composition": {"N2": 0.77, "O2": 0.23}}
+    scaled_air = {"mass_composition": {"O2": 2.3, "N2": 7.7}}
+
+    first = calc_chemical_exergy(air, 298.15, 101325.0, "Ahrendts")
+    assert calc_chemical_exergy(scaled_air, 298.15, 101325.0, "Ahrendts") == first
+    info = cache_info()
+    assert info["chemical_exergy"].hits == 1
+    assert info["chemical_exergy"].misses == 1
+    assert info["molar_fractions"].currsize == 1
+
+    # A different reference environment is a new entry, the molar fractions are reused.
+    other = calc_chemical_exergy(air, 288.15, 101325.0, "Ahrendts")
+    assert other != first
+    assert cache_info()["molar_fractions"].hits == 1
+
+    # Mass and molar fractions with the same values are different compositions.
+    molar = calc_chemical_exergy({"molar_composition": {"N2": 0.77, "O2": 0.23}}, 298.15, 101325.0, "Ahrendts")
+    assert molar != first
+    assert len(chemical_exergy_cache) == 3
+
+    clear_caches()
+    assert cache_info()["chemical_exergy"] == (0, 0, chemical_exergy_cache.maxsize, 0)
+
+
+def test_cache_independent_of_order():
+    """The cached value is calculated from the normalized composition, not from the first stream."""
+    compositions = [{"N2": 0.79, "O2": 0.21}, {"O2": 0.42, "N2": 1.58}]
+    results = []
+    for order in (compositions, compositions[::-1]):
+        clear_caches()
+        results.append([calc_chemical_exergy({"molar_composition": c}, 298.15, 101325.0, "Ahrendts") for c in order])
+
+    assert results[0][0] == results[0][1] == results[1][0] == results[1][1]
+
+
+def test_cache_is_bounded():
+    """The least recently used entries are dropped when the cache is full."""
+    cache = CompositionCache(maxsize=2)
+    cache.put(composition_key({"N2": 1.0}), 1.0)
+    cache.put(composition_key({"O2": 1.0}), 2.0)
+    assert cache.get(composition_key({"N2": 2.0})) == 1.0
+    cache.put(composition_key({"CO2": 1.0}), 3.0)
+
+    assert cache.get(composition_key({"O2": 1.0})) is None
+    assert cache.get(composition_key({"N2": 1.0})) == 1.0
+    cache.resize(1)
+    assert len(cache) == 1
+    with pytest.raises(ValueError, match="at least 1"):
+        CompositionCache(maxsize=0)
@@ -1344,3 +1344,94 @@ def test_flash_tank_missing_streams_raises(flash_tank):
     flash_tank.outl = {0: {"m": 1, "e_PH": 90, "e_T": 45}}
     with pytest.raises(ValueError, match="Flash tank requires one inlet and two outlets."):
         flash_tank.calc_exergy_balance(T0=300, p0=101325, split_physical_exergy=True)
+
+
+def _kernel_stream(T, m=2.0, h=1e5, e_PH=5e4, e_T=3e4, e_M=2e4, p=5e5):
+    return {"kind": "material", "T": T, "m": m, "h": h, "e_PH": e_PH, "e_T": e_T, "e_M": e_M, "p": p}
+
+
+KERNEL_LAYOUTS = {
+    Compressor: lambda T: ({0: _kernel_stream(T[0], h=1e5)}, {0: _kernel_stream(T[1], h=2e5, e_PH=7e4)}),
+    Pump: lambda T: (
+        {0: _kernel_stream(T[0]), 1: {"kind": "power", "energy_flow": 4e4}},
+        {0: _kernel_stream(T[1], e_PH=6e4, e_M=4e4)},
+    ),
+    Turbine: lambda T: (
+        {0: _kernel_stream(T[0], h=3e5, e_PH=9e4)},
+        {0: _kernel_stream(T[1]), 1: _kernel_stream(T[2], m=0.5), 2: {"kind": "power", "energy_flow": 1e5}},
+    ),
+    Valve: lambda T: ({0: _kernel_stream(T[0], e_PH=6e4, p=1e6)}, {0: _kernel_stream(T[1])}),
+    SimpleHeatExchanger: lambda T: ({0: _kernel_stream(T[0], h=T[2] * 1e3)}, {0: _kernel_stream(T[1], e_T=1e4)}),
+    HeatExchanger: lambda T: (
+        {0: _kernel_stream(T[0], e_PH=9e4), 1: _kernel_stream(T[1], m=3.0)},
+        {0: _kernel_stream(T[2], e_T=1e4), 1: _kernel_stream(T[3], m=3.0, e_PH=7e4)},
+    ),
+    Mixer: lambda T: (
+        {0: _kernel_stream(T[0], m=1.0, e_PH=2e4), 1: _kernel_stream(T[1], m=3.0, e_PH=8e4)},
+        {0: _kernel_stream(T[2], m=4.0)},
+    ),
+}
+
+
+@pytest.mark.parametrize("component_class", list(KERNEL_LAYOUTS))
+@pytest.mark.parametrize("split_physical_exergy", [True, False])
+def test_vectorized_kernel_matches_scalar(component_class, split_physical_exergy):
+    """
+    Test that the vectorized kernel gives the scalar results for temperatures above, below and crossing T0.
+    """
+    T0 = 298.15
+    temperatures = [T0 - 40, T0 - 10, T0, T0 + 10, T0 + 40]
+    grid = np.array(np.meshgrid(*[temperatures] * 4)).reshape(4, -1).T
+
+    components = []
+    for i, T in enumerate(grid):
+        component = component_class(name=f"C{i}", dissipative=i % 5 == 0)
+        component.inl, component.outl = KERNEL_LAYOUTS[component_class](T)
+        components.append(component)
+
+    expected = []
+    for component in components:
+        try:
+            component.calc_exergy_balance(T0, 101325, split_physical_exergy)
+            expected.append([component.E_F, component.E_P, component.E_D, component.epsilon])
+        except (ValueError, AttributeError):
+            # Configurations the scalar method rejects are not compared
+            expected.append(None)
+
+    results = component_class.calc_exergy_balances(components, T0, 101325, split_physical_exergy)
+    for i, values in enumerate(expected):
+        if values is not None:
+            actual = [results[key][i] for key in ("E_F", "E_P", "E_D", "epsilon")]
+            np.testing.assert_allclose(actual, np.array(values, dtype=float), rtol=1e-12, equal_nan=True)
+
+
+def test_vectorized_kernel_operating_points():
+    """
+    Test that a kernel evaluates one instance across several operating points.
+    """
+    T0 = 298.15
+    m = np.array([1.0, 2.0, 3.0])
+    inlet = {"m": m, "T": np.full(3, 320.0), "h": np.full(3, 1e5), "e_PH": np.full(3, 1e4), "e_T": 0.0, "e_M": 0.0}
+    outlet = {"m": m, "T": np.full(3, 400.0), "h": np.full(3, 2e5), "e_PH": np.full(3, 6e4), "e_T": 0.0, "e_M": 0.0}
+
+    results = Compressor.calc_exergy_balance_vectorized({0: inlet}, {0: outlet}, T0, 101325, True)
+
+    np.testing.assert_allclose(results["E_F"], m * 1e5)
+    np.testing.assert_allclose(results["E_P"], m * 5e4)
+    np.testing.assert_allclose(results["epsilon"], 0.5)
+
+
+def test_component_without_kernel():
+    """
+    Test that components without a vectorized kernel are reported as such.
+    """
+    assert Compressor.has_vectorized_kernel()
+    assert not Storage.has_vectorized_kernel()
+    assert not hasattr(Storage, "calc_exergy_balance_vectorized")
+
+    # A child class changing the exergy balance does not inherit the kernel
+    class ElectricCompressor(Compressor):
+        def calc_exergy_balance(self, T0, p0, split_physical_exergy):
+            super().calc_exergy_balance(T0, p0, split_physical_exergy)
+
+    assert not ElectricCompressor.has_vectorized_kernel()
@@ -0,0 +1,191 @@
+"""
+Unit tests for the columnar ConnectionTable.
+
+These tests verify that the connection views behave like the connection dictionaries
+of the parsers and that the column access reads and writes the same data.
+"""
+
+import numpy as np
+import pytest
+
+from exerpy.connections import ConnectionTable
+from exerpy.functions import add_total_exergy_flow
+
+
+@pytest.fixture
+def connection_data():
+    """Create two material connections, a power connection and a heat connection."""
+    return {
+        "1": {
+            "kind": "material",
+            "source_component": None,
+            "target_component": "A",
+            "m": 2,
+            "e_PH": 1000.0,
+            "e_CH": 50.0,
+            "fluid_composition": {"Water": 1.0},
+        },
+        "2": {
+            "kind": "material",
+            "source_component": "A",
+            "target_component": None,
+            "m": 2.0,
+            "e_PH": 400.0,
+            "e_CH": None,
+        },
+        "P1": {"kind": "power", "source_component": "A", "target_component": None, "energy_flow": 300.0},
+        "Q1": {"kind": "heat", "source_component": None, "target_component": None, "E": 10.0},
+    }
+
+
+def test_view_behaves_like_dict(connection_data):
+    """Views return numeric values from the columns and other entries from the row data."""
+    table = ConnectionTable(connection_data)
+
+    conn = table["1"]
+    assert conn["m"] == 2.0
+    assert conn["kind"] == "material"
+    assert conn["fluid_composition"] == {"Water": 1.0}
+    assert conn.get("T") is None
+    assert conn.get("T", 300.0) == 300.0
+    assert "e_CH" in conn
+    assert "T" not in conn
+    assert table["1"] is conn
+    with pytest.raises(KeyError):
+        conn["T"]
+
+
+def test_none_values_are_kept(connection_data):
+    """None values stay None and are not marked as present in the columns."""
+    table = ConnectionTable(connection_data)
+
+    assert "e_CH" in table["2"]
+    assert table["2"]["e_CH"] is None
+    assert table.present("e_CH", ["1", "2"]).tolist() == [True, False]
+    assert np.isnan(table.get_column("e_CH", ["2"])[0])
+
+    table.set_column("e_CH", [10.0], ["2"])
+    assert table["2"]["e_CH"] == 10.0
+
+
+def test_round_trip(connection_data):
+    """Converting to plain dictionaries gives back the original data."""
+    table = ConnectionTable(connection_data)
+
+    assert table.to_dict() == connection_data
+    assert list(table) == ["1", "2", "P1", "Q1"]
+    assert len(table) == 4
+
+
+def test_column_access(connection_data):
+    """Columns and views read and write the same values."""
+    table = ConnectionTable(connection_data)
+
+    table["2"]["E"] = 800.0
+    assert table.get_column("E", ["Q1", "2"]).tolist() == [10.0, 800.0]
+
+    table.set_column("C_TOT", [1.0, 2.0, 3.0, 4.0])
+    assert [table[name]["C_TOT"] for name in table] == [1.0, 2.0, 3.0, 4.0]
+
+    del table["2"]["E"]
+    assert "E" not in table["2"]
+
+    table.clear_column("C_TOT", ["1", "P1"])
+    assert "C_TOT" not in table["1"]
+    assert table.present("C_TOT").tolist() == [False, True, False, True]
+
+
+def test_add_and_replace_connections():
+    """The table grows beyond its initial capacity and replaces existing connections."""
+    table = ConnectionTable()
+    for i in range(20):
+        table[str(i)] = {"kind": "material", "m": float(i)}
+
+    assert table.get_column("m").tolist() == [float(i) for i in range(20)]
+
+    table["3"] = {"kind": "power", "energy_flow": 5.0}
+    assert "m" not in table["3"]
+    assert table["3"]["energy_flow"] == 5.0
+
+
+def test_total_exergy_flow_on_table(connection_data):
+    """The column-wise exergy flows equal the per-connection calculation."""
+    table = ConnectionTable(connection_data)
+    table_json = {"components": {}, "connections": table}
+    dict_json = {"components": {}, "connections": connection_data}
+
+    add_total_exergy_flow(table_json, split_physical_exergy=False)
+    add_total_exergy_flow(dict_json, split_physical_exergy=False)
+
+    assert table.to_dict() == dict_json["connections"]
+    assert table["1"]["E"] == pytest.approx(2 * 1050.0)
+    assert table["2"]["E"] == pytest.approx(800.0)
+    assert table["P1"]["E"] == 300.0
+
+
+def test_snapshot_and_restore(connection_data):
+    """Restoring a snapshot resets the values while the views stay valid."""
+    table = ConnectionTable(connection_data)
+    conn = table["1"]
+    snapshot = table.snapshot()
+
+    conn["m"] = 5.0
+    conn["kind"] = "heat"
+    conn["fluid_composition"]["Water"] = 0.5
+    table.restore(snapshot)
+
+    assert conn["m"] == 2.0
+    assert conn["kind"] == "material"
+    assert conn["fluid_composition"] == {"Water": 1.0}
+
+    # A numeric snapshot resets only the numeric properties
+    snapshot = table.snapshot(numeric_only=True)
+    conn["m"] = 5.0
+    conn["kind"] = "heat"
+    table.restore(snapshot)
+    assert conn["m"] == 2.0
+    assert conn["kind"] == "heat"
+
+
+def test_heat_exergy_flow_on_table():
+    """The column-wise heat exergy flows equal the per-connection calculation."""
+
+    def material(source, target, m, e_T):
+        return {
+            "kind": "material",
+            "source_component": source,
+            "target_component": target,
+            "m": m,
+            "e_PH": 2 * e_T,
+            "e_T": e_T,
+            "e_M": e_T,
+        }
+
+    connection_data = {
+        "a": material(None, "H", 2.0, 300.0),
+        "b": material("H", None, 2.0, 100.0),
+        "Q1": {"kind": "heat", "source_component": "H", "target_component": None},
+        "feed": material(None, "S", 5.0, 50.0),
+        "steam": material(None, "S", 3.0, 400.0),
+        "inj": material(None, "S", 0.5, 20.0),
+        "hp": material("S", None, 5.5, 900.0),
+        "ip": material("S", None, 3.0, 700.0),
+        "Q2": {"kind": "heat", "source_component": None, "target_component": "S"},
+        "c": {"kind": "material", "source_component": None, "target_component": "H2", "m": None, "e_T": 1.0},
+        "d": material("H2", None, 1.0, 1.0),
+        "Q3": {"kind": "heat", "source_component": "H2", "target_component": None},
+        "Q4": {"kind": "heat", "source_component": "X", "target_component": None},
+    }
+    components = {"SimpleHeatExchanger": {"H": {}, "H2": {}}, "SteamGenerator": {"S": {}}}
+
+    for split in (True, False):
+        table = ConnectionTable(connection_data)
+        dict_data = {name: dict(conn) for name, conn in connection_data.items()}
+        add_total_exergy_flow({"components": components, "connections": table}, split_physical_exergy=split)
+        add_total_exergy_flow({"components": components, "connections": dict_data}, split_physical_exergy=split)
+        assert table.to_dict() == dict_data
+
+    assert table["Q1"]["E"] == pytest.approx(2 * 600.0 - 2 * 200.0)
+    assert table["Q2"]["E"] == pytest.approx(5.5 * 1800 - 5 * 100 + 3 * 1400 - 3 * 800 - 0.5 * 40)
+    assert table["Q3"]["E"] is None
+    assert table["Q4"]["E"] is None
@@ -0,0 +1,57 @@
+"""
+Tests for the EconomicAnalysis class.
+
+The cost rates of parameter grids are compared against the analyses of the
+single parameter combinations.
+"""
+
+import numpy as np
+import pytest
+
+from exerpy import EconomicAnalysis
+
+PEC = [12000.0, 8000.0, 0.0, 30000.0]
+OMC_RELATIVE = [0.03, 0.02, 0.0, 0.05]
+
+
+def test_scalar_parameters():
+    """Scalar parameters give lists of cost rates per component."""
+    econ = EconomicAnalysis({"tau": 5500, "i_eff": 0.08, "n": 20, "r_n": 0.02})
+    Z_CC, Z_OM, Z_total = econ.compute_component_costs(PEC, OMC_RELATIVE)
+
+    assert all(isinstance(Z, list) for Z in (Z_CC, Z_OM, Z_total))
+    assert sum(Z_CC) == pytest.approx(sum(PEC) * econ.compute_crf() / 5500)
+    assert sum(Z_OM) == pytest.approx(2020.0 * econ.compute_celf() / 5500)
+    assert Z_total[2] == 0.0
+    assert econ.compute_component_costs([0.0, 0.0], [0.1, 0.1]) == ([0.0, 0.0], [0.0, 0.0], [0.0, 0.0])
+
+
+def test_parameter_grid():
+    """All combinations of a grid are computed at once and match single analyses."""
+    econ = EconomicAnalysis.grid(tau=[5000, 8000], i_eff=[0.05, 0.08, 0.1], n=20, r_n=[0.0, 0.02])
+    assert econ.tau.shape == (12,)
+    assert econ.compute_crf().shape == (12,)
+
+    Z_CC, Z_OM, Z_total = econ.compute_component_costs(PEC, OMC_RELATIVE)
+    assert Z_total.shape == (12, len(PEC))
+    for k in range(12):
+        single = EconomicAnalysis({"tau": econ.tau[k], "i_eff": econ.i_eff[k], "n": econ.n[k], "r_n": econ.r_n[k]})
+        expected = single.compute_component_costs(PEC, OMC_RELATIVE)
+        for result, values in zip((Z_CC, Z_OM, Z_total), expected, strict=True):
+            assert result[k] == pytest.approx(values)
+
+
+def test_broadcasting_and_cost_inputs():
+    """Parameters broadcast against equipment costs per scenario and convert to cost inputs."""
+    econ = EconomicAnalysis({"tau": np.array([5000.0, 8000.0]), "i_eff": 0.08, "n": 20, "r_n": 0.02})
+    PEC_scenarios = np.array([PEC, [2 * pec for pec in PEC]])
+    _, _, Z_total = econ.compute_component_costs(PEC_scenarios, OMC_RELATIVE)
+    assert Z_total[1] == pytest.approx(2 * Z_total[0] * 5000 / 8000)
+
+    names = ["COMP", "PUMP", "VAL", "HX"]
+    inputs = EconomicAnalysis.cost_inputs(names, Z_total)
+    assert len(inputs) == 2
+    assert inputs[1]["HX_Z"] == Z_total[1, 3]
+    assert EconomicAnalysis.cost_inputs(names, Z_total[0]) == inputs[0]
+    with pytest.raises(ValueError, match="3 cost rates for 4 components"):
+        EconomicAnalysis.cost_inputs(names, Z_total[:, :3])
@@ -0,0 +1,365 @@
+"""
+Tests for the ExergoeconomicAnalysis class.
+
+The cost equations of the heat pump cascade example are solved with the
+different solvers and compared against each other.
+"""
+
+import os
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from exerpy import ExergoeconomicAnalysis, ExergyAnalysis
+from exerpy.cost_matrix import CostMatrix, SingularStackError, StackedCostSystem, __scipy_available__
+
+_model_path = os.path.join(os.path.dirname(__file__), "..", "examples", "hp_cascade", "hp_cascade_ebs.json")
+
+requires_scipy = pytest.mark.skipif(not __scipy_available__, reason="SciPy is not installed.")
+
+
+def analysed_heat_pump():
+    """Create the analysed heat pump cascade."""
+    ean = ExergyAnalysis.from_json(_model_path)
+    ean.analyse(
+        E_F={"inputs": ["E1", "E2"], "outputs": []},
+        E_P={"inputs": ["42"], "outputs": ["41"]},
+        E_L={"inputs": ["12"], "outputs": ["11"]},
+    )
+    return ean
+
+
+@pytest.fixture
+def costs():
+    """Create the investment costs and the costs of the system inputs."""
+    costs = {f"{name}_Z": 1.0 + i for i, name in enumerate(analysed_heat_pump().components)}
+    costs.update({"11_c": 0.0, "41_c": 0.0, "E1_c": 111.0})
+    return costs
+
+
+def test_cost_matrix_assembly():
+    """Entries are overwritten like in a dense array and converted to all formats."""
+    A = CostMatrix(3)
+    A[0, 0] = 1
+    A[0, 0] = 2
+    A[1, 2] = -1
+    A[2, 1] = 0.5
+
+    assert A.nnz == 3
+    assert A[0, 0] == 2.0
+    assert A[0, 1] == 0.0
+    assert np.array_equal(np.asarray(A), [[2, 0, 0], [0, 0, -1], [0, 0.5, 0]])
+    rows, cols, values = A.to_coo()
+    assert sorted(zip(rows.tolist(), cols.tolist(), values.tolist(), strict=True)) == [
+        (0, 0, 2.0),
+        (1, 2, -1.0),
+        (2, 1, 0.5),
+    ]
+    with pytest.raises(IndexError):
+        A[3, 0] = 1.0
+
+
+@pytest.mark.parametrize("sparse", [pytest.param(True, marks=requires_scipy), False])
+def test_singular_cost_matrix(sparse):
+    """Singular systems raise a LinAlgError with both solvers."""
+    A = CostMatrix(2)
+    A[0, 0] = 1
+    A[1, 0] = 2
+    with pytest.raises(np.linalg.LinAlgError):
+        A.solve([1.0, 2.0], sparse=sparse)
+
+
+@requires_scipy
+def test_sparse_and_dense_solution(costs):
+    """The sparse and the dense solver give the same costs."""
+    results = {}
+    for sparse in (True, False):
+        ean = analysed_heat_pump()
+        exergoeco = ExergoeconomicAnalysis(ean, sparse=sparse)
+        exergoeco.run(costs, ean.Tamb)
+        results[sparse] = {name: conn.get("C_TOT") for name, conn in ean.connections.items()}
+        assert exergoeco._A.nnz < exergoeco.num_variables**2 / 4
+
+    for name, C_TOT in results[False].items():
+        assert results[True][name] == pytest.approx(C_TOT, rel=1e-10, abs=1e-8)
+
+
+def test_factorization_reuse(costs, monkeypatch):
+    """New costs are solved with the stored factorization and give the results of a fresh analysis."""
+    ean = analysed_heat_pump()
+    exergoeco = ExergoeconomicAnalysis(ean)
+    exergoeco.run(costs, ean.Tamb)
+    factorization = exergoeco._factorization
+
+    calls = []
+    construct_matrix = exergoeco.construct_matrix
+    monkeypatch.setattr(exergoeco, "construct_matrix", lambda Tamb: calls.append(Tamb) or construct_matrix(Tamb))
+
+    new_costs = {key: 2 * value for key, value in costs.items()}
+    new_costs["E1_c"] = 150.0
+    exergoeco.run(new_costs, ean.Tamb)
+    assert calls == []
+    assert exergoeco._factorization is factorization
+    b = exergoeco._b.copy()
+
+    fresh_ean = analysed_heat_pump()
+    fresh = ExergoeconomicAnalysis(fresh_ean)
+    fresh.run(new_costs, fresh_ean.Tamb)
+    assert b == pytest.approx(fresh._b)
+    assert exergoeco.system_costs == pytest.approx(fresh.system_costs)
+    for name, conn in fresh_ean.connections.items():
+        assert ean.connections[name].get("C_TOT") == pytest.approx(conn.get("C_TOT"))
+
+    # A changed exergy state requires a new matrix.
+    ean.update_connections({"11": {"m": ean.connections["11"]["m"] * 1.01}})
+    exergoeco.run(new_costs, ean.Tamb)
+    assert calls == [ean.Tamb]
+    assert exergoeco._factorization is not factorization
+
+    exergoeco.invalidate_factorization()
+    exergoeco.run(new_costs, ean.Tamb)
+    assert len(calls) == 2
+
+
+def test_run_scenarios(costs, monkeypatch):
+    """All scenarios are solved with one factorization and give the results of single runs."""
+    scenarios = [costs, {**costs, "E1_c": 150.0}, {key: 2 * value for key, value in costs.items()}]
+    ean = analysed_heat_pump()
+    exergoeco = ExergoeconomicAnalysis(ean)
+    factorize = CostMatrix.factorize
+    calls = []
+    monkeypatch.setattr(CostMatrix, "factorize", lambda self, *args: calls.append(args) or factorize(self, *args))
+    applied = []
+    apply_cost_solution = exergoeco._apply_cost_solution
+    monkeypatch.setattr(exergoeco, "_apply_cost_solution", lambda C: applied.append(C) or apply_cost_solution(C))
+
+    results = exergoeco.run_scenarios(scenarios, ean.Tamb)
+    assert len(calls) == 1
+    assert len(applied) == 1
+    assert results["Scenario"].unique().tolist() == [0, 1, 2]
+    assert list(results.columns[2:]) == ["C_F [EUR/h]", "C_P [EUR/h]", "C_D [EUR/h]", "Z [EUR/h]", "r [%]", "f [%]"]
+
+    for i, scenario in enumerate(scenarios):
+        single_ean = analysed_heat_pump()
+        single = ExergoeconomicAnalysis(single_ean)
+        single.run(scenario, single_ean.Tamb)
+        for _, row in results[results["Scenario"] == i].iterrows():
+            comp = single_ean.components[row["Component"]]
+            assert row["C_F [EUR/h]"] == pytest.approx(comp.C_F * 3600, nan_ok=True)
+            assert row["C_P [EUR/h]"] == pytest.approx(comp.C_P * 3600, nan_ok=True)
+            assert row["C_D [EUR/h]"] == pytest.approx(comp.C_D * 3600, nan_ok=True)
+            assert row["r [%]"] == pytest.approx(comp.r * 100, nan_ok=True)
+            assert row["f [%]"] == pytest.approx(comp.f * 100, nan_ok=True)
+    # The analysis holds the results of the last scenario.
+    assert exergoeco.system_costs == pytest.approx(single.system_costs)
+    rows = pd.DataFrame(single.component_cost_rows("Scenario", len(scenarios) - 1))
+    pd.testing.assert_frame_equal(
+        rows, results[results["Scenario"] == len(scenarios) - 1].reset_index(drop=True), rtol=1e-9
+    )
+
+    # The results do not depend on the order of the scenarios.
+    reversed_results = exergoeco.run_scenarios(scenarios[::-1], ean.Tamb)
+    reversed_results["Scenario"] = len(scenarios) - 1 - reversed_results["Scenario"]
+    reversed_results = reversed_results.sort_values(["Scenario", "Component"], ignore_index=True)
+    ordered = results.sort_values(["Scenario", "Component"], ignore_index=True)
+    pd.testing.assert_frame_equal(reversed_results, ordered, rtol=1e-9)
+
+    with pytest.raises(ValueError, match="At least one"):
+        exergoeco.run_scenarios([], ean.Tamb)
+    with pytest.raises(ValueError, match="other power inputs"):
+        exergoeco.run_scenarios([costs, {**costs, "E2_c": 50.0}], ean.Tamb)
+
+
+def test_cost_sensitivities(costs):
+    """The adjoint sensitivities agree with finite differences and leave the results unchanged."""
+    ean = analysed_heat_pump()
+    exergoeco = ExergoeconomicAnalysis(ean)
+    with pytest.raises(ValueError, match="Run the exergoeconomic analysis"):
+        exergoeco.cost_sensitivities(["42"])
+    exergoeco.run(costs, ean.Tamb)
+    C_TOT = {name: conn.get("C_TOT") for name, conn in ean.connections.items()}
+    C_P = ean.components["COMP1"].C_P
+
+    sensitivities = exergoeco.cost_sensitivities(["42", "COMP1"])
+    specific = exergoeco.cost_sensitivities(["42", "COMP1"], specific=True)
+    assert list(sensitivities.index) == ["42", "COMP1"]
+    assert "COMP1_Z" in sensitivities.columns and "E1_c" in sensitivities.columns
+    assert {name: conn.get("C_TOT") for name, conn in ean.connections.items()} == C_TOT
+    assert ean.components["COMP1"].C_P == C_P
+
+    for key, step in (("COMP1_Z", 1.0), ("MOT2_Z", 1.0), ("E1_c", 10.0)):
+        perturbed_ean = analysed_heat_pump()
+        perturbed = ExergoeconomicAnalysis(perturbed_ean)
+        perturbed.run({**costs, key: costs[key] + step}, perturbed_ean.Tamb)
+        dC_42 = (perturbed_ean.connections["42"]["C_TOT"] - C_TOT["42"]) * 3600 / step
+        dC_P = (perturbed_ean.components["COMP1"].C_P - C_P) * 3600 / step
+        dc_P = dC_P / ean.components["COMP1"].E_P * 1e9 / 3600
+        assert sensitivities.loc["42", key] == pytest.approx(dC_42, rel=1e-6)
+        assert sensitivities.loc["COMP1", key] == pytest.approx(dC_P, rel=1e-6)
+        assert specific.loc["COMP1", key] == pytest.approx(dc_P, rel=1e-6)
+
+    with pytest.raises(ValueError, match="neither a component nor a connection"):
+        exergoeco.cost_sensitivities(["SEP1"])
+
+
+def test_dependency_diagnostics():
+    """Colinear rows, the numerical rank and the structural defects are found."""
+    A = CostMatrix(5)
+    A[0, 0], A[0, 1] = 1.0, -1.0
+    A[1, 0], A[1, 1] = 2.0, -2.0  # exactly colinear to row 0
+    A[2, 0], A[2, 1] = 1.0, -1.0 + 1e-3  # nearly colinear to row 0
+    A[3, 2] = 1e-7
+    A[4, 0], A[4, 2] = 1.0, 1.0
+
+    assert A.zero_rows_and_columns() == ([], [3, 4])
+    assert A.colinear_rows() == ([(0, 1)], [])
+    assert A.colinear_rows(tol_near=1e-6) == ([(0, 1)], [(0, 2), (1, 2)])
+
+    rank, null_space, left_null_space = A.rank_analysis()
+    assert rank == 3
+    assert np.allclose(A.toarray() @ null_space, 0)
+    assert np.allclose(left_null_space.T @ A.toarray(), 0, atol=1e-6)
+
+    structural_rank, over, under = A.structural_analysis()
+    assert structural_rank == 3
+    assert over == [0, 1, 2, 3, 4]
+    assert under == [3, 4]
+
+
+@requires_scipy
+def test_structural_rank():
+    """The maximum matching gives the structural rank of SciPy for random sparse matrices."""
+    from scipy.sparse import csr_matrix
+    from scipy.sparse.csgraph import structural_rank
+
+    rng = np.random.default_rng(3)
+    for _ in range(50):
+        dense = rng.random((40, 40)) * (rng.random((40, 40)) < rng.uniform(0.01, 0.1))
+        A = CostMatrix(40)
+        for row, col in zip(*np.nonzero(dense), strict=True):
+            A[row, col] = dense[row, col]
+        assert A.structural_analysis()[0] == structural_rank(csr_matrix(dense))
+
+
+def test_dependency_report(costs, capsys):
+    """The report of a solvable system only contains the checks passed."""
+    ean = analysed_heat_pump()
+    exergoeco = ExergoeconomicAnalysis(ean)
+    exergoeco.run(costs, ean.Tamb)
+    capsys.readouterr()
+
+    exergoeco.print_dependency_report()
+    report = capsys.readouterr().out
+    assert "⚠" not in report
+    assert "✓ No empty equations." in report
+    assert "✓ The cost matrix has full numerical rank." in report
+
+
+@pytest.mark.parametrize("sparse", [pytest.param(True, marks=requires_scipy), False])
+def test_block_triangular_solve(sparse):
+    """The blocks are solved in dependency order, also for the transposed system."""
+    A = CostMatrix(4)
+    A[0, 2], A[0, 3] = 1.0, 2.0  # coupled with row 3
+    A[1, 1] = 4.0  # independent
+    A[2, 0], A[2, 1] = 1.0, -1.0  # depends on row 1
+    A[3, 2], A[3, 3], A[3, 0] = -1.0, 1.0, 3.0  # depends on row 2
+
+    assert A.block_triangular_decomposition() == [([1], [1]), ([2], [0]), ([0, 3], [2, 3])]
+    factorization = A.factorize(sparse, block_triangular=True)
+    b = np.array([[1.0, 2.0], [3.0, 4.0], [5.0, 6.0], [7.0, 8.0]])
+    assert np.allclose(factorization.solve(b), np.linalg.solve(A.toarray(), b))
+    assert np.allclose(factorization.solve(b[:, 0], transpose=True), np.linalg.solve(A.toarray().T, b[:, 0]))
+
+
+def test_block_triangular_analysis(costs):
+    """The block-triangular solver gives the costs of the default solver."""
+    results = {}
+    for block_triangular in (True, False):
+        ean = analysed_heat_pump()
+        exergoeco = ExergoeconomicAnalysis(ean, block_triangular=block_triangular)
+        exergoeco.run(costs, ean.Tamb)
+        results[block_triangular] = {name: conn.get("C_TOT") for name, conn in ean.connections.items()}
+
+    for name, C_TOT in results[False].items():
+        assert results[True][name] == pytest.approx(C_TOT, rel=1e-10, abs=1e-8)
+    blocks = exergoeco.cost_blocks()
+    assert sorted(var for block in blocks for var in block["variables"]) == sorted(exergoeco.variables.values())
+    assert sorted(eq for block in blocks for eq in block["equations"]) == list(range(exergoeco.num_variables))
+
+
+def test_singular_block_error(costs, monkeypatch):
+    """A singular block is reported with its equations and variables."""
+    ean = analysed_heat_pump()
+    exergoeco = ExergoeconomicAnalysis(ean, block_triangular=True)
+    construct_matrix = exergoeco.construct_matrix
+
+    def construct_singular_matrix(Tamb):
+        construct_matrix(Tamb)
+        # Remove the cost balance of the compressor
+        row = next(i for i, eq in exergoeco.equations.items() if eq.get("object") == ["COMP1"])
+        for key in [key for key in exergoeco._A._entries if key[0] == row]:
+            del exergoeco._A._entries[key]
+
+    monkeypatch.setattr(exergoeco, "construct_matrix", construct_singular_matrix)
+    with pytest.raises(ValueError, match="structurally singular") as error:
+        exergoeco.run(costs, ean.Tamb)
+    assert "'object': ['COMP1']" in str(error.value)
+    assert "Variables of the singular part: C_" in str(error.value)
+
+
+@pytest.mark.parametrize("sparse", [pytest.param(True, marks=requires_scipy), False])
+def test_stacked_cost_system(sparse):
+    """All systems of a stack are solved at once, singular systems are located."""
+    A = CostMatrix(2)
+    A[0, 0], A[1, 0], A[1, 1] = 1.0, -1.0, 2.0
+    stack = StackedCostSystem(A)
+    values = np.array([stack.values(A), [2.0, -1.0, 1.0], [1.0, 3.0, 0.5]])
+    b = np.array([[1.0, 3.0], [2.0, 0.0], [4.0, 1.0]])
+
+    x = stack.solve(values, b, sparse)
+    for k in range(3):
+        assert np.allclose(stack.toarray(values[k]) @ x[k], b[k])
+
+    values[1] = [1.0, -1.0, 0.0]
+    with pytest.raises(SingularStackError) as error:
+        stack.solve(values, b, sparse)
+    assert error.value.systems == [1]
+
+    A[0, 1] = 1.0
+    with pytest.raises(ValueError, match="sparsity pattern"):
+        stack.values(A)
+
+
+@pytest.mark.parametrize("sparse", [pytest.param(True, marks=requires_scipy), False])
+def test_run_time_series(costs, sparse):
+    """Every time step gives the results of a single run at its exergy state."""
+    costs = {**costs, "11_c": 5.0, "41_c": 3.0}
+    ean = analysed_heat_pump()
+    m_11, m_12 = ean.connections["11"]["m"], ean.connections["12"]["m"]
+    states = [{"11": {"m": m_11 * f}, "12": {"m": m_12 * f}} for f in (0.9, 1.0, 1.1)]
+    states.insert(2, {"41": {"m": ean.connections["41"]["m"] * 1.05}})
+    exergoeco = ExergoeconomicAnalysis(ean, sparse=sparse)
+    results = exergoeco.run_time_series(states, costs, ean.Tamb, chunk_size=3)
+    assert results["Time step"].unique().tolist() == [0, 1, 2, 3]
+    assert exergoeco._factorization is None
+
+    for step, state in enumerate(states):
+        single_ean = analysed_heat_pump()
+        single_ean.update_connections(state)
+        single = ExergoeconomicAnalysis(single_ean)
+        single.run(costs, single_ean.Tamb)
+        for _, row in results[results["Time step"] == step].iterrows():
+            comp = single_ean.components[row["Component"]]
+            assert row["C_P [EUR/h]"] == pytest.approx(comp.C_P * 3600, nan_ok=True)
+            assert row["C_D [EUR/h]"] == pytest.approx(comp.C_D * 3600, nan_ok=True)
+            assert row["r [%]"] == pytest.approx(comp.r * 100, nan_ok=True)
+            assert row["f [%]"] == pytest.approx(comp.f * 100, nan_ok=True)
+    # The analysis holds the results of the last time step.
+    assert exergoeco.system_costs == pytest.approx(single.system_costs)
+    assert ean.connections["11"]["m"] == pytest.approx(m_11 * 1.1)
+
+    with pytest.raises(ValueError, match="At least one"):
+        exergoeco.run_time_series([], costs, ean.Tamb)
+    with pytest.raises(ValueError, match="not part of the plant"):
+        exergoeco.run_time_series([{"X": {"m": 1.0}}], costs, ean.Tamb)
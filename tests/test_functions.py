@@ -16,6 +16,7 @@ from exerpy.functions import (
     add_chemical_exergy,
     add_total_exergy_flow,
     calc_chemical_exergy,
+    calc_chemical_exergy_vectorized,
     convert_to_SI,
     mass_to_molar_fractions,
     molar_to_mass_fractions,
@@ -410,6 +411,53 @@ def test_calc_chemical_exergy_invalid_library():
         calc_chemical_exergy(stream_data, 298.15, 1.01325, "InvalidLibrary")
 
 
+def test_calc_chemical_exergy_vectorized(flue_gas_composition):
+    """
+    Test the chemical exergy of a composition matrix against the per-stream calculation.
+
+    Verifies
+    --------
+    - Pure substances, mixtures with and without condensing water
+    - Ambient temperature per stream
+    """
+    flue_gas = mass_to_molar_fractions(flue_gas_composition["mass_composition"])
+    compositions = [
+        {"N2": 0.79, "O2": 0.21},
+        {"CH4": 1.0},
+        {"H2O": 1.0},
+        flue_gas,
+        {"N2": 0.3, "O2": 0.05, "H2O": 0.65},
+    ]
+    species = sorted({name for composition in compositions for name in composition})
+    matrix = [[composition.get(name, 0.0) for name in species] for composition in compositions]
+    Tamb = [298.15, 298.15, 298.15, 288.15, 298.15]
+
+    result = calc_chemical_exergy_vectorized(matrix, species, Tamb, 101325.0, "Ahrendts")
+    expected = [
+        calc_chemical_exergy({"molar_composition": composition}, T, 101325.0, "Ahrendts")
+        for composition, T in zip(compositions, Tamb, strict=True)
+    ]
+    # The scalar calculation uses the composition of its cache key, which is rounded to 10 decimals
+    assert result == pytest.approx(expected, rel=1e-9)
+
+
+def test_calc_chemical_exergy_vectorized_invalid():
+    """
+    Test error handling of the vectorized chemical exergy calculation.
+
+    Verifies
+    --------
+    - Shape mismatch and streams without species raise ValueError
+    - Mixtures with species missing in the library raise ValueError
+    """
+    with pytest.raises(ValueError, match="do not match"):
+        calc_chemical_exergy_vectorized([[0.5, 0.5]], ["N2"], 298.15, 101325.0, "Ahrendts")
+    with pytest.raises(ValueError, match="no positive molar fraction"):
+        calc_chemical_exergy_vectorized([[0.0, 0.0]], ["N2", "O2"], 298.15, 101325.0, "Ahrendts")
+    with pytest.raises(ValueError, match="Acetone"):
+        calc_chemical_exergy_vectorized([[0.5, 0.5]], ["N2", "Acetone"], 298.15, 101325.0, "Ahrendts")
+
+
 def test_add_total_exergy_flow_realistic(realistic_json_data):
     """
     Test addition of total exergy flow with realistic process data.
@@ -0,0 +1,147 @@
+import contextlib
+import io
+
+import pytest
+from tespy.components import (
+    Compressor,
+    CycleCloser,
+    HeatExchanger,
+    Motor,
+    PowerBus,
+    PowerSource,
+    Pump,
+    Sink,
+    Source,
+    Valve,
+)
+from tespy.connections import Connection, PowerConnection
+from tespy.networks import Network
+
+from exerpy import ExergoeconomicAnalysis, ExergyAnalysis
+from exerpy.parser.from_tespy.tespy_coupling import TespyCoupling
+
+T0 = 283.15
+P0 = 101300
+FUEL = {"inputs": ["e1"], "outputs": []}
+PRODUCT = {"inputs": ["23"], "outputs": ["21"]}
+LOSS = {"inputs": ["13"], "outputs": ["11"]}
+
+
+@pytest.fixture
+def heat_pump():
+    """Solved heat pump of the TESPy example."""
+    nw = Network(T_unit="C", p_unit="bar", h_unit="kJ / kg", m_unit="kg / s", iterinfo=False)
+    air_in, air_out, fan = Source("air inlet"), Sink("air outlet"), Compressor("FAN")
+    water_in, water_out, pump = Source("water inlet"), Sink("water outlet"), Pump("PUMP")
+    evaporator, condenser = HeatExchanger("EVA"), HeatExchanger("COND")
+    compressor, valve, cc = Compressor("COMP"), Valve("VAL"), CycleCloser("cc")
+
+    c11 = Connection(air_in, "out1", fan, "in1", label="11")
+    c12 = Connection(fan, "out1", evaporator, "in1", label="12")
+    c13 = Connection(evaporator, "out1", air_out, "in1", label="13")
+    c21 = Connection(water_in, "out1", pump, "in1", label="21")
+    c22 = Connection(pump, "out1", condenser, "in2", label="22")
+    c23 = Connection(condenser, "out2", water_out, "in1", label="23")
+    c30 = Connection(condenser, "out1", cc, "in1", label="30")
+    c31 = Connection(cc, "out1", valve, "in1", label="31")
+    c32 = Connection(valve, "out1", evaporator, "in2", label="32")
+    c33 = Connection(evaporator, "out2", compressor, "in1", label="33")
+    c34 = Connection(compressor, "out1", condenser, "in1", label="34")
+    nw.add_conns(c11, c12, c13, c21, c22, c23, c30, c31, c32, c33, c34)
+
+    c11.set_attr(fluid={"Ar": 0.0129, "CO2": 0.0005, "N2": 0.7552, "O2": 0.2314}, T=10, p=1.013)
+    c13.set_attr(T=8, p=1.013)
+    c21.set_attr(fluid={"water": 1}, T=70, p=5, m=10)
+    c23.set_attr(T=120, p=5)
+    c32.set_attr(p=0.6, fluid={"R245FA": 1})
+    c34.set_attr(p=23)
+    compressor.set_attr(eta_s=0.8)
+    fan.set_attr(eta_s=0.85)
+    pump.set_attr(eta_s=0.8)
+    evaporator.set_attr(dp1=0.03, dp2=0.05, ttd_u=5)
+    condenser.set_attr(dp1=0.05, dp2=0.05)
+
+    grid, distribution = PowerSource("grid"), PowerBus("electricity distribution", num_in=1, num_out=3)
+    motors = [Motor(f"MOT{i}") for i in (1, 2, 3)]
+    nw.add_conns(
+        PowerConnection(grid, "power", distribution, "power_in1", label="e1"),
+        PowerConnection(distribution, "power_out1", motors[0], "power_in", label="E1"),
+        PowerConnection(motors[0], "power_out", fan, "power", label="e5"),
+        PowerConnection(distribution, "power_out2", motors[1], "power_in", label="E2"),
+        PowerConnection(motors[1], "power_out", compressor, "power", label="e7"),
+        PowerConnection(distribution, "power_out3", motors[2], "power_in", label="E3"),
+        PowerConnection(motors[2], "power_out", pump, "power", label="e3"),
+    )
+    for motor in motors:
+        motor.set_attr(eta=0.985)
+    c31.set_attr(T=75)
+    nw.solve("design")
+    condenser.set_attr(ttd_l=5)
+    c31.set_attr(T=None)
+    nw.solve("design")
+    nw.assert_convergence()
+    return nw
+
+
+@pytest.fixture
+def costs(heat_pump):
+    """Investment costs of the components and costs of the system inputs."""
+    costs = {f"{name}_Z": 1.0 + i for i, name in enumerate(ExergyAnalysis.from_tespy(heat_pump, T0, P0).components)}
+    costs.update({"11_c": 0.0, "21_c": 0.0, "e1_c": 100.0})
+    return costs
+
+
+def test_update_matches_new_analysis(heat_pump, costs):
+    """The updated model holds the results of an analysis built from the new solution."""
+    with contextlib.redirect_stdout(io.StringIO()):
+        coupling = TespyCoupling(heat_pump, T0, P0, FUEL, PRODUCT, LOSS, costs=costs)
+        ean = coupling.exergy_analysis
+        components = dict(ean.components)
+        epsilon = ean.epsilon
+
+        heat_pump.get_conn("21").set_attr(m=8)
+        heat_pump.get_comp("COMP").set_attr(eta_s=0.75)
+        coupling.solve("design")
+
+        expected = ExergyAnalysis.from_tespy(heat_pump, T0, P0)
+        expected.analyse(FUEL, PRODUCT, LOSS)
+        ExergoeconomicAnalysis(expected).run(costs, T0)
+
+    assert all(ean.components[name] is component for name, component in components.items())
+    assert ean.epsilon != pytest.approx(epsilon)
+    assert ean.epsilon == pytest.approx(expected.epsilon, rel=1e-9)
+    for name, conn in expected.connections.items():
+        for key in ("E", "C_TOT"):
+            assert ean.connections[name][key] == pytest.approx(conn[key], rel=1e-9, abs=1e-6, nan_ok=True), (name, key)
+    for name, component in expected.components.items():
+        if name == "cc":
+            continue
+        for key in ("E_D", "C_P"):
+            expected_value = getattr(component, key)
+            updated_value = getattr(ean.components[name], key)
+            assert updated_value == pytest.approx(expected_value, rel=1e-9, abs=1e-6, nan_ok=True), (name, key)
+
+
+def test_exergy_analysis_only(heat_pump):
+    """Without costs the exergy analysis is updated alone."""
+    coupling = TespyCoupling(heat_pump, T0, P0, FUEL, PRODUCT, LOSS)
+    assert coupling.exergoeconomic_analysis is None
+    states = coupling.connection_states()
+    assert states["e1"] == {"energy_flow": heat_pump.get_conn("e1").E.val_SI}
+    assert states["23"]["T"] == pytest.approx(393.15)
+
+    heat_pump.get_conn("23").set_attr(T=110)
+    coupling.solve("design")
+    assert coupling.exergy_analysis.connections["23"]["T"] == pytest.approx(383.15)
+
+
+def test_unconverged_network(heat_pump, monkeypatch):
+    """Results of a solution that did not converge are not read."""
+    coupling = TespyCoupling(heat_pump, T0, P0, FUEL, PRODUCT, LOSS)
+    E_D = coupling.exergy_analysis.E_D
+    monkeypatch.setattr(heat_pump, "status", 2)
+    with pytest.raises(RuntimeError, match="did not converge"):
+        coupling.update()
+    assert coupling.exergy_analysis.E_D == E_D
+    with pytest.raises(TypeError, match="tespy network"):
+        TespyCoupling("hp_tespy.json", T0, P0, FUEL, PRODUCT, LOSS)
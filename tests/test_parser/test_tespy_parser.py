@@ -0,0 +1,91 @@
+import math
+
+import pytest
+from tespy.components import Compressor, CycleCloser, SimpleHeatExchanger, Sink, Source, Valve
+from tespy.connections import Connection
+from tespy.networks import Network
+
+from exerpy import ExergyAnalysis
+from exerpy.connections import ConnectionTable
+from exerpy.parser.from_tespy import tespy_parser
+from exerpy.parser.from_tespy.tespy_parser import to_exerpy
+
+# Evaporation at the ambient temperature puts the valve outlet in the two-phase region at ambient temperature
+TAMB = 273.15
+PAMB = 101325
+
+
+@pytest.fixture(scope="module")
+def network():
+    """Solved refrigeration cycle and humid air compressor."""
+    nw = Network(iterinfo=False)
+    cc = CycleCloser("cc")
+    evaporator = SimpleHeatExchanger("EVA")
+    compressor = Compressor("COMP")
+    condenser = SimpleHeatExchanger("COND")
+    valve = Valve("VAL")
+    air_in, air_out = Source("air inlet"), Sink("air outlet")
+    fan = Compressor("FAN")
+
+    c0 = Connection(cc, "out1", evaporator, "in1", label="0")
+    c1 = Connection(evaporator, "out1", compressor, "in1", label="1")
+    c2 = Connection(compressor, "out1", condenser, "in1", label="2")
+    c3 = Connection(condenser, "out1", valve, "in1", label="3")
+    c4 = Connection(valve, "out1", cc, "in1", label="4")
+    c11 = Connection(air_in, "out1", fan, "in1", label="11")
+    c12 = Connection(fan, "out1", air_out, "in1", label="12")
+    nw.add_conns(c0, c1, c2, c3, c4, c11, c12)
+
+    c1.set_attr(fluid={"R134a": 1}, x=1, T=TAMB, m=1)
+    c3.set_attr(x=0, T=313.15)
+    compressor.set_attr(eta_s=0.8)
+    evaporator.set_attr(dp=0)
+    condenser.set_attr(dp=0)
+    c11.set_attr(fluid={"N2": 0.75, "O2": 0.23, "H2O": 0.02}, p=PAMB, T=288.15, m=2, mixing_rule="ideal-cond")
+    c12.set_attr(p=5e5)
+    fan.set_attr(eta_s=0.85)
+    nw.solve("design")
+    nw.assert_convergence()
+    return nw
+
+
+def _assert_same_export(classic, bulk, rel=1e-9):
+    assert bulk["components"] == classic["components"]
+    assert isinstance(bulk["connections"], ConnectionTable)
+    connections = bulk["connections"].to_dict()
+    assert connections.keys() == classic["connections"].keys()
+    for name, conn in classic["connections"].items():
+        assert connections[name].keys() == conn.keys()
+        for key, value in conn.items():
+            if isinstance(value, float) and not math.isnan(value):
+                assert connections[name][key] == pytest.approx(value, rel=rel, abs=1e-6), (name, key)
+            elif not isinstance(value, float):
+                assert connections[name][key] == value, (name, key)
+
+
+def test_bulk_export_matches_connection_export(network):
+    """The bulk export writes the same data as the export connection by connection."""
+    classic = to_exerpy(network, TAMB, PAMB)
+    bulk = to_exerpy(network, TAMB, PAMB, bulk=True)
+    _assert_same_export(classic, bulk)
+    assert classic["connections"]["4"]["e_T"] == 0.0
+    assert bulk["connections"]["4"]["e_PH"] == pytest.approx(classic["connections"]["4"]["e_PH"])
+
+
+def test_bulk_export_falls_back_to_tespy(network, monkeypatch):
+    """Fluids outside of the scope of the exerpy calculation are evaluated by tespy."""
+    assert tespy_parser._native_fluid(network.get_conn("11"), TAMB) == (
+        {"N2": 0.75, "O2": 0.23, "H2O": 0.02},
+        "HEOS",
+        "ideal-cond",
+    )
+    monkeypatch.setattr(tespy_parser, "_native_fluid", lambda c, Tamb: None)
+    _assert_same_export(to_exerpy(network, TAMB, PAMB), to_exerpy(network, TAMB, PAMB, bulk=True), rel=0)
+
+
+def test_from_tespy_bulk(network):
+    """The exergy flows of the analysis do not depend on the export path."""
+    classic = ExergyAnalysis.from_tespy(network, TAMB, PAMB)
+    bulk = ExergyAnalysis.from_tespy(network, TAMB, PAMB, bulk=True)
+    for name in ("0", "2", "4", "12"):
+        assert bulk.connections[name]["E"] == pytest.approx(classic.connections[name]["E"], rel=1e-9)
@@ -0,0 +1,120 @@
+import logging
+
+import numpy as np
+import pandas as pd
+import pytest
+from tespy.components import Compressor, Motor, PowerSource, Sink, Source
+from tespy.connections import Connection, PowerConnection
+from tespy.networks import Network
+
+from exerpy import ExergyAnalysis
+from exerpy.parser.from_tespy.tespy_sweep import run_sweep
+
+T0 = 288.15
+P0 = 101325
+FUEL = {"inputs": ["e1"], "outputs": []}
+PRODUCT = {"inputs": ["2"], "outputs": ["1"]}
+GRID = {"2.p": [4e5, 5e5], "COMP.eta_s": [0.8, 0.85]}
+# Solutions of TESPy from different starting values differ by a few ppm, exergy destructions by some 1e-5
+REL = 1e-4
+
+
+def air_compressor():
+    """Air compressor driven by an electric motor."""
+    nw = Network(iterinfo=False)
+    inlet, outlet, compressor = Source("air inlet"), Sink("air outlet"), Compressor("COMP")
+    grid, motor = PowerSource("grid"), Motor("MOT")
+    nw.add_conns(
+        Connection(inlet, "out1", compressor, "in1", label="1"),
+        Connection(compressor, "out1", outlet, "in1", label="2"),
+        PowerConnection(grid, "power", motor, "power_in", label="e1"),
+        PowerConnection(motor, "power_out", compressor, "power", label="e2"),
+    )
+    nw.get_conn("1").set_attr(fluid={"N2": 0.77, "O2": 0.23}, T=293.15, p=1.013e5, m=1)
+    nw.get_conn("2").set_attr(p=5e5)
+    compressor.set_attr(eta_s=0.85)
+    motor.set_attr(eta=0.97)
+    return nw
+
+
+def test_sweep_matches_single_analyses():
+    """Every case gives the results of an analysis of the network solved for the case alone."""
+    results = run_sweep(air_compressor, GRID, T0, P0, FUEL, PRODUCT, processes=1)
+    assert list(results.columns[:4]) == ["Case", "2.p", "COMP.eta_s", "Component"]
+    cases = results.drop_duplicates("Case")
+    assert cases["2.p"].tolist() == [4e5, 4e5, 5e5, 5e5]
+    assert cases["COMP.eta_s"].tolist() == [0.8, 0.85, 0.8, 0.85]
+
+    for case, p, eta_s in cases[["Case", "2.p", "COMP.eta_s"]].itertuples(index=False):
+        nw = air_compressor()
+        nw.get_conn("2").set_attr(p=p)
+        nw.get_comp("COMP").set_attr(eta_s=eta_s)
+        nw.solve("design")
+        ean = ExergyAnalysis.from_tespy(nw, T0, P0)
+        ean.analyse(FUEL, PRODUCT)
+        expected = ean.exergy_results(print_results=False)[0].set_index("Component")
+        result = results[results["Case"] == case].set_index("Component")
+        assert result["E_D [kW]"].to_numpy() == pytest.approx(expected["E_D [kW]"].to_numpy(), rel=REL)
+        assert result.loc["TOT", "ε [%]"] == pytest.approx(expected.loc["TOT", "ε [%]"], rel=REL)
+
+
+def test_parallel_sweep_from_json(tmp_path):
+    """Worker processes started from a network export give the results of the serial sweep."""
+    nw = air_compressor()
+    nw.solve("design")
+    nw.export(tmp_path / "air_compressor.json")
+    nw.save(tmp_path / "init.json")
+    costs = {"COMP_Z": 2.0, "MOT_Z": 0.5, "1_c": 0.0, "e1_c": 100.0}
+
+    serial = run_sweep(air_compressor, GRID, T0, P0, FUEL, PRODUCT, costs=costs, processes=1)
+    parallel = run_sweep(
+        str(tmp_path / "air_compressor.json"),
+        GRID,
+        T0,
+        P0,
+        FUEL,
+        PRODUCT,
+        costs=costs,
+        init_path=str(tmp_path / "init.json"),
+        processes=2,
+    )
+    assert "C_P [EUR/h]" in parallel.columns
+    pd.testing.assert_frame_equal(parallel, serial, rtol=REL)
+
+
+def test_cases_without_convergence(monkeypatch, caplog):
+    """Cases that do not converge are reported and the next case starts from a new network."""
+    monkeypatch.setattr(Network, "converged", property(lambda nw: nw.get_comp("COMP").eta_s.val != 0.8))
+    with caplog.at_level(logging.WARNING):
+        results = run_sweep(air_compressor, GRID, T0, P0, FUEL, PRODUCT, processes=1)
+    assert results["Case"].unique().tolist() == [1, 3]
+    assert "failed for 2 of 4 cases: [0, 2]" in caplog.text
+    assert np.isfinite(results["E_D [kW]"]).all()
+
+
+def test_cases_with_value_errors(monkeypatch, caplog):
+    """Value errors of the solution, e.g. of CoolProp, are reported like cases without convergence."""
+    solve = Network.solve
+
+    def failing_solve(nw, *args, **kwargs):
+        if nw.get_conn("2").p.val == 4e5:
+            raise ValueError("Input pressure is out of range.")
+        return solve(nw, *args, **kwargs)
+
+    monkeypatch.setattr(Network, "solve", failing_solve)
+    with caplog.at_level(logging.INFO):
+        results = run_sweep(air_compressor, GRID, T0, P0, FUEL, PRODUCT, processes=1)
+    assert results["Case"].unique().tolist() == [2, 3]
+    assert "Case 0 failed: Input pressure is out of range." in caplog.text
+    assert "failed for 2 of 4 cases: [0, 1]" in caplog.text
+
+
+def test_invalid_grid():
+    with pytest.raises(ValueError, match="label and an attribute"):
+        run_sweep(air_compressor, {"eta_s": [0.8]}, T0, P0, FUEL, PRODUCT, processes=1)
+    with pytest.raises(ValueError, match="same parameters"):
+        run_sweep(air_compressor, [{"2.p": 4e5}, {"COMP.eta_s": 0.8}], T0, P0, FUEL, PRODUCT, processes=1)
+    with pytest.raises(ValueError, match="no cases"):
+        run_sweep(air_compressor, [], T0, P0, FUEL, PRODUCT, processes=1)
+    with pytest.raises(ValueError, match="label 'FAN'"):
+        run_sweep(air_compressor, {"FAN.eta_s": [0.8]}, T0, P0, FUEL, PRODUCT, processes=1)
@@ -0,0 +1,138 @@
+"""
+Unit tests for the native physical exergy calculation.
+
+The thermal and mechanical exergy are compared against the values exported by
+TESPy and the dead state cache is checked to be filled once per composition.
+"""
+
+import json
+import os
+
+import pytest
+
+from exerpy import physical_exergy as pe
+from exerpy.functions import add_physical_exergy
+
+_basepath = os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "examples")
+
+
+def _load(*path):
+    with open(os.path.join(_basepath, *path)) as f:
+        return json.load(f)
+
+
+@pytest.fixture
+def empty_cache():
+    """Start and end with an empty property cache."""
+    pe.clear_cache()
+    yield
+    pe.clear_cache()
+
+
+@pytest.mark.parametrize("path", [("cgam", "cgam_tespy.json"), ("heatpump", "hp_tespy.json")])
+def test_matches_tespy_export(path, empty_cache):
+    """Pressure and enthalpy of the TESPy exports reproduce the exported exergies."""
+    data = _load(*path)
+    Tamb, pamb = data["ambient_conditions"]["Tamb"], data["ambient_conditions"]["pamb"]
+    for conn in data["connections"].values():
+        if conn["kind"] != "material":
+            continue
+        e_T, e_M = pe.physical_exergy(conn["p"], Tamb, pamb, conn["mass_composition"], h=conn["h"])
+        assert e_T == pytest.approx(conn["e_T"], rel=1e-6, abs=1e-3)
+        assert e_M == pytest.approx(conn["e_M"], rel=1e-6, abs=1e-3)
+
+
+def test_dead_state_cache(empty_cache):
+    """Streams of the same composition share the dead state and the ambient temperature isobar."""
+    air = {"N2": 0.77, "O2": 0.23}
+    for T in (300.0, 400.0, 500.0):
+        pe.physical_exergy(5e5, 288.15, 101325, air, T=T)
+    pe.physical_exergy(5e5, 288.15, 101325, {"O2": 0.23, "N2": 0.77}, T=600.0)
+    assert pe.cache_size() == {"fluids": 1, "dead_states": 1, "isobars": 1}
+
+    pe.physical_exergy(10e5, 288.15, 101325, air, T=600.0)
+    assert pe.cache_size() == {"fluids": 1, "dead_states": 1, "isobars": 2}
+    info = pe.cache_info()
+    assert (info["dead_states"].hits, info["dead_states"].misses) == (4, 1)
+    assert (info["isobars"].hits, info["isobars"].misses) == (3, 2)
+
+
+def test_bounded_cache(empty_cache, monkeypatch):
+    """The least recently used isobar values are dropped from a full cache."""
+    monkeypatch.setattr(pe.isobar_cache, "maxsize", 2)
+    air = {"N2": 0.77, "O2": 0.23}
+    expected = pe.physical_exergy(2e5, 288.15, 101325, air, T=400.0)
+    for p in (2e5, 3e5, 4e5):
+        pe.physical_exergy(p, 288.15, 101325, air, T=400.0)
+    assert pe.cache_info()["isobars"].currsize == 2
+    assert pe.physical_exergy(2e5, 288.15, 101325, air, T=400.0) == expected
+
+
+def test_ambient_state_and_condensation(empty_cache):
+    """The dead state has no exergy and flue gas with condensed water at ambient temperature no thermal exergy."""
+    flue_gas = {"N2": 0.7, "O2": 0.1, "CO2": 0.1, "H2O": 0.1}
+    e_T, e_M = pe.physical_exergy(101325, 288.15, 101325, flue_gas, T=288.15)
+    assert (e_T, e_M) == pytest.approx((0.0, 0.0), abs=1e-6)
+
+    e_T, e_M = pe.physical_exergy(10e5, 288.15, 101325, flue_gas, T=288.15)
+    assert e_T == pytest.approx(0.0, abs=1e-6)
+    assert e_M > 0
+    e_T_ideal, e_M_ideal = pe.physical_exergy(10e5, 288.15, 101325, flue_gas, T=288.15, mixing_rule="ideal")
+    assert e_M_ideal != pytest.approx(e_M)
+
+    # Temperature from the enthalpy of the mixture
+    h = pe._fluid(flue_gas, "HEOS", "ideal-cond")[1].h_s_pT(5e5, 700.0)[0]
+    assert pe.physical_exergy(5e5, 288.15, 101325, flue_gas, h=h) == pytest.approx(
+        pe.physical_exergy(5e5, 288.15, 101325, flue_gas, T=700.0)
+    )
+
+
+def test_saturated_states(empty_cache):
+    """Saturated pure fluids require the vapor quality or the enthalpy."""
+    e_wet = pe.physical_exergy(5000.0, 288.15, 101325, {"water": 1.0}, T=306.02, x=0.9)
+    h = pe.CP.PropsSI("H", "P", 5000.0, "Q", 0.9, "water")
+    assert pe.physical_exergy(5000.0, 288.15, 101325, {"water": 1.0}, h=h) == pytest.approx(e_wet)
+    T_sat = pe.CP.PropsSI("T", "P", 5000.0, "Q", 0, "water")
+    with pytest.raises(ValueError, match="vapor quality is required"):
+        pe.physical_exergy(5000.0, 288.15, 101325, {"water": 1.0}, T=T_sat)
+
+    # Superheated vapor at the saturation pressure of the ambient temperature with a given entropy, where the
+    # ambient temperature isobar state is the saturated liquid
+    p_sat = pe.CP.PropsSI("P", "T", 298.15, "Q", 0, "water")
+    h, s = pe.CP.PropsSI(["H", "S"], "P", p_sat, "T", 350.0, "water")
+    e_T, e_M = pe.physical_exergy(p_sat, 298.15, 101325, {"water": 1.0}, h=h, s=s)
+    assert (e_T, e_M) == pytest.approx(pe.physical_exergy(p_sat, 298.15, 101325, {"water": 1.0}, T=350.0))
+    h_liquid, s_liquid = pe.CP.PropsSI(["H", "S"], "T", 298.15, "Q", 0, "water")
+    assert e_T == pytest.approx(h - h_liquid - 298.15 * (s - s_liquid))
+
+
+def test_invalid_input(empty_cache):
+    with pytest.raises(ValueError, match="enthalpy, the temperature or the vapor quality"):
+        pe.physical_exergy(1e5, 288.15, 101325, {"water": 1.0})
+    with pytest.raises(ValueError, match="Unknown mixing rule"):
+        pe.physical_exergy(1e5, 288.15, 101325, {"water": 1.0}, T=300.0, mixing_rule="real")
+    with pytest.raises(ValueError, match="is known to CoolProp"):
+        pe.physical_exergy(1e5, 288.15, 101325, {"ThermoLiquid": 1.0}, T=300.0)
+
+
+def test_add_physical_exergy(empty_cache):
+    """Connections without physical exergy are enriched, existing values are kept."""
+    data = _load("ccpp", "ccpp_tespy.json")
+    Tamb, pamb = data["ambient_conditions"]["Tamb"], data["ambient_conditions"]["pamb"]
+    expected = {name: dict(conn) for name, conn in data["connections"].items() if conn["kind"] == "material"}
+    data["connections"]["1"]["e_PH"] = 1.0
+    for name in ("13", "16"):
+        for key in ("e_PH", "e_T", "e_M"):
+            del data["connections"][name][key]
+
+    add_physical_exergy(data, Tamb, pamb)
+    assert data["connections"]["1"]["e_PH"] == 1.0
+    for name in ("13", "16"):
+        conn = data["connections"][name]
+        assert conn["e_PH"] == pytest.approx(expected[name]["e_PH"], rel=1e-6)
+        assert conn["e_PH"] == pytest.approx(conn["e_T"] + conn["e_M"])
+        assert conn["e_PH_unit"] == "J / kg"
+
+    add_physical_exergy(data, Tamb, pamb, overwrite=True)
+    for name, conn in expected.items():
+        assert data["connections"][name]["e_PH"] == pytest.approx(conn["e_PH"], rel=1e-6, abs=1e-3)
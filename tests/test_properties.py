@@ -0,0 +1,73 @@
+"""
+Unit tests for the cached reference state properties.
+
+These tests verify that molar masses and saturation pressures are read from
+CoolProp once and reused afterwards.
+"""
+
+import CoolProp.CoolProp as CP
+import pytest
+
+from exerpy import properties
+from exerpy.functions import mass_to_molar_fractions
+
+
+@pytest.fixture
+def propssi_calls(monkeypatch):
+    """Count the calls to CoolProp starting from an empty cache."""
+    properties.clear_cache()
+    calls = []
+    propssi = CP.PropsSI
+
+    def counting_propssi(*args):
+        calls.append(args)
+        return propssi(*args)
+
+    monkeypatch.setattr(properties.CP, "PropsSI", counting_propssi)
+    yield calls
+    properties.clear_cache()
+
+
+def test_molar_mass_is_cached(propssi_calls):
+    """Repeated conversions read the molar masses once."""
+    for _ in range(5):
+        mass_to_molar_fractions({"N2": 0.77, "O2": 0.23})
+
+    assert len(propssi_calls) == 2
+    assert properties.molar_mass("N2") == pytest.approx(0.0280135, rel=1e-5)
+    assert properties.cache_size() == {"molar_mass": 2, "saturation_pressure": 0}
+
+
+def test_saturation_pressure_is_cached(propssi_calls):
+    """The saturation pressure of water is read once per temperature."""
+    first = properties.water_saturation_pressure(298.15)
+    assert properties.water_saturation_pressure(298.15) == first
+    assert first == pytest.approx(3169.9, rel=1e-3)
+    assert len(propssi_calls) == 1
+
+
+def test_preload(propssi_calls):
+    """Preloading fills the cache and skips unknown fluids."""
+    properties.preload(["N2", "CO2", "InvalidSubstance"], Tamb=[288.15, 298.15])
+    calls = len(propssi_calls)
+
+    properties.molar_mass("CO2")
+    properties.water_saturation_pressure(288.15)
+    assert len(propssi_calls) == calls
+    assert properties.cache_size() == {"molar_mass": 2, "saturation_pressure": 2}
+
+
+def test_saturation_pressure_cache_is_bounded(propssi_calls):
+    """The saturation pressures are kept in a bounded cache with statistics."""
+    maxsize = properties.saturation_pressure_cache.maxsize
+    properties.saturation_pressure_cache.resize(2)
+    try:
+        for T in (280.0, 290.0, 300.0, 300.0):
+            properties.water_saturation_pressure(T)
+        assert properties.cache_info()["saturation_pressure"] == (1, 3, 2, 2)
+
+        # The least recently used temperature is read again
+        properties.water_saturation_pressure(280.0)
+        assert len(propssi_calls) == 4
+    finally:
+        properties.saturation_pressure_cache.resize(maxsize)
@@ -0,0 +1,130 @@
+"""
+Unit tests for the tabulated physical exergy.
+
+Coarse tables are validated against the exact calculation on the states of
+the TESPy heat pump example and persisted to a temporary directory.
+"""
+
+import json
+import os
+
+import CoolProp.CoolProp as CP
+import numpy as np
+import pytest
+
+from exerpy import property_table
+from exerpy.physical_exergy import physical_exergy
+from exerpy.property_table import PropertyTable
+
+_model_path = os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "examples", "heatpump", "hp_tespy.json")
+COARSE = {"n_p": 100, "n_T": 80}
+
+
+@pytest.fixture(scope="module")
+def heat_pump():
+    """States of the material connections of the heat pump grouped by composition."""
+    with open(_model_path) as f:
+        data = json.load(f)
+    groups = {}
+    for conn in data["connections"].values():
+        if conn["kind"] == "material":
+            key = json.dumps(conn["mass_composition"], sort_keys=True)
+            groups.setdefault(key, []).append((conn["p"], conn["h"]))
+    return data["ambient_conditions"], {key: np.array(states).T for key, states in groups.items()}
+
+
+def test_validation_on_heat_pump(heat_pump):
+    """Coarse tables reproduce the exact physical exergy of the plant and of part load variations."""
+    ambient, groups = heat_pump
+    rng = np.random.default_rng(0)
+    for key, (p, h) in groups.items():
+        table = PropertyTable.build(json.loads(key), **COARSE)
+        p = np.concatenate([p, np.repeat(p, 10) * rng.uniform(0.7, 1.3, 10 * len(p))])
+        h = np.concatenate([h, np.repeat(h, 10) + rng.normal(0, 2e4, 10 * len(h))])
+        result = table.validate(p, h, ambient["Tamb"], ambient["pamb"])
+        assert result["e_T"] < 1.0
+        assert result["e_M"] < 0.1
+
+
+def test_two_phase_and_ambient_state():
+    """Wet states at ambient temperature have no thermal exergy and the dead state no exergy at all."""
+    table = PropertyTable.build({"R245fa": 1.0}, p_range=(1e4, 3e6), **COARSE)
+    h_wet = CP.PropsSI("H", "T", 298.15, "Q", 0.4, "R245fa")
+    p_sat = CP.PropsSI("P", "T", 298.15, "Q", 0.4, "R245fa")
+    e_T, e_M = table.physical_exergy([p_sat, 101325], [h_wet, table.fluid.h_s_pT(101325, 298.15)[0]], 298.15, 101325)
+    assert e_T == pytest.approx([0.0, 0.0], abs=1e-2)
+    assert e_M[1] == pytest.approx(0.0, abs=1e-9)
+    assert e_M[0] == pytest.approx(physical_exergy(p_sat, 298.15, 101325, {"R245fa": 1.0}, h=h_wet)[1], abs=0.1)
+
+
+def test_states_outside_of_the_table():
+    """States outside of the table are evaluated exactly."""
+    table = PropertyTable.build({"water": 1.0}, p_range=(1e4, 1e6), **COARSE)
+    assert np.isnan(table.entropy(5e6, 1e6))
+    e_T, e_M = table.physical_exergy(5e6, 1e6, 298.15, 101325)
+    assert (e_T, e_M) == pytest.approx(physical_exergy(5e6, 298.15, 101325, {"water": 1.0}, h=1e6))
+    with pytest.raises(ValueError, match="Empty property table range"):
+        PropertyTable.build({"water": 1.0}, p_range=(1e6, 1e4))
+
+
+def test_pressures_outside_of_the_isotherm():
+    """The free enthalpy is not extrapolated beyond the nodes of the ambient temperature isotherm."""
+    table = PropertyTable.build({"water": 1.0}, p_range=(1e4, 1e6), **COARSE)
+    g, _ = table._gibbs(np.log([1e3, 1e5, 1e8]), 298.15, 101325)
+    assert np.isnan(g[[0, 2]]).all()
+    assert np.isfinite(g[1])
+
+    e_T, e_M = table.physical_exergy(1e8, 5e5, 298.15, 101325)
+    assert (e_T, e_M) == pytest.approx(physical_exergy(1e8, 298.15, 101325, {"water": 1.0}, h=5e5))
+
+
+def test_undefined_ambient_state(monkeypatch):
+    """An ambient state without free enthalpy is reported instead of failing on a missing node."""
+    table = PropertyTable.build({"water": 1.0}, p_range=(1e4, 1e6), **COARSE)
+    h_s_pT = table.fluid.h_s_pT
+
+    def fail_at_ambient(p, T):
+        if p == 101325:
+            raise ValueError("No solution.")
+        return h_s_pT(p, T)
+
+    monkeypatch.setattr(table.fluid, "h_s_pT", fail_at_ambient)
+    with pytest.raises(ValueError, match="ambient state T=298.15 K, p=101325 Pa"):
+        table.physical_exergy(2e5, 1e5, 298.15, 101325)
+
+    # At the saturation pressure the free enthalpy of the kink is used
+    table = PropertyTable.build({"water": 1.0}, p_range=(1e3, 1e6), **COARSE)
+    p_sat = CP.PropsSI("P", "T", 298.15, "Q", 0, "water")
+    g, g_0 = table._gibbs(np.log(p_sat), 298.15, p_sat)
+    assert g == pytest.approx(g_0)
+    assert g_0 == pytest.approx(CP.PropsSI("G", "T", 298.15, "Q", 0, "water"))
+
+
+def test_persistence(tmp_path, monkeypatch):
+    """Tables are built once, saved and loaded again by later processes."""
+    property_table.clear_cache()
+    builds = []
+    build = PropertyTable.build.__func__
+    monkeypatch.setattr(
+        PropertyTable,
+        "build",
+        classmethod(lambda cls, *args, **kwargs: builds.append(args) or build(cls, *args, **kwargs)),
+    )
+
+    table = PropertyTable.cached({"water": 1.0}, directory=tmp_path, **COARSE)
+    assert PropertyTable.cached({"water": 1.0}, directory=tmp_path, **COARSE) is table
+    assert len(builds) == 1
+    assert len(os.listdir(tmp_path)) == 1
+
+    # A new process loads the table from disk
+    property_table.clear_cache()
+    loaded = PropertyTable.cached({"water": 1.0}, directory=tmp_path, **COARSE)
+    assert len(builds) == 1
+    assert loaded is not table
+    np.testing.assert_array_equal(loaded.s, table.s)
+    p, h = np.array([2e5, 5e6]), np.array([3e5, 3e6])
+    np.testing.assert_allclose(loaded.physical_exergy(p, h, 288.15, 1e5), table.physical_exergy(p, h, 288.15, 1e5))
+
+    PropertyTable.cached({"water": 1.0}, directory=tmp_path, n_p=50, n_T=80)
+    assert len(builds) == 2
+    property_table.clear_cache()
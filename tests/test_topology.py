@@ -0,0 +1,155 @@
+"""
+Unit tests for the ConnectionTopology index.
+
+These tests verify that the topology index maps components to their inlet and outlet
+connections, keeps the connector numbers and filters connections by kind.
+"""
+
+import pytest
+
+from exerpy.analyses import ExergoeconomicAnalysis, ExergyAnalysis, _construct_components
+from exerpy.components.component import Component, component_registry
+from exerpy.topology import ConnectionTopology
+
+
+@component_registry
+class TopologyDummy(Component):
+    def calc_exergy_balance(self, T0, p0, split_physical_exergy=True):
+        self.E_F = 10
+        self.E_P = 10
+        self.E_D = 0
+        self.epsilon = 1
+
+
+@pytest.fixture
+def connection_data():
+    """Create a small network: a boundary inlet, two streams between A and B and power and heat flows."""
+    return {
+        "1": {
+            "kind": "material",
+            "source_component": None,
+            "source_connector": None,
+            "target_component": "A",
+            "target_connector": 0,
+        },
+        "2": {
+            "kind": "material",
+            "source_component": "A",
+            "source_connector": 0,
+            "target_component": "B",
+            "target_connector": 1,
+        },
+        "3": {
+            "kind": "material",
+            "source_component": "A",
+            "source_connector": 1,
+            "target_component": "B",
+            "target_connector": 0,
+        },
+        "4": {
+            "kind": "material",
+            "source_component": "B",
+            "source_connector": 0,
+            "target_component": None,
+            "target_connector": None,
+        },
+        "P1": {
+            "kind": "power",
+            "source_component": "B",
+            "source_connector": 1,
+            "target_component": None,
+            "target_connector": None,
+        },
+        "Q1": {
+            "kind": "heat",
+            "source_component": None,
+            "source_connector": None,
+            "target_component": "A",
+            "target_connector": 1,
+        },
+    }
+
+
+def test_inlets_and_outlets(connection_data):
+    """Inlets and outlets are listed in the order of the connection data."""
+    topology = ConnectionTopology(connection_data)
+
+    assert topology.inlets("A") == ["1", "Q1"]
+    assert topology.outlets("A") == ["2", "3"]
+    assert topology.inlets("B") == ["2", "3"]
+    assert topology.outlets("B") == ["4", "P1"]
+    assert topology.inlets("unknown") == []
+
+
+def test_kind_filters(connection_data):
+    """Kind filters work for component lookups and for the whole connection set."""
+    topology = ConnectionTopology(connection_data)
+
+    assert topology.inlets("A", kind="material") == ["1"]
+    assert topology.outlets("B", kind="power") == ["P1"]
+    assert topology.of_kind("material") == ["1", "2", "3", "4"]
+    assert topology.of_kind(("heat", "power")) == ["P1", "Q1"]
+    assert topology.kind("Q1") == "heat"
+
+
+def test_connectors(connection_data):
+    """Connector indices map to the connection names."""
+    topology = ConnectionTopology(connection_data)
+
+    assert topology.inlet_connectors("B") == {1: "2", 0: "3"}
+    assert topology.outlet_connectors("A") == {0: "2", 1: "3"}
+    assert topology.attached("A") == ["1", "Q1", "2", "3"]
+
+
+def test_incidence_matrix(connection_data):
+    """The incidence matrix is signed by the flow direction and lists the outlets of a component first."""
+    connection_data["5"] = {"kind": "material", "source_component": "A", "target_component": "A"}
+    topology = ConnectionTopology(connection_data)
+    incidence = topology.incidence_matrix(["A", "B", "C"])
+
+    assert incidence.shape == (3, 7)
+    assert incidence.toarray().tolist() == [
+        [1, -1, -1, 0, 0, 1, 0],
+        [0, 1, 1, -1, -1, 0, 0],
+        [0, 0, 0, 0, 0, 0, 0],
+    ]
+    cols, signs = incidence.row(0)
+    assert [topology.names[col] for col in cols] == ["2", "3", "5", "1", "Q1", "5"]
+    assert signs.tolist() == [-1, -1, -1, 1, 1, 1]
+    values = [10.0, 6.0, 8.0, 3.0, 12.0, 1.0, 100.0]
+    assert (incidence @ values).tolist() == [-3.0, -1.0, 0.0]
+    assert (incidence.inlets() @ values).tolist() == [111.0, 14.0, 0.0]
+    assert (incidence.outlets() @ values).tolist() == [-114.0, -15.0, 0.0]
+
+
+def test_construct_components_with_topology(connection_data):
+    """Components are wired through the topology index with the original inlet order."""
+    component_data = {
+        "TopologyDummy": {"A": {"name": "A"}, "B": {"name": "B"}},
+    }
+    components = _construct_components(component_data, connection_data, 298.15)
+
+    assert list(components["B"].inl) == [1, 0]
+    assert components["B"].inl[0] is connection_data["3"]
+    assert components["B"].outl[1] is connection_data["P1"]
+    assert components["A"].inl[1] is connection_data["Q1"]
+
+
+def test_cost_balance_uses_topology(connection_data):
+    """Cost balance residuals are computed from the indexed inlets and outlets."""
+    component_data = {"TopologyDummy": {"A": {"name": "A"}, "B": {"name": "B"}}}
+    costs = {"1": 10.0, "2": 6.0, "3": 8.0, "4": 3.0, "P1": 12.0, "Q1": 1.0}
+    for name, cost in costs.items():
+        connection_data[name]["C_TOT"] = cost
+
+    ean = ExergyAnalysis(component_data, connection_data, 298.15, 101325)
+    ean.E_F_dict, ean.E_P_dict, ean.E_L_dict = {}, {}, {}
+    exergoeco = ExergoeconomicAnalysis(ean)
+    ean.components["A"].Z_costs = 3.0
+    ean.components["B"].Z_costs = 1.0
+
+    balances = exergoeco.check_cost_balance()
+
+    assert balances["A"][0] == pytest.approx(10.0 + 1.0 - 6.0 - 8.0 + 3.0)
+    assert balances["B"][0] == pytest.approx(6.0 + 8.0 - 3.0 - 12.0 + 1.0)
+    assert balances["B"][1]
@@ -0,0 +1,109 @@
+"""
+Tests for the Monte Carlo propagation of cost uncertainties.
+
+The sampled results of the heat pump cascade example are compared against
+single runs of the exergoeconomic analysis with the sampled costs.
+"""
+
+import os
+
+import numpy as np
+import pytest
+
+from exerpy import EconomicAnalysis, ExergoeconomicAnalysis, ExergyAnalysis
+from exerpy.uncertainty import CostUncertainty
+
+_model_path = os.path.join(os.path.dirname(__file__), "..", "examples", "hp_cascade", "hp_cascade_ebs.json")
+
+UNCERTAINTIES = {"E1_c": ("normal", 1.0, 0.1), "COMP1_Z": ("uniform", 0.5, 1.5), "IHX_PEC": ("triangular", 0.8, 1, 1.5)}
+
+
+def analysed_heat_pump():
+    """Create the analysed heat pump cascade."""
+    ean = ExergyAnalysis.from_json(_model_path)
+    ean.analyse(
+        E_F={"inputs": ["E1", "E2"], "outputs": []},
+        E_P={"inputs": ["42"], "outputs": ["41"]},
+        E_L={"inputs": ["12"], "outputs": ["11"]},
+    )
+    return ean
+
+
+@pytest.fixture
+def economic_analysis():
+    """Create the economic analysis of the example."""
+    return EconomicAnalysis({"tau": 5500, "i_eff": 0.08, "n": 20, "r_n": 0.02})
+
+
+@pytest.fixture
+def uncertainty(economic_analysis):
+    """Create the uncertainty propagation of the heat pump cascade with some components costed by their PEC."""
+    ean = analysed_heat_pump()
+    costs = {f"{name}_Z": 1.0 + i for i, name in enumerate(ean.components)}
+    costs.update({"11_c": 0.0, "41_c": 0.0, "E1_c": 111.0})
+    PEC = {"IHX": 20000.0, "AIR_HX": 15000.0}
+    OMC_relative = {"IHX": 0.03, "AIR_HX": 0.03}
+    return CostUncertainty(
+        ExergoeconomicAnalysis(ean), costs, ean.Tamb, economic_analysis, PEC=PEC, OMC_relative=OMC_relative
+    )
+
+
+def test_investment_costs_from_pec(uncertainty, economic_analysis):
+    """The vectorized investment costs equal the results of the economic analysis."""
+    PEC = np.array([[20000.0, 25000.0], [15000.0, 15000.0]])
+    Z = uncertainty._investment_cost_rates(PEC)
+    for sample in range(PEC.shape[1]):
+        _, _, Z_total = economic_analysis.compute_component_costs(PEC[:, sample].tolist(), [0.03, 0.03])
+        assert Z[:, sample] == pytest.approx(Z_total)
+
+
+def test_samples_match_single_runs(uncertainty):
+    """Every sample gives the results of a run with the sampled costs."""
+    quantiles = uncertainty.run(UNCERTAINTIES, n_samples=1000, seed=1)
+    assert list(quantiles.columns) == ["c_P [EUR/GJ]", "C_D [EUR/h]", "f [%]"]
+    assert quantiles.loc[("COMP1", 0.05), "c_P [EUR/GJ]"] < quantiles.loc[("COMP1", 0.95), "c_P [EUR/GJ]"]
+
+    inputs, factors = uncertainty.sample_inputs(UNCERTAINTIES, 1000, seed=1)
+    for sample in (0, 999):
+        ean = analysed_heat_pump()
+        costs = {key: 3600 * inputs[i, sample] for i, key in enumerate(uncertainty.inputs) if key.endswith("_Z")}
+        costs.update({"11_c": 0.0, "41_c": 0.0, "E1_c": 111.0 * factors["E1_c"][sample]})
+        ExergoeconomicAnalysis(ean).run(costs, ean.Tamb)
+        for i, name in enumerate(uncertainty.components):
+            comp = ean.components[name]
+            assert uncertainty.samples["c_P"][i, sample] == pytest.approx(comp.C_P / comp.E_P * 1e9, nan_ok=True)
+            assert uncertainty.samples["C_D"][i, sample] == pytest.approx(comp.C_D * 3600)
+            assert uncertainty.samples["f"][i, sample] == pytest.approx(comp.f * 100)
+
+
+def test_seed(uncertainty):
+    """The same seed gives the same samples, chunks do not change the results."""
+    first = uncertainty.run(UNCERTAINTIES, n_samples=500, seed=7)
+    second = uncertainty.run(UNCERTAINTIES, n_samples=500, seed=7, chunk_size=128)
+    assert np.allclose(first.to_numpy(), second.to_numpy(), equal_nan=True)
+    third = uncertainty.run(UNCERTAINTIES, n_samples=500, seed=8)
+    assert not np.allclose(first.to_numpy(), third.to_numpy(), equal_nan=True)
+
+    with pytest.raises(ValueError, match="Unknown uncertain input"):
+        uncertainty.run({"X_Z": ("normal", 1.0, 0.1)})
+    with pytest.raises(ValueError, match="Unknown distribution"):
+        uncertainty.run({"E1_c": ("beta", 1.0, 0.1)})
+
+
+def test_optional_costs_and_changed_state():
+    """Optional costs default like in the analysis and a changed exergy state is factorized again."""
+    ean = analysed_heat_pump()
+    costs = {f"{name}_Z": 1.0 + i for i, name in enumerate(ean.components)}
+    costs["E1_c"] = 111.0
+    uncertainty = CostUncertainty(ExergoeconomicAnalysis(ean), costs, ean.Tamb)
+    factorization = uncertainty._factorization
+
+    ean.update_connections({"11": {"m": ean.connections["11"]["m"] * 1.01}})
+    uncertainty.run({"E1_c": ("normal", 1.0, 0.0)}, n_samples=2, seed=1)
+    assert uncertainty._factorization is not factorization
+
+    reference = analysed_heat_pump()
+    reference.update_connections({"11": {"m": reference.connections["11"]["m"] * 1.01}})
+    ExergoeconomicAnalysis(reference).run(costs, reference.Tamb)
+    for i, name in enumerate(uncertainty.components):
+        assert uncertainty.samples["C_D"][i] == pytest.approx(reference.components[name].C_D * 3600)